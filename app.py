@@ -1,74 +1,98 @@
 # app.py - UPDATED with subscription and daily broadcast features
-import json, os, urllib.request
+import json, os, logging, time
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from backend.ask_temple import answer_user
+from backend.broadcast import BroadcastEngine, DynamoCheckpoint
+from backend.dedupe_store import DynamoDedupeStore, MessageDedupe
+from backend.message_queue import MESSAGE_QUEUE_URL, drain, get_message_queue
+from backend.graph_client import get_graph_client, image_message, text_message
+from backend.lazy import lazy_resource
+from backend.posted_events import EVENTS_TABLE, PostedEvents, event_hash
+from backend.site_scraper import CHANGED, HEADERS, HOME_URL, DynamoScrapeStore, scrape_events
+from backend.subscribers import SUBSCRIBERS_TABLE, SubscriberRoster
+from backend.webhook import dispatch, enqueue_new, extract_messages
 import re
-import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
 
 # --- ENV ---
 VERIFY_TOKEN = os.getenv("VERIFY_TOKEN", "svt-verify-123")
-TOKEN        = os.getenv("WHATSAPP_ACCESS_TOKEN")
-PHONE_ID     = os.getenv("WHATSAPP_PHONE_NUMBER_ID")
+# "async": the webhook only enqueues; worker_handler answers
+WEBHOOK_MODE = os.getenv("WEBHOOK_MODE", "sync")
+if WEBHOOK_MODE == "async" and not MESSAGE_QUEUE_URL:
+    # a process-local queue would acknowledge messages no worker can ever answer
+    raise RuntimeError("WEBHOOK_MODE=async requires MESSAGE_QUEUE_URL (an SQS queue)")
+WORKER_DEADLINE_MARGIN_SECS = 20
+# WHATSAPP_ACCESS_TOKEN / WHATSAPP_PHONE_NUMBER_ID are read by backend.graph_client
+
+# --- DYNAMODB TABLES (created on first use, not at cold start) ---
+@lazy_resource
+def get_dynamodb():
+    import boto3
+    return boto3.resource('dynamodb', region_name='us-east-1')
+
+
+@lazy_resource
+def get_events_table():
+    return get_dynamodb().Table(EVENTS_TABLE)
+
+
+@lazy_resource
+def get_roster():
+    return SubscriberRoster(get_dynamodb().Table(SUBSCRIBERS_TABLE))
+
+
+@lazy_resource
+def get_posted_events():
+    return PostedEvents(get_dynamodb(), EVENTS_TABLE)
+
+
+@lazy_resource
+def get_scrape_store():
+    return DynamoScrapeStore(get_events_table())
 
-# --- DYNAMODB TABLES (NEW) ---
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-subscribers_table = dynamodb.Table('temple-subscribers')
-events_table = dynamodb.Table('temple-events')
+
+@lazy_resource
+def get_message_dedupe():
+    return MessageDedupe(DynamoDedupeStore(get_events_table()))
+
+
+@lazy_resource
+def get_enqueue_dedupe():
+    """Async mode: ids already enqueued (a separate key space from get_message_dedupe)."""
+    return MessageDedupe(DynamoDedupeStore(get_events_table(), prefix="wamid-enqueued"))
 
 
 # ---------------------------------------------------------
 # SEND WHATSAPP REPLY (EXISTING - NO CHANGES)
 # ---------------------------------------------------------
-def send_reply(to, text):
+def with_prefix(text):
     prefix = "Om Namo Venkateshaya 🙏\n\n"
 
     # Avoid double prefix
     if not text.strip().lower().startswith("om namo venkateshaya"):
         text = prefix + text
+    return text
 
-    url = f"https://graph.facebook.com/v22.0/{PHONE_ID}/messages"
-    payload = {
-        "messaging_product": "whatsapp",
-        "to": to,
-        "type": "text",
-        "text": {"body": text[:1400]},
-    }
-    req = urllib.request.Request(url, json.dumps(payload).encode(), method="POST")
-    req.add_header("Authorization", f"Bearer {TOKEN}")
-    req.add_header("Content-Type", "application/json")
 
-    try:
-        urllib.request.urlopen(req, timeout=10)
-    except Exception as e:
-        print("Send reply error:", e)
+def send_reply(to, text):
+    """Send a text reply; returns the Graph client's result dict."""
+    result = get_graph_client().send_text(to, with_prefix(text))
+    if not result["ok"]:
+        logger.warning("Send reply to %s failed: %s", to, result)
+    return result
 
 
 # ---------------------------------------------------------
 # SEND WHATSAPP IMAGE (NEW)
 # ---------------------------------------------------------
 def send_whatsapp_image(to, image_url, caption=""):
-    """Send WhatsApp image with caption"""
-    url = f"https://graph.facebook.com/v22.0/{PHONE_ID}/messages"
-    payload = {
-        "messaging_product": "whatsapp",
-        "to": to,
-        "type": "image",
-        "image": {
-            "link": image_url,
-            "caption": caption[:1024] if caption else ""
-        }
-    }
-    req = urllib.request.Request(url, json.dumps(payload).encode(), method="POST")
-    req.add_header("Authorization", f"Bearer {TOKEN}")
-    req.add_header("Content-Type", "application/json")
-
-    try:
-        urllib.request.urlopen(req, timeout=10)
-        return True
-    except Exception as e:
-        print("Send image error:", e)
-        return False
+    """Send WhatsApp image with caption; returns the Graph client's result dict."""
+    result = get_graph_client().send_image(to, image_url, caption)
+    if not result["ok"]:
+        logger.warning("Send image to %s failed: %s", to, result)
+    return result
 
 
 # ---------------------------------------------------------
@@ -77,14 +101,7 @@ def send_whatsapp_image(to, image_url, caption=""):
 def subscribe_user(phone_number):
     """Add user to subscription list"""
     try:
-        subscribers_table.put_item(
-            Item={
-                'phone_number': phone_number,
-                'subscribed': True,
-                'subscribed_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            }
-        )
+        get_roster().subscribe(phone_number)
         print(f"✅ Subscribed: {phone_number}")
         return True
     except Exception as e:
@@ -95,14 +112,7 @@ def subscribe_user(phone_number):
 def unsubscribe_user(phone_number):
     """Remove user from subscription list"""
     try:
-        subscribers_table.update_item(
-            Key={'phone_number': phone_number},
-            UpdateExpression='SET subscribed = :val, updated_at = :time',
-            ExpressionAttributeValues={
-                ':val': False,
-                ':time': datetime.now().isoformat()
-            }
-        )
+        get_roster().unsubscribe(phone_number)
         print(f"✅ Unsubscribed: {phone_number}")
         return True
     except Exception as e:
@@ -113,10 +123,7 @@ def unsubscribe_user(phone_number):
 def check_subscription(phone_number):
     """Check if user is subscribed"""
     try:
-        response = subscribers_table.get_item(Key={'phone_number': phone_number})
-        if 'Item' in response:
-            return response['Item'].get('subscribed', False)
-        return False
+        return get_roster().is_subscribed(phone_number)
     except Exception as e:
         print(f"❌ Error checking subscription: {e}")
         return False
@@ -125,30 +132,23 @@ def check_subscription(phone_number):
 # ---------------------------------------------------------
 # DAILY BROADCAST SCRAPER (NEW)
 # ---------------------------------------------------------
-def scrape_and_broadcast():
+def scrape_and_broadcast(context=None):
     """
     Daily function: Scrape temple website and broadcast events
     Called by EventBridge at 9 AM
+
+    Sends go through BroadcastEngine. If the Lambda deadline cuts a run
+    short, the next invocation resumes each event from its checkpoint.
+    An unchanged Home page (304 or same body hash) ends the run early.
     """
     print("\n🕉️ STARTING DAILY EVENT BROADCAST")
     print("="*60)
     
     import requests
-    from bs4 import BeautifulSoup
-    from urllib.parse import urljoin
-    import hashlib
     import time
-    
-    BASE_URL = "https://svtempleco.org"
-    HOME_URL = f"{BASE_URL}/Home"
-    
-    HEADERS = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Connection': 'keep-alive',
-        'Referer': 'https://svtempleco.org/'
-    }
+
+    # stop starting new sends this long before the Lambda timeout
+    DEADLINE_MARGIN_SECS = 15
     
     EVENT_DATES = {
         'vaikuntaekadasi': 'December 30, 2025 (Tuesday)',
@@ -157,66 +157,18 @@ def scrape_and_broadcast():
         'melchat': 'January 2025 (Check with temple)'
     }
     
-    # Get all active subscribers
-    try:
-        response = subscribers_table.scan(
-            FilterExpression='subscribed = :val',
-            ExpressionAttributeValues={':val': True}
-        )
-        subscribers = [item['phone_number'] for item in response.get('Items', [])]
-        
-        # Handle pagination
-        while 'LastEvaluatedKey' in response:
-            response = subscribers_table.scan(
-                FilterExpression='subscribed = :val',
-                ExpressionAttributeValues={':val': True},
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            subscribers.extend([item['phone_number'] for item in response.get('Items', [])])
-        
-        print(f"📱 Found {len(subscribers)} active subscribers")
-        
-        if not subscribers:
-            print("⚠️ No subscribers found")
-            return 0
-            
-    except Exception as e:
-        print(f"❌ Error getting subscribers: {e}")
-        return 0
-    
-    # Scrape website
+    # Scrape website (conditional GET, skipped work when unchanged)
     try:
         print("🔍 Scraping temple website...")
         session = requests.Session()
         session.headers.update(HEADERS)
         
-        response = session.get(HOME_URL, timeout=30, allow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        events = []
-        
-        event_imgs = soup.select("img[src]")
-                
-        for img in event_imgs:
-            src = img.get('src', '')
-            if any(year in src.lower() for year in ['2025', '2026']):
-                if src.startswith('../'):
-                    img_url = urljoin(BASE_URL, src.replace('../', ''))
-                elif src.startswith('/'):
-                    img_url = BASE_URL + src
-                else:
-                    img_url = urljoin(HOME_URL, src)
-                
-                filename = src.split('/')[-1]
-                event_name = filename.replace('.jpg', '').replace('.jpeg', '').replace('.png', '')
-                event_name = event_name.replace('_', ' ').replace('2025', '').replace('2026', '').strip().title()
-                
-                events.append({
-                    'filename': filename,
-                    'name': event_name,
-                    'image_url': img_url
-                })
+        scrape = scrape_events(session, get_scrape_store())
+        if scrape.status != CHANGED:
+            print(f"ℹ️ Home page {scrape.status.replace('_', ' ')}, nothing to broadcast")
+            get_scrape_store().save(HOME_URL, scrape.state)
+            return 0
+        events = scrape.events
         
         print(f"✅ Found {len(events)} upcoming events")
         
@@ -224,27 +176,52 @@ def scrape_and_broadcast():
         print(f"❌ Scraping error: {e}")
         return 0
     
+    # Get all active subscribers (local snapshot + changes since last run)
+    try:
+        subscriber_count = get_roster().sync()["count"]
+        print(f"📱 Found {subscriber_count} active subscribers")
+        
+        if not subscriber_count:
+            print("⚠️ No subscribers found")
+            return 0
+            
+    except Exception as e:
+        print(f"❌ Error getting subscribers: {e}")
+        return 0
+    
     if not events:
         print("ℹ️ No events to broadcast")
+        get_scrape_store().save(HOME_URL, scrape.state)
         return 0
     
     # Broadcast to subscribers
+    deadline = None
+    if context is not None:
+        deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000 - DEADLINE_MARGIN_SECS
+
+    checkpoint = DynamoCheckpoint(get_events_table())
+    engine = BroadcastEngine(get_graph_client(), checkpoint=checkpoint)
+
     events_posted = 0
     first_event = True
+    interrupted = False
+
+    # Resolve every event's dedupe hash in one batch
+    hashes = [event_hash(event) for event in events]
+    try:
+        already_posted = get_posted_events().already_posted(hashes)
+    except Exception as e:
+        print(f"⚠️ Error checking posted events: {e}")
+        already_posted = set()
+
+    newly_posted = {}      # hash → event, markers written in one batch below
+    finished_runs = []     # checkpoints to clear once markers are written
     
-    for idx, event in enumerate(events):
+    for idx, (event, ev_hash) in enumerate(zip(events, hashes)):
         # Check if already posted
-        dedupe_key = f"{event['filename']}|{event['image_url']}|{event['name']}"
-        event_hash = hashlib.md5(dedupe_key.encode()).hexdigest()
-
-        
-        try:
-            response = events_table.get_item(Key={'event_hash': event_hash})
-            if 'Item' in response:
-                print(f"⏭️ Skipping '{event['name']}' (already posted)")
-                continue
-        except:
-            pass
+        if ev_hash in already_posted or ev_hash in newly_posted:
+            print(f"⏭️ Skipping '{event['name']}' (already posted)")
+            continue
         
         # Get event date
         event_lower = event['name'].lower()
@@ -268,38 +245,56 @@ def scrape_and_broadcast():
         print(f"\n📢 Broadcasting: {event['name']}")
         
         # Send to all subscribers
-        success_count = 0
-        for phone in subscribers:
-            if send_whatsapp_image(phone, event['image_url'], message):
-                success_count += 1
-            time.sleep(0.5)
-        
-        if success_count > 0:
-            # Mark as posted
-            try:
-                events_table.put_item(
-                    Item={
-                        'event_hash': event_hash,
-                        'event_data': json.dumps(event),
-                        'timestamp': datetime.now().isoformat(),
-                        'ttl': int(datetime.now().timestamp()) + (90 * 24 * 60 * 60)
-                    }
-                )
-            except Exception as e:
-                print(f"⚠️ Error marking as posted: {e}")
-            
+        report = engine.run(
+            ev_hash,
+            get_roster().iter_active(),
+            lambda phone: image_message(phone, event['image_url'], message),
+            deadline=deadline,
+        )
+        if not report.complete:
+            print(f"⏱️ Deadline reached: {report.delivered}/{subscriber_count} sent, resuming next run")
+            interrupted = True
+            break
+
+        finished_runs.append(ev_hash)
+        if report.delivered > 0:
+            newly_posted[ev_hash] = event
             events_posted += 1
-            print(f"✅ Sent to {success_count}/{len(subscribers)} subscribers")
+            print(f"✅ Sent to {report.delivered}/{subscriber_count} subscribers")
+
+    # Mark as posted, then drop the checkpoints of finished events
+    try:
+        if newly_posted:
+            get_posted_events().mark_posted(newly_posted)
+        for run_id in finished_runs:
+            checkpoint.clear(run_id)
+    except Exception as e:
+        print(f"⚠️ Error marking as posted: {e}")
     
     # Send final welcome message
-    if events_posted > 0:
+    if events_posted > 0 and not interrupted:
         print("\n📢 Sending final welcome message...")
-        welcome_msg = """All are Welcome.
-Om Namo Venkateshaya 🕉️"""
-        
-        for phone in subscribers:
-            send_reply(phone, welcome_msg)
-            time.sleep(0.5)
+        welcome_msg = with_prefix("""All are Welcome.
+Om Namo Venkateshaya 🕉️""")
+        welcome_run = f"welcome#{datetime.now():%Y-%m-%d}"
+
+        report = engine.run(
+            welcome_run,
+            get_roster().iter_active(),
+            lambda phone: text_message(phone, welcome_msg),
+            deadline=deadline,
+        )
+        if report.complete:
+            checkpoint.clear(welcome_run)
+        else:
+            interrupted = True
+
+    # Remember this page only once everything on it has gone out
+    if not interrupted:
+        try:
+            get_scrape_store().save(HOME_URL, scrape.state)
+        except Exception as e:
+            print(f"⚠️ Error saving scrape state: {e}")
     
     print(f"\n✅ BROADCAST COMPLETE: {events_posted} events posted")
     return events_posted
@@ -320,128 +315,109 @@ def dedupe_bullets(text: str) -> str:
 
 
 # ---------------------------------------------------------
-# MAIN HANDLER (UPDATED - Added EventBridge + Subscriptions)
+# ANSWER ONE MESSAGE (sync webhook path and queue worker)
 # ---------------------------------------------------------
-def handler(event, context):
-
-    # -------------------------------------------------------
-    # DAILY BROADCAST TRIGGER (NEW)
-    # -------------------------------------------------------
-    if event.get("source") == "aws.events":
-        print("🔔 Triggered by EventBridge - Running daily broadcast")
-        events_posted = scrape_and_broadcast()
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Daily broadcast completed',
-                'events_posted': events_posted,
-                'timestamp': datetime.now().isoformat()
-            })
-        }
-
-    # --- VALIDATION CALLBACK (EXISTING - NO CHANGES) ---
-    if event.get("httpMethod") == "GET":
-        qs = event.get("queryStringParameters", {})
-        if qs.get("hub.mode") == "subscribe" and qs.get("hub.verify_token") == VERIFY_TOKEN:
-            return {"statusCode": 200, "body": qs.get("hub.challenge")}
-        return {"statusCode": 403}
+def handle_message(msg):
+    """msg: {"id", "from", "text", "timestamp"} from extract_messages"""
+    # Meta redelivers on timeouts; answer each message id once
+    if not get_message_dedupe().claim(msg["id"]):
+        logger.info("Duplicate delivery of %s dropped", msg["id"])
+        return
+    try:
+        answer_message(msg)
+    except Exception:
+        get_message_dedupe().release(msg["id"])
+        raise
+
+
+def answer_message(msg):
+    user_text = msg["text"].strip()
+    lower = user_text.lower()
+    sender = msg["from"]
+
+    # -------------------------------------------------
+    # SUBSCRIPTION COMMANDS (NEW)
+    # -------------------------------------------------
+    if lower in ["subscribe", "start", "join", "notifications"]:
+        success = subscribe_user(sender)
+        if success:
+            send_reply(
+                sender,
+                "✅ Subscribed Successfully!\n\n"
+                "You will receive notifications about upcoming temple events.\n\n"
+                "📅 Daily event updates at 9 AM\n"
+                "🕉️ Special festival announcements\n\n"
+                "Commands:\n"
+                "• unsubscribe - Stop notifications\n"
+                "• status - Check subscription\n\n"
+                "Om Namo Venkateshaya 🕉️"
+            )
+        else:
+            send_reply(sender, "❌ Subscription failed. Please try again.")
+        return
+    
+    if lower in ["unsubscribe", "stop", "leave", "cancel"]:
+        success = unsubscribe_user(sender)
+        if success:
+            send_reply(
+                sender,
+                "✅ Unsubscribed Successfully\n\n"
+                "You will no longer receive event notifications.\n\n"
+                "To subscribe again, send: subscribe\n\n"
+                "Om Namo Venkateshaya 🕉️"
+            )
+        else:
+            send_reply(sender, "❌ Unsubscribe failed. Please try again.")
+        return
+    
+    if lower in ["status", "check", "subscription"]:
+        is_subscribed = check_subscription(sender)
+        if is_subscribed:
+            send_reply(
+                sender,
+                "📊 Subscription Status: ✅ ACTIVE\n\n"
+                "You are receiving event notifications.\n\n"
+                "To unsubscribe, send: unsubscribe"
+            )
+        else:
+            send_reply(
+                sender,
+                "📊 Subscription Status: ❌ INACTIVE\n\n"
+                "You are not receiving notifications.\n\n"
+                "To subscribe, send: subscribe"
+            )
+        return
+
+    # -------------------------------------------------
+    # THANK YOU RESPONSE (EXISTING - NO CHANGES)
+    # -------------------------------------------------
+    if re.search(r"\b(thanks|thank you|bye|goodbye)\b", lower):
+        send_reply(
+            sender,
+            "You're welcome! Blessings always.\n"
+            "Om Namo Venkateshaya! Visit https://svtempleco.org/"
+        )
+        return
 
-    # --- PARSE INCOMING MESSAGE (EXISTING - NO CHANGES) ---
-    body = json.loads(event.get("body", "{}"))
-
-    for entry in body.get("entry", []):
-        for change in entry.get("changes", []):
-            msg = change.get("value", {}).get("messages", [{}])[0]
-            if "text" not in msg:
-                continue
-
-            user_text = msg["text"]["body"].strip()
-            lower = user_text.lower()
-            sender = msg["from"]
-
-            # -------------------------------------------------
-            # SUBSCRIPTION COMMANDS (NEW)
-            # -------------------------------------------------
-            if lower in ["subscribe", "start", "join", "notifications"]:
-                success = subscribe_user(sender)
-                if success:
-                    send_reply(
-                        sender,
-                        "✅ Subscribed Successfully!\n\n"
-                        "You will receive notifications about upcoming temple events.\n\n"
-                        "📅 Daily event updates at 9 AM\n"
-                        "🕉️ Special festival announcements\n\n"
-                        "Commands:\n"
-                        "• unsubscribe - Stop notifications\n"
-                        "• status - Check subscription\n\n"
-                        "Om Namo Venkateshaya 🕉️"
-                    )
-                else:
-                    send_reply(sender, "❌ Subscription failed. Please try again.")
-                return {"statusCode": 200}
-            
-            if lower in ["unsubscribe", "stop", "leave", "cancel"]:
-                success = unsubscribe_user(sender)
-                if success:
-                    send_reply(
-                        sender,
-                        "✅ Unsubscribed Successfully\n\n"
-                        "You will no longer receive event notifications.\n\n"
-                        "To subscribe again, send: subscribe\n\n"
-                        "Om Namo Venkateshaya 🕉️"
-                    )
-                else:
-                    send_reply(sender, "❌ Unsubscribe failed. Please try again.")
-                return {"statusCode": 200}
-            
-            if lower in ["status", "check", "subscription"]:
-                is_subscribed = check_subscription(sender)
-                if is_subscribed:
-                    send_reply(
-                        sender,
-                        "📊 Subscription Status: ✅ ACTIVE\n\n"
-                        "You are receiving event notifications.\n\n"
-                        "To unsubscribe, send: unsubscribe"
-                    )
-                else:
-                    send_reply(
-                        sender,
-                        "📊 Subscription Status: ❌ INACTIVE\n\n"
-                        "You are not receiving notifications.\n\n"
-                        "To subscribe, send: subscribe"
-                    )
-                return {"statusCode": 200}
-
-            # -------------------------------------------------
-            # THANK YOU RESPONSE (EXISTING - NO CHANGES)
-            # -------------------------------------------------
-            if re.search(r"\b(thanks|thank you|bye|goodbye)\b", lower):
-                send_reply(
-                    sender,
-                    "You're welcome! Blessings always.\n"
-                    "Om Namo Venkateshaya! Visit https://svtempleco.org/"
-                )
-                return {"statusCode": 200}
-
-            # -------------------------------------------------
-            # GREETING RESPONSE (EXISTING - NO CHANGES)
-            # -------------------------------------------------
-            greeting_words = ["hi", "hello", "hey", "namaste", "namaskar", "good morning", "good evening", "good afternoon", "namaskaram"]
-            
-            is_pure_greeting = False
-            
-            if lower in greeting_words:
-                is_pure_greeting = True
-            elif lower.startswith(("good morning", "good evening", "good afternoon")):
-                first_two_words = " ".join(lower.split()[:2])
-                if first_two_words in greeting_words:
-                    is_pure_greeting = True
-            
-            if is_pure_greeting:
-                now = datetime.now(ZoneInfo("America/Denver"))
-                current_month = now.strftime("%B")
+    # -------------------------------------------------
+    # GREETING RESPONSE (EXISTING - NO CHANGES)
+    # -------------------------------------------------
+    greeting_words = ["hi", "hello", "hey", "namaste", "namaskar", "good morning", "good evening", "good afternoon", "namaskaram"]
+    
+    is_pure_greeting = False
+    
+    if lower in greeting_words:
+        is_pure_greeting = True
+    elif lower.startswith(("good morning", "good evening", "good afternoon")):
+        first_two_words = " ".join(lower.split()[:2])
+        if first_two_words in greeting_words:
+            is_pure_greeting = True
+    
+    if is_pure_greeting:
+        now = datetime.now(ZoneInfo("America/Denver"))
+        current_month = now.strftime("%B")
 
-                greeting = f"""🕉️ SV Temple Castle Rock, Colorado
+        greeting = f"""🕉️ SV Temple Castle Rock, Colorado
 {now:%A, %B %d, %Y} | {now:%I:%M %p %Z}
 ────────────────────────
 🙏 Namaste! Welcome to Sri Venkateswara Temple!
@@ -473,18 +449,101 @@ Type "subscribe" and send for notifications
 
 🕉️ Om Namo Venkateshaya! 🕉️
 """
-                send_reply(sender, greeting)
-                return {"statusCode": 200}
+        send_reply(sender, greeting)
+        return
+
+    # -------------------------------------------------
+    # MAIN RAG + LLM PIPELINE (EXISTING - NO CHANGES)
+    # -------------------------------------------------
+    from backend.ask_temple import answer_user
+
+    # answer relative to when the user sent it, not when a queue worker got to it
+    message_ts = int(msg["timestamp"]) if msg.get("timestamp") else None
+    reply = answer_user(user_text, user_id=sender, message_ts=message_ts)
+
+    # dedupe bullets just in case
+    reply = dedupe_bullets(reply)
+
+    send_reply(sender, reply)
+
+
+# ---------------------------------------------------------
+# MAIN HANDLER (UPDATED - Added EventBridge + Subscriptions)
+# ---------------------------------------------------------
+def handler(event, context):
+
+    # -------------------------------------------------------
+    # DAILY BROADCAST TRIGGER (NEW)
+    # -------------------------------------------------------
+    if event.get("source") == "aws.events":
+        print("🔔 Triggered by EventBridge - Running daily broadcast")
+        events_posted = scrape_and_broadcast(context)
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'message': 'Daily broadcast completed',
+                'events_posted': events_posted,
+                'timestamp': datetime.now().isoformat()
+            })
+        }
 
-            # -------------------------------------------------
-            # MAIN RAG + LLM PIPELINE (EXISTING - NO CHANGES)
-            # -------------------------------------------------
-            now = datetime.now(ZoneInfo("America/Denver"))
-            reply = answer_user(user_text, user_id=sender)
+    # --- VALIDATION CALLBACK (EXISTING - NO CHANGES) ---
+    if event.get("httpMethod") == "GET":
+        qs = event.get("queryStringParameters", {})
+        if qs.get("hub.mode") == "subscribe" and qs.get("hub.verify_token") == VERIFY_TOKEN:
+            return {"statusCode": 200, "body": qs.get("hub.challenge")}
+        return {"statusCode": 403}
 
-            # dedupe bullets just in case
-            reply = dedupe_bullets(reply)
+    # --- PARSE INCOMING MESSAGE ---
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except ValueError:
+        return {"statusCode": 400}
 
-            send_reply(sender, reply)
+    messages = extract_messages(body)
 
+    # --- ASYNC MODE: enqueue and acknowledge Meta at once ---
+    if WEBHOOK_MODE == "async":
+        if messages:
+            try:
+                enqueue_new(messages, get_message_queue(), get_enqueue_dedupe())
+            except Exception:
+                logger.error("Enqueue failed", exc_info=True)
+                # non-200 makes Meta redeliver; the claims were released so it is enqueued then
+                return {"statusCode": 500}
+        return {"statusCode": 200}
+
+    # --- SYNC MODE: answer every message, then acknowledge ---
+    result = dispatch(messages, handle_message)
+    if result.failed:
+        logger.warning("%d of %d messages failed", len(result.failed), len(messages))
+        # Meta redelivers the batch; answered ids are dropped by the dedupe
+        return {"statusCode": 500}
     return {"statusCode": 200}
+
+
+# ---------------------------------------------------------
+# QUEUE WORKER (async webhook mode)
+# ---------------------------------------------------------
+def worker_handler(event, context):
+    """
+    Answer queued messages. Invoked by an SQS event source mapping
+    (event["Records"], partial batch failures reported back), or on a
+    schedule, in which case it drains the queue until the deadline.
+    """
+    if "Records" in event:
+        failures = []
+        for record in event["Records"]:
+            try:
+                handle_message(json.loads(record["body"]))
+            except Exception:
+                logger.error("Worker failed on %s", record.get("messageId"), exc_info=True)
+                failures.append({"itemIdentifier": record["messageId"]})
+        return {"batchItemFailures": failures}
+
+    deadline = None
+    if context is not None:
+        deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000 - WORKER_DEADLINE_MARGIN_SECS
+
+    result = drain(get_message_queue(), handle_message, deadline=deadline)
+    return {"statusCode": 200, "body": json.dumps(result._asdict())}
@@ -0,0 +1,262 @@
+#backend/artifact_bundle.py
+#
+"""
+Prewarmed artifact bundle for Lambda init.
+
+Cold start used to json.load meta.json (every chunk as a dict), read
+index.faiss and rebuild the autocorrect / normalization tables from
+backend.constants. build.py now writes one directory with everything
+in a form that is mapped or loaded directly:
+
+    backend/faiss_store/bundle/
+        manifest.json     count, dim, embedder, sources, fingerprints
+        vectors.npy       float32 [count, dim]; np.load(mmap_mode="r")
+        chunks.bin        chunk texts, UTF-8, back to back
+        chunks.idx        count + 1 byte offsets into chunks.bin (array 'Q')
+        chunks.lower.bin  the same texts lowercased, for keyword search
+        chunks.lower.idx  offsets into chunks.lower.bin
+        chunks.src        source id per chunk (array 'H') into manifest sources
+        tables.marshal    precompiled utility tables (see backend/utility.py)
+
+The chunk files are read through backend/chunk_store.py. Nothing here
+imports numpy or faiss unless the vectors are asked for. A missing or
+stale bundle is not an error: callers fall back to meta.json /
+index.faiss / building the tables in-process.
+
+Usage (from an existing meta.json + index.faiss, without re-embedding):
+    python -m backend.artifact_bundle
+"""
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+import shutil
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAISS_DIR = BASE_DIR / "backend" / "faiss_store"
+BUNDLE_DIR = Path(os.getenv("ARTIFACT_BUNDLE_DIR", str(FAISS_DIR / "bundle")))
+
+BUNDLE_FORMAT = 1
+
+MANIFEST = "manifest.json"
+VECTORS = "vectors.npy"
+CHUNKS_BLOB = "chunks.bin"
+CHUNKS_INDEX = "chunks.idx"
+CHUNKS_LOWER_BLOB = "chunks.lower.bin"
+CHUNKS_LOWER_INDEX = "chunks.lower.idx"
+CHUNKS_SOURCES = "chunks.src"
+TABLES = "tables.marshal"
+
+
+def atomic_write(path: Path, data: bytes):
+    """Write data to path via a temporary file and a rename: readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ============================================================
+# WRITE (build step)
+# ============================================================
+
+class EncodedChunks(NamedTuple):
+    blob: bytearray
+    offsets: array              # 'Q', count + 1
+    lower_blob: bytearray
+    lower_offsets: array        # 'Q', count + 1
+    source_ids: array           # 'H', count
+    sources: list[str]
+
+
+def encode_chunks(meta: Iterable[dict]) -> EncodedChunks:
+    blob, lower = bytearray(), bytearray()
+    offsets, lower_offsets = array("Q", [0]), array("Q", [0])
+    source_ids = array("H")
+    sources: dict[str, int] = {}
+    for chunk in meta:
+        text = chunk["text"]
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+        lower += text.lower().encode("utf-8")
+        lower_offsets.append(len(lower))
+        source_ids.append(sources.setdefault(chunk["source"], len(sources)))
+    return EncodedChunks(blob, offsets, lower, lower_offsets, source_ids, list(sources))
+
+
+def write_bundle(meta: list[dict], vectors=None, out_dir: Path = BUNDLE_DIR,
+                 embedder: Optional[str] = None) -> dict:
+    """
+    meta: [{"id", "source", "text"}] in index order (as in meta.json).
+    vectors: float32 array [len(meta), dim], or None to keep the text only.
+    embedder: id of the embedder that produced vectors (backend/embedders.py).
+    Returns the manifest.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    enc = encode_chunks(meta)
+
+    dim = None
+    if vectors is not None:
+        import numpy as np
+
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        if vectors.shape[0] != len(meta):
+            raise ValueError(f"{vectors.shape[0]} vectors for {len(meta)} chunks")
+        dim = int(vectors.shape[1])
+        tmp = out_dir / (VECTORS + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, vectors)
+        os.replace(tmp, out_dir / VECTORS)
+    else:
+        (out_dir / VECTORS).unlink(missing_ok=True)
+
+    atomic_write(out_dir / CHUNKS_BLOB, bytes(enc.blob))
+    atomic_write(out_dir / CHUNKS_INDEX, enc.offsets.tobytes())
+    atomic_write(out_dir / CHUNKS_LOWER_BLOB, bytes(enc.lower_blob))
+    atomic_write(out_dir / CHUNKS_LOWER_INDEX, enc.lower_offsets.tobytes())
+    atomic_write(out_dir / CHUNKS_SOURCES, enc.source_ids.tobytes())
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "count": len(meta),
+        "dim": dim,
+        "embedder": embedder,
+        "sources": enc.sources,
+        "chunks_sha256": hashlib.sha256(enc.blob).hexdigest(),
+    }
+    # manifest last: a reader never sees it ahead of the files it describes
+    atomic_write(out_dir / MANIFEST, json.dumps(manifest, indent=1).encode("utf-8"))
+    return manifest
+
+
+def save_tables(tables: dict, fingerprint: str, out_dir: Path = BUNDLE_DIR):
+    """Store precompiled tables (plain dict/list/tuple/str/int values) under fingerprint."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    atomic_write(out_dir / TABLES, marshal.dumps({
+        "format": BUNDLE_FORMAT,
+        "python": sys.version_info[:2],
+        "fingerprint": fingerprint,
+        "tables": tables,
+    }))
+
+
+def publish_staged(staging: Path, files: dict[str, Path], bundle_dir: Path = BUNDLE_DIR):
+    """
+    Move a build staged in staging over the live artifacts. files maps
+    a staged file name to its live path; staging/bundle then replaces
+    bundle_dir as a whole directory. The bundle goes last because
+    readers open it first: until it is swapped they keep the old,
+    self-consistent one, and afterwards every file is from this build.
+    """
+    staging, bundle_dir = Path(staging), Path(bundle_dir)
+    for name, target in files.items():
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staging / name, target)
+
+    old = bundle_dir.with_name(bundle_dir.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if bundle_dir.exists():
+        os.replace(bundle_dir, old)
+    os.replace(staging / "bundle", bundle_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+# ============================================================
+# READ (runtime)
+# ============================================================
+
+def load_tables(fingerprint: str, bundle_dir: Path = BUNDLE_DIR) -> Optional[dict]:
+    """The stored tables if they were built from the same inputs, else None."""
+    try:
+        # one read + loads; marshal.load on a file object reads piecemeal
+        stored = marshal.loads((Path(bundle_dir) / TABLES).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (stored.get("format") != BUNDLE_FORMAT
+            or tuple(stored.get("python", ())) != sys.version_info[:2]
+            or stored.get("fingerprint") != fingerprint):
+        return None
+    return stored["tables"]
+
+
+class FlatL2Index:
+    """
+    Exact L2 search over the memory-mapped matrix, with faiss
+    IndexFlatL2's search() contract: (squared distances, ids), ascending,
+    -1 ids when k exceeds the number of vectors. ids= restricts the
+    search to those rows (a facet partition), like an IDSelector.
+    """
+
+    def __init__(self, vectors):
+        import numpy as np
+
+        self._np = np
+        self.vectors = vectors
+        self.ntotal, self.d = vectors.shape
+        self._norms = np.einsum("ij,ij->i", vectors, vectors)
+
+    def search(self, queries, k: int, ids=None):
+        np = self._np
+        queries = np.asarray(queries, dtype="float32").reshape(-1, self.d)
+        if ids is None:
+            vectors, norms, n = self.vectors, self._norms, self.ntotal
+        else:
+            ids = np.asarray(ids, dtype="int64")
+            vectors, norms, n = self.vectors[ids], self._norms[ids], len(ids)
+        dist = (np.einsum("ij,ij->i", queries, queries)[:, None]
+                - 2.0 * queries @ vectors.T + norms[None, :])
+        np.maximum(dist, 0, out=dist)
+
+        kk = min(k, n)
+        if kk < n:
+            top = np.argpartition(dist, kk - 1, axis=1)[:, :kk]
+        else:
+            top = np.broadcast_to(np.arange(n), dist.shape)
+        order = np.take_along_axis(dist, top, axis=1).argsort(axis=1, kind="stable")
+        rows = np.take_along_axis(top, order, axis=1)
+        D = np.take_along_axis(dist, rows, axis=1).astype("float32")
+        I = rows if ids is None else ids[rows]
+
+        if kk < k:
+            pad = k - kk
+            D = np.hstack([D, np.full((len(queries), pad), np.inf, dtype="float32")])
+            I = np.hstack([I, np.full((len(queries), pad), -1)])
+        return D, I.astype("int64")
+
+
+if __name__ == "__main__":
+    with open(FAISS_DIR / "meta.json", encoding="utf-8") as f:
+        data = json.load(f)
+    meta = data["meta"]
+
+    vectors = None
+    index_path = FAISS_DIR / "index.faiss"
+    if index_path.exists() and index_path.stat().st_size:
+        import faiss
+
+        index = faiss.read_index(str(index_path))
+        vectors = index.reconstruct_n(0, index.ntotal)
+
+    manifest = write_bundle(meta, vectors, embedder=data.get("embedder"))
+    from backend.chunk_facets import FacetIndex, extract_facets
+    from backend.lexical_index import LexicalIndex
+    from backend.utility import write_normalization_tables
+    write_normalization_tables()
+    LexicalIndex.build((c["text"] for c in meta), manifest["chunks_sha256"]).save()
+    FacetIndex.build((extract_facets(c["source"], c["text"]) for c in meta), manifest["chunks_sha256"]).save()
+    print(f"📦 Bundle: {manifest['count']} chunks, dim {manifest['dim']}, "
+          f"{len(manifest['sources'])} sources → {BUNDLE_DIR}")
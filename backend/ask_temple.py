@@ -137,37 +137,36 @@ from typing import Optional, List
 import calendar
 import re
 
-# ===============================
-# AWS / External
-# ===============================
-import boto3
-
 # ===============================
 # Internal Imports
 # ===============================
-from .retrieval import get_chunks
-from backend.food_query import handle_food
-from backend.vahana_query import handle_vahana_pooja
-from backend.arjitha_seva_query import handle_arjitha_seva
-from backend.satyanarayana_query import handle_satyanarayana_pooja
-from backend.items_catalog_query import handle_items_required
-from backend.temple_info_query import handle_temple_hours
-from backend.temple_info_query import handle_vedic_recitation
-from backend.temple_info_query import handle_location
-from backend.temple_info_query import handle_contacts
-from backend.temple_info_query import handle_committee_queries
-from backend.temple_info_query import handle_cultural_programs
-from backend.story_query import handle_story
-from backend.panchangam import handle_panchang
-from backend.homams_query import handle_homam
-from backend.get_timing import handle_lunar_dates
-from backend.get_timing import handle_calendar_events,handle_abhishekam
-from backend.kalyanam_queries import handle_kalyanam
-from backend.food_query import FOOD_KEYWORDS
-from backend.constants import MONTHLY_SCHEDULE
-
-from backend.daily_pooja_query import handle_daily_pooja
-from backend.calender_2026 import CALENDAR_2026
+# Query handlers, retrieval (faiss / numpy / index) and boto3 load on
+# first use, so greetings and commands don't pay for them at cold start.
+from backend.lazy import lazy
+
+hybrid_search = lazy("backend.retrieval", "hybrid_search")
+handle_food = lazy("backend.food_query", "handle_food")
+handle_vahana_pooja = lazy("backend.vahana_query", "handle_vahana_pooja")
+handle_arjitha_seva = lazy("backend.arjitha_seva_query", "handle_arjitha_seva")
+handle_satyanarayana_pooja = lazy("backend.satyanarayana_query", "handle_satyanarayana_pooja")
+handle_items_required = lazy("backend.items_catalog_query", "handle_items_required")
+handle_temple_hours = lazy("backend.temple_info_query", "handle_temple_hours")
+handle_vedic_recitation = lazy("backend.temple_info_query", "handle_vedic_recitation")
+handle_location = lazy("backend.temple_info_query", "handle_location")
+handle_contacts = lazy("backend.temple_info_query", "handle_contacts")
+handle_committee_queries = lazy("backend.temple_info_query", "handle_committee_queries")
+handle_cultural_programs = lazy("backend.temple_info_query", "handle_cultural_programs")
+handle_story = lazy("backend.story_query", "handle_story")
+handle_panchang = lazy("backend.panchangam", "handle_panchang")
+handle_homam = lazy("backend.homams_query", "handle_homam")
+handle_lunar_dates = lazy("backend.get_timing", "handle_lunar_dates")
+handle_calendar_events = lazy("backend.get_timing", "handle_calendar_events")
+handle_abhishekam = lazy("backend.get_timing", "handle_abhishekam")
+handle_kalyanam = lazy("backend.kalyanam_queries", "handle_kalyanam")
+handle_daily_pooja = lazy("backend.daily_pooja_query", "handle_daily_pooja")
+
+from backend.response_cache import get_response_cache, RESPONSE_CACHE_ENABLED
+from backend.intent_rules import classify, explain, time_words
 
 from backend.utility import (
     normalize_query,
@@ -179,101 +178,6 @@ from backend.utility import (
 
 MAX_QUERY_LEN= 500
 
-time_words = [
-
-    # -------- TODAY --------
-    "today",
-    "today's",
-    "todays",
-    "today schedule",
-    "today events",
-    "today at temple",
-
-    # -------- TOMORROW --------
-    "tomorrow",
-    "tomorrow's",
-    "tomorrows",
-    "tomorrow schedule",
-    "tomorrow events",
-    "tomo",
-    "tomo's events",
-    "tomo's activities",
-
-    # -------- YESTERDAY --------
-    "yesterday",
-    "yesterday's",
-    "yesterdays",
-
-    # -------- WEEK --------
-    "this week",
-    "next week",
-    "last week",
-    "coming week",
-    "upcoming week",
-    "following week",
-    "current week",
-    "weekend",
-    "weekends",
-    "next weekend",
-
-    "upcoming",
-    "coming",
-    "upcoming events",
-    "upcoming activities",
-
-    # -------- MONTH --------
-    "this month",
-    "next month",
-    "last month",
-    "upcoming month",
-    "current month",
-
-    # -------- YEAR --------
-    "this year",
-    "next year",
-    "last year",
-]
-
-calendar_words = [
-
-    # -------- EVENTS --------
-    "event",
-    "events",
-    "festival",
-    "festivals",
-
-    # -------- SCHEDULE --------
-    "schedule",
-    "timings",
-    "timing",
-    "time",
-    "program",
-    "programs",
-    "activity",
-    "activities",
-
-    # -------- HAPPENING --------
-    "happening",
-    "whats happening",
-    "what's happening",
-    "what is happening",
-    "what all is happening",
-
-    # -------- SPECIAL --------
-    "special",
-    "special events",
-    "today's special",
-    "todays special",
-
-    # -------- GENERIC USER PHRASES --------
-    "what's going on",
-    "whats going on",
-    "what is going on",
-    "anything today",
-    "anything special",
-    "anything happening",
-]
-
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 _bedrock_runtime = None
@@ -287,6 +191,7 @@ def get_bedrock_client():
     global _bedrock_runtime
     if _bedrock_runtime is None:
         try:
+            import boto3
             _bedrock_runtime = boto3.client(
                 service_name="bedrock-runtime",
                 region_name=os.getenv("AWS_REGION", "us-east-1")
@@ -309,33 +214,11 @@ def get_events_between(
     Returns all abhishekam dates between start and end (inclusive).
     Filters by deity if provided.
     """
+    from backend.calendar_index import CALENDAR_INDEX
 
-    results: List[date] = []
-    year = start.year
-
-    month_index = {
-        m.lower(): i + 1 for i, m in enumerate(CALENDAR_2026.keys())
-    }
-
-    for month, days in CALENDAR_2026.items():
-        month_num = month_index[month.lower()]
-
-        for day, info in days.items():
-            abhishekams = info.get("abhishekam", [])
-
-            for event in abhishekams:
-                if deity and deity.lower() not in event.lower():
-                    continue
-
-                try:
-                    event_day = date(year, month_num, day)
-                except ValueError:
-                    continue
-
-                if start <= event_day <= end:
-                    results.append(event_day)
-
-    results.sort()
+    results = [
+        d for d, _, _ in CALENDAR_INDEX.find(start, end, category="abhishekam", deity=deity)
+    ]
     return results
 
 def handle_rag_fallback(q: str, now: datetime) -> str | None:
@@ -362,30 +245,28 @@ def handle_rag_fallback(q: str, now: datetime) -> str | None:
         "meaning", "what is", "explain", "significance", "why", "about", "story"
     ]) else 10
 
+    # Date questions search only that month's chunks (and year's, when
+    # asked), instead of dropping off-month chunks after retrieval
+    filters = {}
+    if is_date_query and specified_month:
+        filters["month"] = specified_month
+        year_match = re.search(r"\b(20\d{2})\b", q)
+        if year_match:
+            filters["year"] = year_match.group(1)
+
     try:
-        chunks = get_chunks(q, k=k_value)
+        chunks = hybrid_search(q, k=k_value, filters=filters)
         if not chunks:
             return None
 
         texts = []
         seen = set()
 
-        month_abbr_map = {
-            'january': 'Jan','february': 'Feb','march': 'Mar','april': 'Apr',
-            'may': 'May','june': 'Jun','july': 'Jul','august': 'Aug',
-            'september': 'Sep','october': 'Oct','november': 'Nov','december': 'Dec'
-        }
-
         for chunk in chunks:
             text = chunk.get("text", "").strip()
             if len(text) < 20:
                 continue
 
-            if is_date_query and specified_month:
-                abbr = month_abbr_map.get(specified_month)
-                if abbr and abbr not in text and specified_month.capitalize() not in text:
-                    continue
-
             if text not in seen:
                 texts.append(text)
                 seen.add(text)
@@ -572,180 +453,11 @@ INTENT_HANDLERS = {
 }
 
 def classify_intent(q: str) -> Intent:
-    q = normalize_query(q.lower())
-
-    # ==================================================
-    # 🔱 VEDIC RECITATIONS (STRICT)
-    # ==================================================
-    if any(w in q for w in [
-        "suktham", "sukthams",
-        "sahasranamam", "sahasranama", "sahasranamams",
-        "vishnu sahasranamam", "lalitha sahasranamam",
-        "nama sankeerthanam", "namasankeerthanam",
-        "naama sankeerthanam",
-        "recitation", "chanting", "parayanam"
-    ]):
-        return Intent.VEDIC_RECITATION
-
-    # ==================================================
-    # 🧺 ITEMS / SAMAGRI (HIGH PRIORITY)
-    # ==================================================
-    if any(w in q for w in [
-        "item", "items", "samagri", "materials",
-        "bring", "required", "need"
-    ]):
-        return Intent.HOMAM_ITEMS
-    
-     # ==================================================
-    # 🚗 VAHANA POOJA
-    # ==================================================
-    if any(w in q for w in ["vahana", "vehicle", "car pooja"]):
-        return Intent.VAHANA_POOJA
-
-    # ==================================================
-    # 📞 CONTACTS
-    # ==================================================
-    if any(w in q for w in [
-        "chairman", "president", "manager", "temple manager",
-        "secretary", "treasurer",
-        "phone", "email", "contact"
-    ]):
-        return Intent.CONTACTS
-
-    # ==================================================
-    # 👥 COMMITTEES
-    # ==================================================
-    if any(w in q for w in [
-        "committee", "committees", "board",
-        "trustee", "leadership", "executive committee"
-    ]):
-        return Intent.COMMITTEE
-
-    # ==================================================
-    # 🎶 CULTURAL
-    # ==================================================
-    if any(w in q for w in ["dance", "music", "bhajan", "concert", "cultural", "singing", "cultural programs","cultural programme"]):
-        return Intent.CULTURAL
-
-
-    # ==================================================
-    # 📖 STORY / SIGNIFICANCE (NO DATE WORDS)
-    # ==================================================
-    if any(w in q for w in [
-        "story", "significance", "meaning",
-        "importance", "legend", "about", "why"
-    ]) and not any(w in q for w in [
-        "date", "dates", "when", "time", "timing"
-    ]) and not any(w in q for w in [
-        "kalyanam",
-        "abhishekam",
-        "homam",
-        "pooja",
-        "seva"]):
-        return Intent.STORY
-
-    # ==================================================
-    # 🪐 PANCHANG (DATE-SENSITIVE)
-    # ==================================================
-    if any(w in q for w in ["panchang", "panchangam", "tithi", "nakshatra", "star"]):
-        if "tomorrow" in q:
-            return Intent.PANCHANG_TOMORROW
-        if any(c.isdigit() for c in q) or any(m in q for m in [
-            "jan","feb","mar","apr","may","jun",
-            "jul","aug","sep","oct","nov","dec"
-        ]):
-            return Intent.PANCHANG_DATE
-        return Intent.PANCHANG_TODAY
-
-    # ==================================================
-    # 🍽️ FOOD / ANNADANAM
-    # ==================================================
-    if any(w in q for w in ["annadanam", "cafeteria", "food", "lunch", "prasadam", "annadanam today"]):
-        return Intent.FOOD
-      # ---------------- SATYANARAYANA POOJA (HIGH PRIORITY) ----------------
-    if "satyanarayana" in q or "satya narayana" in q:
-        return Intent.SATYANARAYANA_POOJA
-
-    # ==================================================
-    # 🕰️ TEMPLE HOURS
-    # ==================================================
-    if any(w in q for w in ["open", "close", "hours", "timing"]) \
-    and "satyanarayana" not in q \
-    and "satya narayana" not in q:
-        return Intent.TEMPLE_HOURS
-
-    # ==================================================
-    # 📍 LOCATION
-    # ==================================================
-    if any(w in q for w in ["address", "location", "where is", "directions"]):
-        return Intent.LOCATION
-
-    # ==================================================
-    # 🌕 LUNAR DATES (POORNIMA / AMAVASYA)
-    # ==================================================
-    if any(w in q for w in [
-        "poornima", "purnima", "amavasya",
-        "new moon", "full moon"
-    ]):
-        return Intent.LUNAR_DATES
-
-    # ==================================================
-    # 🔥 HOMAMS
-    # ==================================================
-    if "homam" in q:
-        return Intent.HOMAMS
-
-    # ==================================================
-    # 💍 KALYANAM
-    # ==================================================
-    if "kalyanam" in q:
-        return Intent.KALYANAM
-
-    # ==================================================
-    # 🪔 ABHISHEKAM
-    # ==================================================
-    if "abhishekam" in q:
-        if any(w in q for w in [
-            "sponsor", "sponsorship", "amount", "cost", "price"
-        ]):
-            return Intent.ABHISHEKAM_SPONSORSHIP
-        return Intent.WEEKLY_ABHISHEKAM
-
-    # ==================================================
-    # 📅 EVENTS (GENERIC — TIME RESOLVED LATER)
-    # ==================================================
-    if (
-    (
-        any(t in q for t in time_words)
-        or any(m.lower() in q for m in calendar.month_name if m)
-        or any(w in q for w in calendar_words)
-    )
-    and not any(f in q for f in FOOD_KEYWORDS)
-    and not any(w in q for w in [
-        "daily pooja",
-        "suprabhata",
-        "nitya archana",
-        "archana",
-    ])
-):
-        return Intent.EVENTS
-
-    # ==================================================
-    # 🌅 DAILY POOJA / SUPRABHATA
-    # ==================================================
-    if "suprabhata" in q or "daily pooja" in q:
-        return Intent.DAILY_POOJA
-
-    # ==================================================
-    # 🪔 ARJITHA SEVA
-    # ==================================================
-    if "arjitha" in q:
-        return Intent.ARJITHA_SEVA
-
-    # ==================================================
-    # 🤖 FALLBACK (RAG)
-    # ==================================================
-    return Intent.RAG_FALLBACK
+    """
+    Rule table + keyword automaton live in backend/intent_rules.py.
+    Use intent_rules.explain(q) to see which rule fired.
+    """
+    return Intent(classify(q))
 
 def is_weekend_day(dt: datetime) -> bool:
     return dt.weekday() >= 5   # 5 = Saturday, 6 = Sunday
@@ -792,6 +504,23 @@ def answer_user(
 
     print(f"[DEBUG] INTENT={intent.name} | QUERY='{q}' | NOW={now.date()}")
 
+    # ------------------ RESPONSE CACHE ------------------
+    cache = get_response_cache() if RESPONSE_CACHE_ENABLED else None
+    if cache:
+        cached = cache.get(q, intent.value, now)
+        if cached is not None:
+            print(f"[CACHE] HIT intent={intent.name} | {cache.stats()}")
+            return cached
+
+    answer = _answer_for_intent(q, intent, now)
+
+    if cache:
+        cache.put(q, intent.value, now, answer)
+
+    return answer
+
+
+def _answer_for_intent(q: str, intent: Intent, now: datetime) -> str:
     # ------------------ ESCALATION ------------------
     if set(q.split()) & {
         "priest", "archaka", "pandit", "pujari","kanakabhishekam"
@@ -824,8 +553,6 @@ def answer_user(
         )
 
     # ------------------ EVENT HANDLING (SINGLE ENTRY) ------------------
-    result = handle_calendar_events(q, now)
-
     if intent == Intent.EVENTS:
         result = handle_calendar_events(q, now)
         print("result", result)
@@ -895,6 +622,8 @@ def answer_user(
         and "month" in q
         and any(w in q for w in ["schedule", "pooja", "events"])
     ):
+        from backend.constants import MONTHLY_SCHEDULE
+
         blocks = []
         blocks.append("📆 MONTHLY POOJA SCHEDULE")
         blocks.append("")
@@ -0,0 +1,332 @@
+#backend/broadcast.py
+#
+"""
+Fan-out of one WhatsApp message to many subscribers.
+
+A bounded pool of worker threads sends (normally through the pooled
+backend.graph_client.GraphClient) behind a shared token bucket
+sized to the Graph API throughput tier. 429 and 5xx responses are
+retried with exponential backoff and jitter, and Retry-After is
+honoured. The outcome is recorded per recipient.
+
+Finished recipients are checkpointed under a run id. A run cut short by
+the Lambda deadline resumes on the next invocation with the recipients
+it had not reached, instead of messaging everyone again.
+"""
+
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from backend.graph_client import HttpResponse
+from backend.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Cloud API default tier is 80 messages/second per phone number
+BROADCAST_RATE_PER_SEC = float(os.getenv("BROADCAST_RATE_PER_SEC", "80"))
+BROADCAST_WORKERS = int(os.getenv("BROADCAST_WORKERS", "16"))
+BROADCAST_MAX_RETRIES = int(os.getenv("BROADCAST_MAX_RETRIES", "4"))
+BROADCAST_BACKOFF_SECS = float(os.getenv("BROADCAST_BACKOFF_SECS", "0.5"))
+BROADCAST_MAX_BACKOFF_SECS = 30.0
+BROADCAST_CHECKPOINT_DIR = Path(os.getenv("BROADCAST_CHECKPOINT_DIR", "/tmp/broadcast"))
+
+# persist progress after this many finished recipients
+CHECKPOINT_EVERY = 25
+
+# 0 = no HTTP response at all (timeout, connection reset)
+RETRYABLE_STATUS = {0, 429, 500, 502, 503, 504}
+
+
+# ============================================================
+# CHECKPOINTS
+# ============================================================
+# A checkpoint maps recipient → final HTTP status for one run id.
+# save() appends only the recipients finished since the previous save,
+# so a run of N recipients writes O(N) in total and no single record
+# grows with the audience.
+
+class FileCheckpoint:
+    """One JSON-lines file per run id; each save appends one line."""
+
+    def __init__(self, directory: Path = BROADCAST_CHECKPOINT_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, run_id: str) -> Path:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in run_id)
+        return self.directory / f"{safe}.jsonl"
+
+    def load(self, run_id: str) -> dict[str, int]:
+        done: dict[str, int] = {}
+        try:
+            with open(self._path(run_id), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        done.update(json.loads(line))
+                    except ValueError:
+                        # a line torn by a crash mid-append: those recipients are resent
+                        logger.warning("Skipping a damaged line in checkpoint %s", run_id)
+        except FileNotFoundError:
+            pass
+        return done
+
+    def save(self, run_id: str, finished: dict[str, int]):
+        path = self._path(run_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(finished, separators=(",", ":")) + "\n")
+
+    def clear(self, run_id: str):
+        try:
+            self._path(run_id).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class DynamoCheckpoint:
+    """
+    Checkpoint items in an existing DynamoDB table, so progress survives
+    a new Lambda container. Each save puts one chunk item
+    (broadcast-checkpoint#<run id>#<n>) holding only the recipients it
+    finished; a head item counts the chunks with an atomic ADD. Every
+    item stays far below DynamoDB's 400 KB limit whatever the audience
+    size, and expires through the table's `ttl` attribute.
+    """
+
+    def __init__(self, table, key_name: str = "event_hash", ttl_days: int = 7):
+        self.table = table
+        self.key_name = key_name
+        self.ttl_days = ttl_days
+
+    def _key(self, run_id: str, chunk: Optional[int] = None) -> dict:
+        suffix = "" if chunk is None else f"#{chunk}"
+        return {self.key_name: f"broadcast-checkpoint#{run_id}{suffix}"}
+
+    def _chunks(self, run_id: str) -> int:
+        item = self.table.get_item(Key=self._key(run_id)).get("Item")
+        return int(item.get("chunks", 0)) if item else 0
+
+    def load(self, run_id: str) -> dict[str, int]:
+        done: dict[str, int] = {}
+        for n in range(1, self._chunks(run_id) + 1):
+            item = self.table.get_item(Key=self._key(run_id, n)).get("Item")
+            # a chunk whose put failed after its number was taken: resent
+            if item:
+                done.update(json.loads(item["done"]))
+        return done
+
+    def save(self, run_id: str, finished: dict[str, int]):
+        ttl = int(time.time()) + self.ttl_days * 24 * 60 * 60
+        resp = self.table.update_item(
+            Key=self._key(run_id),
+            UpdateExpression="ADD chunks :one SET #ttl = :ttl",
+            ExpressionAttributeNames={"#ttl": "ttl"},
+            ExpressionAttributeValues={":one": 1, ":ttl": ttl},
+            ReturnValues="UPDATED_NEW",
+        )
+        chunk = int(resp["Attributes"]["chunks"])
+        self.table.put_item(Item={
+            **self._key(run_id, chunk),
+            "done": json.dumps(finished, separators=(",", ":")),
+            "ttl": ttl,
+        })
+
+    def clear(self, run_id: str):
+        for n in range(1, self._chunks(run_id) + 1):
+            self.table.delete_item(Key=self._key(run_id, n))
+        self.table.delete_item(Key=self._key(run_id))
+
+
+# ============================================================
+# ENGINE
+# ============================================================
+
+class RecipientResult(NamedTuple):
+    recipient: str
+    ok: bool
+    status: int
+    attempts: int
+    error: Optional[str] = None
+
+
+class BroadcastReport(NamedTuple):
+    run_id: str
+    results: dict[str, RecipientResult]   # this invocation only
+    done: dict[str, int]                  # every finished recipient, incl. earlier runs
+    resumed: int                          # recipients skipped thanks to the checkpoint
+    complete: bool                        # False if the deadline stopped the run
+
+    @property
+    def delivered(self) -> int:
+        return sum(1 for s in self.done.values() if 200 <= s < 300)
+
+    @property
+    def failed(self) -> int:
+        return len(self.done) - self.delivered
+
+
+def _is_ok(status: int) -> bool:
+    return 200 <= status < 300
+
+
+def _retry_after(headers: dict) -> Optional[float]:
+    for k, v in headers.items():
+        if k.lower() == "retry-after":
+            try:
+                return max(0.0, float(v))
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class BroadcastEngine:
+
+    def __init__(
+        self,
+        send: Callable[[dict], HttpResponse],
+        workers: int = BROADCAST_WORKERS,
+        rate: float = BROADCAST_RATE_PER_SEC,
+        max_retries: int = BROADCAST_MAX_RETRIES,
+        backoff: float = BROADCAST_BACKOFF_SECS,
+        checkpoint=None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.send = send
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.checkpoint = checkpoint
+        self.bucket = TokenBucket(rate, clock=clock, sleep=sleep)
+        self._clock = clock
+        self._sleep = sleep
+
+    def _delay(self, attempt: int, resp: HttpResponse) -> float:
+        retry_after = _retry_after(resp.headers)
+        if retry_after is not None:
+            return min(retry_after, BROADCAST_MAX_BACKOFF_SECS)
+        delay = min(self.backoff * (2 ** (attempt - 1)), BROADCAST_MAX_BACKOFF_SECS)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _deliver(self, recipient: str, payload: dict, deadline: Optional[float]) -> Optional[RecipientResult]:
+        """Final result for one recipient, or None if the deadline stopped it."""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.bucket.acquire()
+            try:
+                resp = self.send(payload)
+            except Exception as e:
+                logger.error("Broadcast send error for %s", recipient, exc_info=True)
+                resp = HttpResponse(0, {}, str(e).encode())
+
+            if _is_ok(resp.status):
+                return RecipientResult(recipient, True, resp.status, attempt)
+
+            error = resp.body[:300].decode("utf-8", errors="replace")
+            if resp.status not in RETRYABLE_STATUS or attempt > self.max_retries:
+                logger.warning("Broadcast to %s failed: %s %s", recipient, resp.status, error)
+                return RecipientResult(recipient, False, resp.status, attempt, error)
+
+            delay = self._delay(attempt, resp)
+            if resp.status == 429:
+                self.bucket.pause(delay)
+            if deadline is not None and self._clock() + delay >= deadline:
+                return None
+            self._sleep(delay)
+
+    def _save(self, run_id: str, unsaved: dict[str, int]) -> dict[str, int]:
+        """
+        Append unsaved to the checkpoint. A failed save (throttling, an
+        outage) must not abort the sends: it is logged and the same
+        recipients are retried with the next save. Returns what is
+        still unsaved.
+        """
+        try:
+            self.checkpoint.save(run_id, unsaved)
+            return {}
+        except Exception:
+            logger.error("Broadcast %s: checkpoint of %d recipients failed", run_id, len(unsaved), exc_info=True)
+            return unsaved
+
+    def run(
+        self,
+        run_id: str,
+        recipients: Iterable[str],
+        build_payload: Callable[[str], dict],
+        deadline: Optional[float] = None,
+    ) -> BroadcastReport:
+        """
+        Send build_payload(recipient) to every recipient not already
+        finished under run_id. recipients is consumed lazily, so it can
+        be a stream (SubscriberRoster.iter_active). deadline is a clock()
+        value after which no new sends start; progress so far is
+        checkpointed.
+        """
+        done: dict[str, int] = dict(self.checkpoint.load(run_id)) if self.checkpoint else {}
+        resumed = len(done)
+        results: dict[str, RecipientResult] = {}
+        interrupted = False
+        unsaved: dict[str, int] = {}
+
+        if resumed:
+            logger.info("Broadcast %s resuming: %d already done", run_id, resumed)
+
+        max_in_flight = self.workers * 2
+        in_flight = {}
+
+        def pending():
+            for r in recipients:
+                if r not in done and r not in in_flight.values():
+                    yield r
+
+        it = pending()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            exhausted = False
+
+            while in_flight or not exhausted:
+                while not exhausted and not interrupted and len(in_flight) < max_in_flight:
+                    if deadline is not None and self._clock() >= deadline:
+                        interrupted = True
+                        break
+                    recipient = next(it, None)
+                    if recipient is None:
+                        exhausted = True
+                        break
+                    fut = pool.submit(self._deliver, recipient, build_payload(recipient), deadline)
+                    in_flight[fut] = recipient
+
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    recipient = in_flight.pop(fut)
+                    result = fut.result()
+                    if result is None:
+                        interrupted = True
+                        continue
+                    results[recipient] = result
+                    done[recipient] = result.status
+                    unsaved[recipient] = result.status
+
+                if self.checkpoint and len(unsaved) >= CHECKPOINT_EVERY:
+                    unsaved = self._save(run_id, unsaved)
+
+        complete = not interrupted
+        if self.checkpoint and unsaved:
+            self._save(run_id, unsaved)
+
+        report = BroadcastReport(run_id, results, done, resumed, complete)
+        logger.info(
+            "Broadcast %s: %d delivered, %d failed, %d resumed, complete=%s",
+            run_id, report.delivered, report.failed, resumed, complete,
+        )
+        return report
@@ -1,11 +1,14 @@
 # backend/build_index.py
+#
+# Usage: python -m backend.build_index
 
 import os
 import glob
 import json
 import faiss
 import numpy as np
-from embeddings import embed_text_bedrock, chunk_text
+from backend.embeddings import chunk_text, titan
+from backend.embedding_pipeline import EmbeddingPipeline
 
 BASE_DIR = os.path.dirname(__file__)
 DATA_RAW_DIR = os.path.join(BASE_DIR, "..", "data_raw")
@@ -34,7 +37,6 @@ def main():
     docs = load_all_txt()
 
     all_chunks = []
-    vectors = []
 
     # 1. chunk and collect all text pieces
     for (name, txt) in docs:
@@ -42,10 +44,10 @@ def main():
         for c in chs:
             all_chunks.append(c)
 
-    # 2. embed each chunk
-    for c in all_chunks:
-        vec = embed_text_bedrock(c["text"])
-        vectors.append(vec)
+    # 2. embed the chunks: Titan takes one text per request, so the
+    #    pipeline runs several requests at once behind its rate limit
+    pipeline = EmbeddingPipeline(titan)
+    vectors = pipeline.embed([c["text"] for c in all_chunks])
 
     vectors_np = np.array(vectors).astype("float32")
 
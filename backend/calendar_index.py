@@ -0,0 +1,158 @@
+#backend/calendar_index.py
+#
+"""
+Date-indexed view of the temple calendar.
+
+The calendar (every year in backend/calendar_store/calendar.json, built
+by backend/calendar_ingest.py) is nested month → day → category → [names],
+which forces a full walk for every range or "next N" question.
+CalendarIndex flattens it once into a date-sorted list of
+(date, category, name) entries and keeps postings lists per category and
+per name filter, so:
+
+- range / next-N queries are a bisect plus the matching slice
+- year-wide category listings ("festivals", "this year") are O(result)
+- federal holidays are merged in per year, computed once
+"""
+
+import calendar
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Optional
+
+from backend.calendar_ingest import load_calendar_artifact
+from backend.federal_holidays import get_federal_holidays
+
+MONTH_NUMBERS = {m.lower(): i for i, m in enumerate(calendar.month_name) if m}
+
+Entry = tuple[date, str, str]   # (date, category, name)
+
+
+class _Postings:
+    """Entries for one (category, needle) filter, with a parallel date list for bisect."""
+
+    __slots__ = ("entries", "dates")
+
+    def __init__(self, entries: list[Entry]):
+        self.entries = entries
+        self.dates = [e[0] for e in entries]
+
+    def between(self, start: date, end: date) -> list[Entry]:
+        lo = bisect_left(self.dates, start)
+        hi = bisect_right(self.dates, end)
+        return self.entries[lo:hi]
+
+
+class CalendarIndex:
+
+    def __init__(self, calendars: dict[int, dict]):
+        """calendars: {year: {month_name: {day: {category: [names]}}}}"""
+        entries: list[Entry] = []
+
+        for year, months in calendars.items():
+            for month, days in months.items():
+                month_num = MONTH_NUMBERS[month.lower()]
+                for day, info in days.items():
+                    try:
+                        d = date(year, month_num, day)
+                    except ValueError:
+                        continue
+                    for category, names in info.items():
+                        for name in names:
+                            entries.append((d, category, name))
+
+        # stable sort keeps the calendar's category order within a day
+        entries.sort(key=lambda e: e[0])
+
+        self.years = sorted(calendars)
+        # last day the calendar can answer for
+        self.end = date(self.years[-1], 12, 31) if self.years else date.min
+        self._all = _Postings(entries)
+        self._by_date: dict[date, list[Entry]] = {}
+        by_category: dict[str, list[Entry]] = {}
+        for e in entries:
+            self._by_date.setdefault(e[0], []).append(e)
+            by_category.setdefault(e[1], []).append(e)
+
+        self._postings: dict[tuple, _Postings] = {
+            (None, None): self._all,
+            **{(c, None): _Postings(es) for c, es in by_category.items()},
+        }
+
+    # -------------------- POSTINGS --------------------
+
+    def _get_postings(self, category: Optional[str], needle: Optional[str]) -> _Postings:
+        """
+        Postings for a category and/or a case-insensitive substring of the
+        event name (deity filter). Built on first use, then reused.
+        """
+        needle = needle.lower() if needle else None
+        key = (category, needle)
+        postings = self._postings.get(key)
+        if postings is None:
+            base = self._postings.get((category, None))
+            entries = [e for e in base.entries if needle in e[2].lower()] if base and needle else []
+            postings = _Postings(entries)
+            self._postings[key] = postings
+        return postings
+
+    # -------------------- QUERIES --------------------
+
+    def find(
+        self,
+        start: date,
+        end: date,
+        category: Optional[str] = None,
+        deity: Optional[str] = None,
+    ) -> list[Entry]:
+        """Entries between start and end (inclusive), date-ordered."""
+        return self._get_postings(category, deity).between(start, end)
+
+    def next_occurrences(
+        self,
+        start: date,
+        n: int,
+        category: Optional[str] = None,
+        deity: Optional[str] = None,
+        distinct_dates: bool = True,
+    ) -> list[date]:
+        """First n dates on or after start with a matching entry."""
+        postings = self._get_postings(category, deity)
+        lo = bisect_left(postings.dates, start)
+
+        results: list[date] = []
+        for d in postings.dates[lo:]:
+            if distinct_dates and results and results[-1] == d:
+                continue
+            results.append(d)
+            if len(results) >= n:
+                break
+        return results
+
+    def events_on(self, d: date, include_holidays: bool = True) -> dict[str, list[str]]:
+        """{category: [names]} for one day, the shape the calendar uses."""
+        events: dict[str, list[str]] = {}
+        for _, category, name in self._by_date.get(d, ()):
+            events.setdefault(category, []).append(name)
+
+        if include_holidays:
+            holiday = get_federal_holidays(d.year).get(d)
+            # parsed calendars often list the holiday itself as a festival
+            if holiday and not any(holiday in names for names in events.values()):
+                events.setdefault("holiday", []).append(holiday)
+
+        return events
+
+    def days_with_events(self, start: date, end: date, include_holidays: bool = True) -> list[date]:
+        """Sorted distinct days in [start, end] that have a temple event or holiday."""
+        days = set(self._all.dates[bisect_left(self._all.dates, start):bisect_right(self._all.dates, end)])
+
+        if include_holidays:
+            for year in range(start.year, end.year + 1):
+                days.update(h for h in get_federal_holidays(year) if start <= h <= end)
+
+        return sorted(days)
+
+
+CALENDARS, CALENDAR_VERSION = load_calendar_artifact()
+CALENDAR_INDEX = CalendarIndex(CALENDARS)
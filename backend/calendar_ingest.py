@@ -0,0 +1,340 @@
+#backend/calendar_ingest.py
+#
+"""
+Build step for the temple calendar artifact.
+
+Every year under data_raw/Events/<year> is parsed into the same
+month → day → category → [names] shape as CALENDAR_2026 and written,
+for all years at once, to one versioned JSON file:
+
+    backend/calendar_store/calendar.json
+
+A hand-curated backend/calender_<year>.py (CALENDAR_<year>) takes
+precedence over the parsed text for its year. The runtime only loads the
+JSON (once, at import of backend.calendar_index), so adding next year's
+files needs a rebuild, not a code change.
+
+The same step writes the panchang table (backend/panchang_table.py) to
+backend/calendar_store/panchang.json.
+
+Usage:
+    python -m backend.calendar_ingest
+"""
+
+import calendar
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+EVENTS_DIR = BASE_DIR / "data_raw" / "Events"
+CURATED_DIR = BASE_DIR / "backend"
+CALENDAR_ARTIFACT_PATH = Path(os.getenv(
+    "CALENDAR_ARTIFACT_PATH",
+    str(BASE_DIR / "backend" / "calendar_store" / "calendar.json"),
+))
+
+SCHEMA_VERSION = 1
+
+MONTHS = [m.lower() for m in calendar.month_name if m]
+MONTH_LOOKUP = {
+    **{m: i + 1 for i, m in enumerate(MONTHS)},
+    **{m[:3]: i + 1 for i, m in enumerate(MONTHS)},
+}
+
+# Order matters: the first category whose keyword appears wins
+CATEGORY_KEYWORDS = [
+    ("satyanarayana", re.compile(r"\bsatyanarayana\b", re.IGNORECASE)),
+    ("kalyanam", re.compile(r"\bkalyanam\b", re.IGNORECASE)),
+    ("homam", re.compile(r"\bhomam\b", re.IGNORECASE)),
+    ("abhishekam", re.compile(r"\babhi(?:s|sh)ekam\b", re.IGNORECASE)),
+]
+DEFAULT_CATEGORY = "festival"
+
+_MONTH_RE = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+
+# "Jan 13 - Bhogi / Sri Goda (Andal) Kalyanam"
+HEADLINE_RE = re.compile(rf"^{_MONTH_RE}\s+(\d{{1,2}})\s+-\s+(.+)$", re.IGNORECASE)
+
+# "NOVEMBER 2ND, 2025 - SRI TULASI KALYANAM"
+DATED_TITLE_RE = re.compile(
+    rf"^{_MONTH_RE}\s+(\d{{1,2}})(?:st|nd|rd|th)?,\s*(\d{{4}})\s+-\s+(.+)$",
+    re.IGNORECASE,
+)
+
+# "Saturday, Jan 4, 11:00 AM" / "Full Moon Day - Sunday/Monday, May 11-12, 2025 at 06:30 PM"
+BLOCK_HEADER_RE = re.compile(
+    rf"^(?:.*?\s-\s)?[a-z]+day(?:/[a-z]+day)?,\s+{_MONTH_RE}\s+(\d{{1,2}})\b",
+    re.IGNORECASE,
+)
+
+# Bullet lines inside a dated block that are not events
+_SKIP_ITEM_RE = re.compile(r"^(sponsorship|special event)\s*:|^\d{1,2}:\d{2}\s*[ap]m", re.IGNORECASE)
+
+# "Sri Sudarsana/Narasimha Homam & Abhishekam"
+_HOMAM_AND_ABHISHEKAM_RE = re.compile(r"^(.*\S)\s+homam\s*&\s*abhishekam\b(.*)$", re.IGNORECASE)
+
+
+# ============================================================
+# CLASSIFICATION
+# ============================================================
+
+def categorize(name: str) -> str:
+    for category, pattern in CATEGORY_KEYWORDS:
+        if pattern.search(name):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def split_title(title: str) -> list[tuple[str, str]]:
+    """
+    Split a headline into (category, name) parts.
+
+    "Bhogi / Sri Goda (Andal) Kalyanam" → festival "Bhogi",
+    kalyanam "Sri Goda (Andal) Kalyanam". Adjacent parts of the same
+    category stay together, and a bare "Sri <deity>" part is joined to
+    the part after it ("Sri Sudarsana / Narasimha Homam").
+    """
+    title = " ".join(title.split())
+
+    m = _HOMAM_AND_ABHISHEKAM_RE.match(title)
+    if m:
+        head, tail = m.group(1), m.group(2)
+        return [
+            ("homam", f"{head} Homam{tail}"),
+            ("abhishekam", f"{head} Abhishekam{tail}"),
+        ]
+
+    parts = [p.strip() for p in title.split(" / ") if p.strip()]
+    merged: list[list[str]] = []   # [category, name]
+    carry = ""
+
+    for part in parts:
+        if carry:
+            part = f"{carry} / {part}"
+            carry = ""
+
+        category = categorize(part)
+        if category == DEFAULT_CATEGORY and part.lower().startswith("sri ") and part is not parts[-1]:
+            carry = part
+            continue
+
+        if merged and merged[-1][0] == category:
+            merged[-1][1] = f"{merged[-1][1]} / {part}"
+        else:
+            merged.append([category, part])
+
+    if carry:
+        merged.append([categorize(carry), carry])
+
+    return [(c, n) for c, n in merged]
+
+
+def _display_case(title: str) -> str:
+    """Long-form files shout their titles; bring them back to Title Case."""
+    if title.isupper():
+        return re.sub(r"(?<![\w'])[a-z]", lambda m: m.group(0).upper(), title.lower())
+    return title
+
+
+# ============================================================
+# PARSING
+# ============================================================
+
+def parse_events_text(text: str, year: int) -> dict[str, dict[int, dict[str, list[str]]]]:
+    """
+    Parse one monthly events file into {month: {day: {category: [names]}}}.
+
+    Understands the three layouts used under data_raw/Events:
+    headline lists ("Jan 13 - ..."), dated blocks with "- item" bullets
+    ("Saturday, Jan 4, 11:00 AM"), and long-form sections
+    ("NOVEMBER 2ND, 2025 - ...").
+    """
+    result: dict[str, dict[int, dict[str, list[str]]]] = {}
+
+    def add(month_num: int, day: int, title: str):
+        try:
+            calendar.weekday(year, month_num, day)
+        except ValueError:
+            return
+        days = result.setdefault(MONTHS[month_num - 1], {})
+        info = days.setdefault(day, {})
+        for category, name in split_title(title):
+            names = info.setdefault(category, [])
+            if name.lower() not in (n.lower() for n in names):
+                names.append(name)
+
+    block: tuple[int, int] | None = None
+
+    for raw in text.splitlines():
+        line = raw.strip()
+
+        if not line:
+            block = None
+            continue
+
+        if line.startswith("-"):
+            if block:
+                item = line.lstrip("- ").strip()
+                if item and not _SKIP_ITEM_RE.search(item):
+                    add(*block, item)
+            continue
+
+        block = None
+
+        m = DATED_TITLE_RE.match(line)
+        if m:
+            if int(m.group(3)) == year:
+                add(MONTH_LOOKUP[m.group(1).lower()[:3]], int(m.group(2)), _display_case(m.group(4)))
+            continue
+
+        m = BLOCK_HEADER_RE.match(line)
+        if m:
+            block = (MONTH_LOOKUP[m.group(1).lower()[:3]], int(m.group(2)))
+            continue
+
+        m = HEADLINE_RE.match(line)
+        if m and not re.match(rf"^{_MONTH_RE}\s+\d", m.group(3), re.IGNORECASE):
+            add(MONTH_LOOKUP[m.group(1).lower()[:3]], int(m.group(2)), m.group(3))
+
+    return result
+
+
+def parse_events_dir(year_dir: Path) -> dict[str, dict[int, dict[str, list[str]]]]:
+    """Merge every *_Events.txt file of one year into one calendar dict."""
+    year = int(year_dir.name)
+    merged: dict[str, dict[int, dict[str, list[str]]]] = {}
+
+    for path in sorted(year_dir.glob("*.txt")):
+        parsed = parse_events_text(path.read_text(encoding="utf-8", errors="ignore"), year)
+        for month, days in parsed.items():
+            for day, info in days.items():
+                target = merged.setdefault(month, {}).setdefault(day, {})
+                for category, names in info.items():
+                    bucket = target.setdefault(category, [])
+                    bucket.extend(n for n in names if n not in bucket)
+
+    # calendar order: months Jan → Dec, days ascending
+    return {
+        m: dict(sorted(merged[m].items()))
+        for m in MONTHS if m in merged
+    }
+
+
+def load_curated_calendars() -> dict[int, dict]:
+    """{year: CALENDAR_<year>} for every backend/calender_<year>.py."""
+    curated = {}
+    for path in sorted(CURATED_DIR.glob("calender_*.py")):
+        suffix = path.stem.split("_", 1)[1]
+        if not suffix.isdigit():
+            continue
+        module = importlib.import_module(f"backend.{path.stem}")
+        data = getattr(module, f"CALENDAR_{suffix}", None)
+        if data:
+            curated[int(suffix)] = data
+    return curated
+
+
+def collect_calendars(events_dir: Path = EVENTS_DIR) -> dict[int, dict]:
+    """All years: curated modules first, parsed text for the rest."""
+    calendars = load_curated_calendars()
+
+    if events_dir.is_dir():
+        for year_dir in sorted(events_dir.iterdir()):
+            if not (year_dir.is_dir() and year_dir.name.isdigit()):
+                continue
+            year = int(year_dir.name)
+            if year in calendars:
+                continue
+            calendars[year] = parse_events_dir(year_dir)
+
+    return dict(sorted(calendars.items()))
+
+
+# ============================================================
+# ARTIFACT
+# ============================================================
+
+def _to_json(calendars: dict[int, dict]) -> dict:
+    return {
+        str(year): {
+            month: {str(day): info for day, info in days.items()}
+            for month, days in months.items()
+        }
+        for year, months in calendars.items()
+    }
+
+
+def _from_json(data: dict) -> dict[int, dict]:
+    return {
+        int(year): {
+            month: {int(day): info for day, info in days.items()}
+            for month, days in months.items()
+        }
+        for year, months in data.items()
+    }
+
+
+def make_artifact(calendars: dict[int, dict]) -> dict:
+    body = _to_json(calendars)
+    version = hashlib.sha1(
+        json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "version": version,
+        "years": sorted(calendars),
+        "calendars": body,
+    }
+
+
+def build_calendar_artifact(path: Path = CALENDAR_ARTIFACT_PATH) -> dict:
+    artifact = make_artifact(collect_calendars())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+    return artifact
+
+
+def load_calendar_artifact(path: Path = CALENDAR_ARTIFACT_PATH) -> tuple[dict[int, dict], str]:
+    """
+    (calendars, version) from the built artifact.
+    Falls back to building in memory if the artifact is missing or from an
+    older schema, so a fresh checkout still answers calendar questions.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            artifact = json.load(f)
+        if artifact.get("schema_version") == SCHEMA_VERSION:
+            return _from_json(artifact["calendars"]), artifact["version"]
+        logger.warning("Calendar artifact schema %s != %s, rebuilding in memory",
+                       artifact.get("schema_version"), SCHEMA_VERSION)
+    except FileNotFoundError:
+        logger.warning("Calendar artifact not found: %s, building in memory", path)
+
+    artifact = make_artifact(collect_calendars())
+    return _from_json(artifact["calendars"]), artifact["version"]
+
+
+if __name__ == "__main__":
+    from backend.panchang_table import PANCHANG_ARTIFACT_PATH, write_panchang_artifact
+
+    artifact = build_calendar_artifact()
+    for year in artifact["years"]:
+        months = artifact["calendars"][str(year)]
+        count = sum(len(n) for days in months.values() for info in days.values() for n in info.values())
+        print(f"{year}: {count} events")
+    print(f"Saved {CALENDAR_ARTIFACT_PATH} (version {artifact['version'][:12]})")
+    days = write_panchang_artifact()
+    print(f"Saved {PANCHANG_ARTIFACT_PATH} ({days} days)")
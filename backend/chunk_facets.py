@@ -0,0 +1,201 @@
+#backend/chunk_facets.py
+#
+"""
+Metadata facets for the RAG chunks, pre-partitioned for filtered search.
+
+handle_rag_fallback used to fetch 10-20 chunks and then drop the ones
+whose text lacked the month it was asked about, so date questions lost
+most of their k (and sometimes every chunk). Each chunk now carries
+facets extracted at build time:
+
+    source    data_raw path, "/"-separated
+    category  first folder under data_raw: events, panchang, poojas, rituals
+    year      from the path (Panchang/2026/...), else years in the text
+    month     months in the file name and in the text ("March", "Mar 14")
+    deity     canonical names from DEITY_ALIASES found in the text
+
+and the index keeps one sorted chunk-id partition per facet value,
+so retrieval can search only e.g. the "march" chunks:
+
+    backend/faiss_store/facets.idx   (marshal)
+        partitions     {facet: {value: array 'I' bytes}}
+        chunks_sha256  of the chunk blob it was built from
+
+A missing or stale file is rebuilt in memory from the chunk store, as
+for the lexical index.
+"""
+
+import logging
+import marshal
+import os
+import re
+from array import array
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from backend.artifact_bundle import atomic_write
+from backend.chunk_store import load_or_build_index
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FACET_INDEX_PATH = Path(os.getenv(
+    "FACET_INDEX_PATH",
+    str(BASE_DIR / "backend" / "faiss_store" / "facets.idx"),
+))
+
+INDEX_FORMAT = 1
+
+FACETS = ("source", "category", "year", "month", "deity")
+
+MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december")
+
+# canonical deity -> names it appears under (also drives query expansion)
+DEITY_ALIASES = {
+    "hanuman": ["hanuman", "anjaneya", "maruti"],
+    "ganesha": ["ganesha", "ganapathi", "vinayaka", "ganesh"],
+    "shiva": ["shiva", "siva", "maheswara", "rudra"],
+    "vishnu": ["vishnu", "venkateswara", "venkateshwara", "srinivasa"],
+    "lakshmi": ["lakshmi", "mahalakshmi", "sri devi"],
+    "saraswati": ["saraswati", "sarada"],
+    "murugan": ["murugan", "subramanya", "kartikeya"],
+    "sai baba": ["sai baba", "shirdi sai", "sai"],
+    "andal": ["andal", "goda devi"],
+}
+
+_YEAR_RE = re.compile(r"\b(20\d{2})\b")
+# run over lowercased text; an abbreviation (and "may") only counts next to a day or year
+_MONTH_RE = re.compile(
+    r"\b(" + "|".join(MONTHS) + r"|jan|feb|mar|apr|jun|jul|aug|sept?|oct|nov|dec)\b\.?(\s+\d{1,4}\b)?")
+_MONTH_OF = {**{m: m for m in MONTHS}, **{m[:3]: m for m in MONTHS}, "sept": "september"}
+_DEITY_OF = {alias: deity for deity, aliases in DEITY_ALIASES.items() for alias in aliases}
+_DEITY_RE = re.compile(r"\b(" + "|".join(map(re.escape, sorted(_DEITY_OF, key=len, reverse=True))) + r")\b")
+
+
+def normalize_source(source: str) -> str:
+    """meta.json sources were written on Windows; compare them "/"-separated."""
+    return source.replace("\\", "/")
+
+
+def _months_in(lower: str) -> set[str]:
+    found = set()
+    for m in _MONTH_RE.finditer(lower):
+        word = m.group(1)
+        if m.group(2) or (word in MONTHS and word != "may"):
+            found.add(_MONTH_OF[word])
+    return found
+
+
+def extract_facets(source: str, text: str) -> dict[str, list[str]]:
+    """Facet values of one chunk; every facet maps to a (possibly empty) sorted list."""
+    path = normalize_source(source)
+    parts = path.split("/")
+    category = parts[1].lower() if len(parts) > 2 and parts[0] == "data_raw" else ""
+
+    years = set(_YEAR_RE.findall(path)) or set(_YEAR_RE.findall(text))
+    stem = re.sub(r"[^a-z]+", " ", parts[-1].lower())
+    lower = text.lower()
+    months = {m for m in MONTHS if m in stem.split()} | _months_in(lower)
+    deities = {_DEITY_OF[m.group(1)] for m in _DEITY_RE.finditer(lower)}
+
+    return {
+        "source": [path],
+        "category": [category] if category else [],
+        "year": sorted(years),
+        "month": sorted(months, key=MONTHS.index),
+        "deity": sorted(deities),
+    }
+
+
+def _value(value) -> str:
+    return str(value).strip().lower()
+
+
+class FacetIndex:
+
+    def __init__(self, partitions: dict[str, dict[str, array]], count: int,
+                 chunks_sha256: Optional[str] = None):
+        self.partitions = partitions
+        self.count = count
+        self.chunks_sha256 = chunks_sha256
+
+    # -------------------- BUILD --------------------
+
+    @classmethod
+    def build(cls, facets: Iterable[Mapping[str, list[str]]], chunks_sha256: Optional[str] = None) -> "FacetIndex":
+        """facets: extract_facets() of every chunk, in chunk order."""
+        partitions: dict[str, dict[str, array]] = {facet: {} for facet in FACETS}
+        count = 0
+        for chunk_id, chunk_facets in enumerate(facets):
+            count += 1
+            for facet in FACETS:
+                for value in chunk_facets.get(facet, ()):
+                    partitions[facet].setdefault(_value(value), array("I")).append(chunk_id)
+        return cls(partitions, count, chunks_sha256)
+
+    def save(self, path: Path = FACET_INDEX_PATH):
+        atomic_write(path, marshal.dumps({
+            "format": INDEX_FORMAT,
+            "count": self.count,
+            "partitions": {facet: {value: ids.tobytes() for value, ids in values.items()}
+                           for facet, values in self.partitions.items()},
+            "chunks_sha256": self.chunks_sha256,
+        }))
+
+    @classmethod
+    def load(cls, path: Path = FACET_INDEX_PATH) -> Optional["FacetIndex"]:
+        try:
+            data = marshal.loads(Path(path).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if data.get("format") != INDEX_FORMAT:
+            return None
+        partitions = {}
+        for facet, values in data["partitions"].items():
+            partitions[facet] = {}
+            for value, raw in values.items():
+                ids = array("I")
+                ids.frombytes(raw)
+                partitions[facet][value] = ids
+        return cls(partitions, data["count"], data.get("chunks_sha256"))
+
+    # -------------------- SELECT --------------------
+
+    def values(self, facet: str) -> list[str]:
+        return sorted(self.partitions.get(facet, {}))
+
+    def select(self, filters: Mapping[str, object]) -> Optional[list[int]]:
+        """
+        Sorted chunk ids matching filters, e.g. {"month": "march", "year": 2026}.
+        A value may be a list (any of them). Facets are ANDed.
+        Returns None when filters is empty (no restriction).
+        """
+        selected: Optional[set[int]] = None
+        for facet, wanted in filters.items():
+            if facet not in FACETS:
+                raise ValueError(f"Unknown facet {facet!r}; expected one of {FACETS}")
+            if wanted is None:
+                continue
+            if isinstance(wanted, (str, int)):
+                wanted = [wanted]
+            if facet == "source":
+                wanted = [normalize_source(w) for w in wanted]
+            ids: set[int] = set()
+            for value in wanted:
+                ids.update(self.partitions[facet].get(_value(value), ()))
+            selected = ids if selected is None else selected & ids
+            if not selected:
+                return []
+        return None if selected is None else sorted(selected)
+
+
+def load_or_build(store, path: Path = FACET_INDEX_PATH) -> FacetIndex:
+    """The saved index if it matches store's chunks, else one built from the store."""
+    return load_or_build_index(
+        store, path, FacetIndex.load,
+        lambda sha: FacetIndex.build(
+            (extract_facets(store.source(i), store.text(i)) for i in range(len(store))), sha),
+        "Facet index",
+    )
@@ -0,0 +1,228 @@
+#backend/chunk_store.py
+#
+"""
+Compact, memory-mapped store for the RAG chunks.
+
+meta.json as a list of dicts keeps a str per text and per source for all
+chunks, and keyword search lowercased every text on every call. The
+store keeps instead (files written by backend/artifact_bundle.py):
+
+    chunks.bin / chunks.idx              UTF-8 texts + count+1 offsets
+    chunks.lower.bin / chunks.lower.idx  the same texts, lowercased
+    chunks.src                           uint16 source id per chunk
+
+All of them are mmapped, so the pages are shared and only touched ones
+become resident. Chunks come out as ChunkView objects (id + store
+reference): chunk["text"], chunk.get("source") and dict(chunk) work as
+with the old dicts, and the text is only decoded when it is read.
+find_all() runs keyword search as bytes.find over the lowercase blob.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+from bisect import bisect_right
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from backend.artifact_bundle import (
+    BUNDLE_DIR, BUNDLE_FORMAT, CHUNKS_BLOB, CHUNKS_INDEX, CHUNKS_LOWER_BLOB,
+    CHUNKS_LOWER_INDEX, CHUNKS_SOURCES, MANIFEST, VECTORS, encode_chunks,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+T = TypeVar("T")
+
+
+def _map(path: Path):
+    """Read-only mmap of path (plain bytes for an empty file, which can't be mapped)."""
+    with open(path, "rb") as f:
+        if not f.seek(0, 2):
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _offsets(buf) -> memoryview:
+    return memoryview(buf).cast("B").cast("Q")
+
+
+class ChunkView(Mapping):
+    """One chunk, read from the store on access. Behaves as {"id", "source", "text"}."""
+
+    __slots__ = ("_store", "id")
+    _KEYS = ("id", "source", "text")
+
+    def __init__(self, store: "ChunkStore", i: int):
+        self._store = store
+        self.id = i
+
+    @property
+    def text(self) -> str:
+        return self._store.text(self.id)
+
+    @property
+    def source(self) -> str:
+        return self._store.source(self.id)
+
+    def __getitem__(self, key: str):
+        if key == "text":
+            return self._store.text(self.id)
+        if key == "source":
+            return self._store.source(self.id)
+        if key == "id":
+            return self.id
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"ChunkView({self.id}, source={self.source!r})"
+
+
+class ChunkStore:
+
+    def __init__(self, blob, offsets, lower_blob, lower_offsets, source_ids, sources: list[str],
+                 manifest: Optional[dict] = None, bundle_dir: Optional[Path] = None):
+        self._blob = blob
+        self._offsets = offsets
+        self._lower = lower_blob
+        self._lower_offsets = lower_offsets
+        self._source_ids = source_ids
+        self.sources = sources
+        self.manifest = manifest or {}
+        self.dir = bundle_dir
+        self.count = len(offsets) - 1
+        if len(lower_offsets) != self.count + 1 or len(source_ids) != self.count:
+            raise ValueError(f"Chunk store {bundle_dir or '(memory)'} is inconsistent")
+
+    # -------------------- CONSTRUCTION --------------------
+
+    @classmethod
+    def open(cls, bundle_dir: Path = BUNDLE_DIR) -> "ChunkStore":
+        bundle_dir = Path(bundle_dir)
+        with open(bundle_dir / MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format {manifest.get('format')}")
+
+        store = cls(
+            _map(bundle_dir / CHUNKS_BLOB),
+            _offsets(_map(bundle_dir / CHUNKS_INDEX)),
+            _map(bundle_dir / CHUNKS_LOWER_BLOB),
+            _offsets(_map(bundle_dir / CHUNKS_LOWER_INDEX)),
+            memoryview(_map(bundle_dir / CHUNKS_SOURCES)).cast("B").cast("H"),
+            [str(s) for s in manifest["sources"]],
+            manifest,
+            bundle_dir,
+        )
+        if store.count != manifest["count"]:
+            raise ValueError(f"Chunk store {bundle_dir} is inconsistent with its manifest")
+        return store
+
+    @classmethod
+    def from_meta(cls, meta: Iterable[dict], embedder: Optional[str] = None) -> "ChunkStore":
+        """In-memory store from meta.json entries (fallback when there is no bundle)."""
+        enc = encode_chunks(meta)
+        manifest = {"count": len(enc.source_ids), "chunks_sha256": hashlib.sha256(enc.blob).hexdigest(),
+                    "embedder": embedder}
+        return cls(bytes(enc.blob), enc.offsets, bytes(enc.lower_blob), enc.lower_offsets,
+                   enc.source_ids, enc.sources, manifest)
+
+    # -------------------- ACCESS --------------------
+
+    def __len__(self) -> int:
+        return self.count
+
+    def text(self, i: int) -> str:
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+
+    def lower_text(self, i: int) -> str:
+        return self._lower[self._lower_offsets[i]:self._lower_offsets[i + 1]].decode("utf-8")
+
+    def source(self, i: int) -> str:
+        return self.sources[self._source_ids[i]]
+
+    def __getitem__(self, i: int) -> ChunkView:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return ChunkView(self, i)
+
+    def __iter__(self) -> Iterator[ChunkView]:
+        for i in range(self.count):
+            yield ChunkView(self, i)
+
+    # -------------------- KEYWORD SEARCH --------------------
+
+    def _ids_containing(self, keyword: str) -> set[int]:
+        needle = keyword.lower().encode("utf-8")
+        found = set()
+        if not needle:
+            return set(range(self.count))
+        pos = self._lower.find(needle)
+        while pos != -1:
+            i = bisect_right(self._lower_offsets, pos) - 1
+            end = self._lower_offsets[i + 1]
+            if pos + len(needle) <= end:
+                found.add(i)
+                pos = self._lower.find(needle, end)       # next chunk
+            else:
+                pos = self._lower.find(needle, pos + 1)   # match ran into the next chunk
+        return found
+
+    def find_all(self, keywords: Iterable[str], k: int) -> list[ChunkView]:
+        """The first k chunks (in store order) whose text contains every keyword, case-insensitively."""
+        ids = None
+        for kw in keywords:
+            hits = self._ids_containing(kw)
+            ids = hits if ids is None else ids & hits
+            if not ids:
+                return []
+        ordered = sorted(ids)[:k] if ids is not None else range(min(k, self.count))
+        return [ChunkView(self, i) for i in ordered]
+
+    # -------------------- VECTORS --------------------
+
+    def has_vectors(self) -> bool:
+        return (self.dir is not None and self.manifest.get("dim") is not None
+                and (self.dir / VECTORS).exists())
+
+    def vectors(self):
+        """The embedding matrix, memory-mapped read-only."""
+        import numpy as np
+        return np.load(self.dir / VECTORS, mmap_mode="r")
+
+
+def open_chunk_store(bundle_dir: Path = BUNDLE_DIR) -> Optional[ChunkStore]:
+    """The store in bundle_dir, or None if there is none (or it is unreadable)."""
+    if not (Path(bundle_dir) / MANIFEST).exists():
+        return None
+    try:
+        return ChunkStore.open(bundle_dir)
+    except (OSError, ValueError, KeyError, TypeError):
+        logger.warning("Ignoring unreadable chunk store at %s", bundle_dir, exc_info=True)
+        return None
+
+
+def load_or_build_index(store, path: Path, load: Callable[[Path], Optional[T]],
+                        build: Callable[[Optional[str]], T], name: str) -> T:
+    """
+    An index derived from the chunks (lexical, facets): load(path) if it
+    was built from store's chunks, i.e. same count and chunks_sha256,
+    else build(chunks_sha256) in memory.
+    """
+    expected = store.manifest.get("chunks_sha256")
+    index = load(path)
+    if index is not None and index.count == len(store) and (expected is None or index.chunks_sha256 == expected):
+        return index
+    logger.info("%s at %s missing or stale; building in memory", name, path)
+    return build(expected)
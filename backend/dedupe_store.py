@@ -0,0 +1,154 @@
+#backend/dedupe_store.py
+#
+"""
+Drop redelivered WhatsApp webhook messages.
+
+Meta redelivers a webhook payload when it does not get a fast 200, so
+the same messages[].id can arrive several times, on the same warm
+container or on different ones. MessageDedupe.claim(message_id) returns
+True exactly once per id:
+
+- a per-process TTL set answers repeats on a warm container without a
+  round trip
+- a conditional put (attribute_not_exists, or an expired ttl) in the
+  temple-events table decides across containers; DynamoDB TTL removes
+  the markers later
+
+If the handler fails after claiming, release() removes the claim so
+Meta's retry is answered instead of dropped.
+
+In async webhook mode the handler claims each id under a separate
+prefix before enqueueing it, so a redelivery is never enqueued twice,
+and the queue worker claims it again under the usual one before
+answering.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Meta keeps retrying a failed delivery for up to 7 days
+MESSAGE_DEDUPE_TTL_SECS = int(os.getenv("MESSAGE_DEDUPE_TTL_SECS", str(7 * 24 * 60 * 60)))
+LOCAL_DEDUPE_TTL_SECS = 15 * 60
+LOCAL_DEDUPE_MAX = 10_000
+
+
+class TTLSet:
+    """Bounded set whose members expire after ttl seconds (oldest evicted first)."""
+
+    def __init__(self, ttl: float, max_size: int = LOCAL_DEDUPE_MAX,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._items: OrderedDict[str, float] = OrderedDict()   # key → expires at
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self._items:
+            key, expires = next(iter(self._items.items()))
+            if expires > now and len(self._items) <= self.max_size:
+                break
+            self._items.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._expire(self._clock())
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(self._clock())
+            return len(self._items)
+
+    def add(self, key: str) -> bool:
+        """Add key; False if it was already present."""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            if key in self._items:
+                return False
+            self._items[key] = now + self.ttl
+            self._expire(now)
+            return True
+
+    def discard(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+
+
+def _is_conditional_failure(error: Exception) -> bool:
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code == "ConditionalCheckFailedException"
+
+
+class DynamoDedupeStore:
+    """One marker item per message id, written with a conditional put."""
+
+    def __init__(self, table, key_name: str = "event_hash", prefix: str = "wamid",
+                 ttl_secs: int = MESSAGE_DEDUPE_TTL_SECS, wall_clock: Callable[[], float] = time.time):
+        self.table = table
+        self.key_name = key_name
+        self.prefix = prefix
+        self.ttl_secs = ttl_secs
+        self._wall_clock = wall_clock
+
+    def _key(self, message_id: str) -> dict:
+        return {self.key_name: f"{self.prefix}#{message_id}"}
+
+    def put_if_absent(self, message_id: str) -> bool:
+        now = int(self._wall_clock())
+        try:
+            self.table.put_item(
+                Item={**self._key(message_id), "ttl": now + self.ttl_secs},
+                # TTL deletion lags, so an expired marker counts as absent
+                ConditionExpression=f"attribute_not_exists({self.key_name}) OR #ttl < :now",
+                ExpressionAttributeNames={"#ttl": "ttl"},
+                ExpressionAttributeValues={":now": now},
+            )
+            return True
+        except Exception as e:
+            if _is_conditional_failure(e):
+                return False
+            raise
+
+    def delete(self, message_id: str):
+        self.table.delete_item(Key=self._key(message_id))
+
+
+class MessageDedupe:
+
+    def __init__(self, store=None, local: Optional[TTLSet] = None):
+        """store: DynamoDedupeStore or None for process-local dedupe only."""
+        self.store = store
+        self.local = local if local is not None else TTLSet(LOCAL_DEDUPE_TTL_SECS)
+
+    def claim(self, message_id: str) -> bool:
+        """True if this is the first delivery of message_id."""
+        if not self.local.add(message_id):
+            return False
+        if self.store is None:
+            return True
+        try:
+            if self.store.put_if_absent(message_id):
+                return True
+        except Exception:
+            # answering twice beats not answering at all
+            logger.warning("Dedupe store unavailable for %s; processing anyway", message_id, exc_info=True)
+            return True
+        return False
+
+    def release(self, message_id: str):
+        """Forget a claim so a redelivery of message_id is processed."""
+        self.local.discard(message_id)
+        if self.store is not None:
+            try:
+                self.store.delete(message_id)
+            except Exception:
+                logger.warning("Could not release dedupe claim %s", message_id, exc_info=True)
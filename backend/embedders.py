@@ -0,0 +1,206 @@
+#backend/embedders.py
+#
+"""
+Embedding backends, selected by config.
+
+EMBEDDER picks the backend for both the build (documents) and
+retrieval (queries):
+
+    cohere  (default)  Cohere Embed v3 on Bedrock, 1024 dims, 96 texts/request
+    titan              Titan Text Embeddings v2 on Bedrock, one text/request
+    local              hashed term-frequency projection on the CPU:
+                       no network, no per-call charge, microseconds per query
+
+Every embedder has model_id, id ("<kind>:<model_id>"), dim (None when
+the service decides), max_batch, remote, embed(texts) for documents and
+embed_query(text), so it plugs straight into
+backend/embedding_pipeline.py.
+
+build.py records embedder.id in meta.json and the bundle manifest, and
+retrieval checks it when the index is loaded: an index built with one
+embedder and queried with another fails loudly
+(EmbedderMismatchError) instead of returning nearest neighbours in an
+unrelated vector space.
+"""
+
+import json
+import logging
+import math
+import os
+import zlib
+from typing import Optional
+
+from backend.lazy import lazy_resource
+from backend.lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+EMBEDDER = os.getenv("EMBEDDER", "cohere")
+BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-east-1")
+LOCAL_EMBED_DIM = int(os.getenv("LOCAL_EMBED_DIM", "512"))
+
+# indexes written before the embedder was recorded were built with Cohere
+DEFAULT_INDEX_EMBEDDER = "bedrock-cohere:cohere.embed-english-v3"
+
+
+class EmbedderMismatchError(ValueError):
+    pass
+
+
+@lazy_resource
+def get_bedrock_runtime():
+    import boto3
+    return boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+
+
+# ============================================================
+# BEDROCK
+# ============================================================
+
+class _BedrockEmbedder:
+    kind = ""
+    remote = True
+
+    def __init__(self, model_id: str, client=None):
+        self.model_id = model_id
+        self._client = client
+
+    @property
+    def id(self) -> str:
+        return f"{self.kind}:{self.model_id}"
+
+    @property
+    def client(self):
+        return self._client or get_bedrock_runtime()
+
+    def _invoke(self, body: dict) -> dict:
+        resp = self.client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps(body),
+            contentType="application/json",
+        )
+        return json.loads(resp["body"].read())
+
+
+class BedrockCohereEmbedder(_BedrockEmbedder):
+    """
+    Cohere Embed on Bedrock: up to 96 texts per request. Texts are cut
+    to 2000 chars, as the original build did, below Cohere's 2048 limit.
+    """
+
+    kind = "bedrock-cohere"
+    dim = 1024
+    max_batch = 96
+    max_chars = 2000
+
+    def __init__(self, model_id: str = "cohere.embed-english-v3", client=None):
+        super().__init__(model_id, client)
+
+    def _embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        body = {"texts": [t[:self.max_chars] for t in texts], "input_type": input_type}
+        return self._invoke(body)["embeddings"]
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(texts, "search_document")
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed([text], "search_query")[0]
+
+
+class BedrockTitanEmbedder(_BedrockEmbedder):
+    """Titan Text Embeddings on Bedrock: one inputText per request."""
+
+    kind = "bedrock-titan"
+    dim = None
+    max_batch = 1
+
+    def __init__(self, model_id: str = "amazon.titan-embed-text-v2:0", client=None):
+        super().__init__(model_id, client)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._invoke({"inputText": text})["embedding"]
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(t) for t in texts]
+
+
+# ============================================================
+# LOCAL
+# ============================================================
+
+class LocalHashEmbedder:
+    """
+    Signed feature hashing of words and word pairs (tokenized as in the
+    lexical index) with sublinear term frequency, L2-normalized. Close
+    texts share buckets, so L2 search ranks by term overlap. Pure
+    Python and deterministic across processes (crc32, not hash()).
+    """
+
+    kind = "local-hash"
+    remote = False
+    max_batch = 256
+    BIGRAM_WEIGHT = 0.5
+
+    def __init__(self, dim: int = LOCAL_EMBED_DIM):
+        self.dim = dim
+        self.model_id = f"v1-{dim}"
+
+    @property
+    def id(self) -> str:
+        return f"{self.kind}:{self.model_id}"
+
+    def embed_query(self, text: str) -> list[float]:
+        tokens = tokenize(text)
+        weights: dict[str, float] = {}
+        for tok in tokens:
+            weights[tok] = weights.get(tok, 0.0) + 1.0
+        for a, b in zip(tokens, tokens[1:]):
+            pair = f"{a} {b}"
+            weights[pair] = weights.get(pair, 0.0) + self.BIGRAM_WEIGHT
+
+        vec = [0.0] * self.dim
+        for feature, tf in weights.items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vec[h % self.dim] += sign * (1.0 + math.log(tf) if tf > 1.0 else tf)
+
+        norm = math.sqrt(sum(x * x for x in vec))
+        return [x / norm for x in vec] if norm else vec
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(t) for t in texts]
+
+
+# ============================================================
+# SELECTION
+# ============================================================
+
+EMBEDDERS = {
+    "cohere": BedrockCohereEmbedder,
+    "titan": BedrockTitanEmbedder,
+    "local": LocalHashEmbedder,
+}
+
+
+def get_embedder(name: Optional[str] = None, client=None):
+    """The embedder named by name (default: the EMBEDDER setting)."""
+    name = (name or EMBEDDER).strip().lower()
+    factory = EMBEDDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown EMBEDDER {name!r}; expected one of {sorted(EMBEDDERS)}")
+    if factory is LocalHashEmbedder:
+        return factory()
+    return factory(client=client)
+
+
+def check_index_embedder(recorded: Optional[str], embedder, dim: Optional[int] = None):
+    """Raise EmbedderMismatchError unless the index was built with embedder."""
+    recorded = recorded or DEFAULT_INDEX_EMBEDDER
+    if recorded != embedder.id:
+        raise EmbedderMismatchError(
+            f"Index was built with {recorded} but EMBEDDER selects {embedder.id}; "
+            f"rebuild it (python build.py) or set EMBEDDER to match"
+        )
+    if dim is not None and embedder.dim is not None and dim != embedder.dim:
+        raise EmbedderMismatchError(f"Index has {dim}-dim vectors but {embedder.id} produces {embedder.dim}")
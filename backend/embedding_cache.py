@@ -0,0 +1,219 @@
+#backend/embedding_cache.py
+#
+"""
+Content-addressed cache for query embeddings.
+
+Two layers:
+- in-process LRU (survives warm Lambda invocations)
+- SQLite file on disk (survives as long as /tmp does, and across
+  processes when EMBED_CACHE_PATH points at shared storage)
+
+Keys are sha256(model_id | input_type | normalized text), so the same
+question embedded with another model or input_type never collides.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "/tmp/svt_embed_cache.sqlite3")
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "512"))
+
+# Used for "saved latency" until we have measured a real Bedrock call
+DEFAULT_MISS_MS = 250.0
+
+
+# ============================================================
+# KEYING
+# ============================================================
+
+def normalize_cache_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivial variants share a key."""
+    return " ".join(text.lower().split())
+
+
+def make_cache_key(model_id: str, input_type: str, text: str) -> str:
+    raw = f"{model_id}|{input_type}|{normalize_cache_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _to_blob(vector) -> bytes:
+    return array("f", [float(x) for x in vector]).tobytes()
+
+
+def _from_blob(blob: bytes) -> list[float]:
+    vec = array("f")
+    vec.frombytes(blob)
+    return vec.tolist()
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class EmbeddingCache:
+    """
+    LRU in memory, SQLite on disk. Vectors are stored as float32 blobs.
+    If the disk layer cannot be opened the cache keeps working in memory.
+    """
+
+    def __init__(self, path: Optional[str] = EMBED_CACHE_PATH, max_items: int = EMBED_CACHE_SIZE):
+        self.path = path
+        self.max_items = max_items
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self._miss_ms_total = 0.0
+
+        if path:
+            self._open_disk(path)
+
+    def _open_disk(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " vector BLOB NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error:
+            logger.warning("Embedding cache disk layer unavailable: %s", path, exc_info=True)
+            self._db = None
+
+    # -------------------- LAYERS --------------------
+
+    def _remember(self, key: str, vector: list[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> tuple[Optional[list[float]], Optional[str]]:
+        """Returns (vector, layer) where layer is 'memory', 'disk' or None."""
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return vector, "memory"
+
+            if self._db is None:
+                return None, None
+
+            try:
+                row = self._db.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                logger.warning("Embedding cache read failed", exc_info=True)
+                return None, None
+
+            if not row:
+                return None, None
+
+            vector = _from_blob(row[0])
+            self._remember(key, vector)
+            return vector, "disk"
+
+    def put(self, key: str, vector) -> list[float]:
+        vector = [float(x) for x in vector]
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                        (key, _to_blob(vector), time.time()),
+                    )
+                    self._db.commit()
+                except sqlite3.Error:
+                    logger.warning("Embedding cache write failed", exc_info=True)
+        return vector
+
+    # -------------------- MAIN ENTRY --------------------
+
+    def get_or_embed(
+        self,
+        model_id: str,
+        input_type: str,
+        text: str,
+        embed_fn: Callable[[str], list[float]],
+    ) -> tuple[list[float], dict]:
+        """
+        Return the cached vector for text, calling embed_fn(text) on a miss.
+        The second value describes this lookup for per-request logging.
+        """
+        key = make_cache_key(model_id, input_type, text)
+        start = time.perf_counter()
+
+        vector, layer = self.get(key)
+        if vector is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            saved = max(self.average_miss_ms() - elapsed_ms, 0.0)
+            with self._lock:
+                if layer == "memory":
+                    self.memory_hits += 1
+                else:
+                    self.disk_hits += 1
+                self.saved_ms += saved
+            return vector, {"source": layer, "ms": elapsed_ms, "saved_ms": saved}
+
+        vector = embed_fn(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        vector = self.put(key, vector)
+        with self._lock:
+            self.misses += 1
+            self._miss_ms_total += elapsed_ms
+        return vector, {"source": "bedrock", "ms": elapsed_ms, "saved_ms": 0.0}
+
+    # -------------------- STATS --------------------
+
+    def average_miss_ms(self) -> float:
+        if not self.misses:
+            return DEFAULT_MISS_MS
+        return self._miss_ms_total / self.misses
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (hits / total) if total else 0.0,
+            "saved_ms": self.saved_ms,
+            "avg_miss_ms": self.average_miss_ms(),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+
+_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Module-level cache, created once per container."""
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache()
+    return _cache
@@ -0,0 +1,210 @@
+#backend/embedding_manifest.py
+#
+"""
+Content-hash manifest of document embeddings, for incremental builds.
+
+build.py used to re-embed every chunk on every run, even when a single
+event file changed. The manifest maps sha256(chunk text) to the float32
+vector Bedrock returned for it, so a rebuild only embeds chunks whose
+text is new:
+
+    backend/faiss_store/embeddings.marshal
+        format, model_id, input_type, dim
+        vectors  {content hash: float32 bytes}
+        chunks   [(source, content hash)] of the last build, in order
+
+A manifest written for another model / input_type is ignored (every
+chunk is embedded again). After a build it holds exactly the current
+chunks' hashes, so removed chunks drop out.
+"""
+
+import hashlib
+import logging
+import marshal
+import math
+import os
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence
+
+from backend.artifact_bundle import atomic_write
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+EMBEDDING_MANIFEST_PATH = Path(os.getenv(
+    "EMBEDDING_MANIFEST_PATH",
+    str(BASE_DIR / "backend" / "faiss_store" / "embeddings.marshal"),
+))
+
+MANIFEST_FORMAT = 1
+
+
+def content_hash(text: str) -> str:
+    """Exact text, not normalized: the document vector depends on every character."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingManifest:
+
+    def __init__(self, model_id: str, input_type: str, dim: Optional[int] = None,
+                 vectors: Optional[dict[str, bytes]] = None,
+                 chunks: Optional[list[tuple[str, str]]] = None):
+        self.model_id = model_id
+        self.input_type = input_type
+        self.dim = dim
+        self.vectors = vectors or {}
+        self.chunks = chunks or []
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self.vectors
+
+    def get(self, digest: str) -> Optional[array]:
+        blob = self.vectors.get(digest)
+        if blob is None:
+            return None
+        vec = array("f")
+        vec.frombytes(blob)
+        return vec
+
+    def put(self, digest: str, vector: Iterable[float]):
+        blob = array("f", [float(x) for x in vector]).tobytes()
+        dim = len(blob) // 4
+        if self.dim is None:
+            self.dim = dim
+        elif dim != self.dim:
+            raise ValueError(f"Embedding of dim {dim} in a manifest of dim {self.dim}")
+        self.vectors[digest] = blob
+
+    def retain(self, chunks: list[tuple[str, str]]):
+        """Keep only the vectors of chunks and record them as the last build."""
+        keep = {digest for _, digest in chunks}
+        self.vectors = {d: v for d, v in self.vectors.items() if d in keep}
+        self.chunks = list(chunks)
+
+    # -------------------- PERSISTENCE --------------------
+
+    @classmethod
+    def load(cls, model_id: str, input_type: str,
+             path: Path = EMBEDDING_MANIFEST_PATH) -> "EmbeddingManifest":
+        """The stored manifest for model_id / input_type, or an empty one."""
+        try:
+            data = marshal.loads(Path(path).read_bytes())
+        except FileNotFoundError:
+            return cls(model_id, input_type)
+        except (OSError, EOFError, ValueError, TypeError):
+            logger.warning("Ignoring unreadable embedding manifest at %s", path, exc_info=True)
+            return cls(model_id, input_type)
+        if (data.get("format") != MANIFEST_FORMAT
+                or data.get("model_id") != model_id
+                or data.get("input_type") != input_type):
+            logger.info("Embedding manifest at %s is for another model; embedding everything", path)
+            return cls(model_id, input_type)
+        return cls(model_id, input_type, data["dim"], data["vectors"],
+                   [tuple(c) for c in data["chunks"]])
+
+    def save(self, path: Path = EMBEDDING_MANIFEST_PATH):
+        atomic_write(path, marshal.dumps({
+            "format": MANIFEST_FORMAT,
+            "model_id": self.model_id,
+            "input_type": self.input_type,
+            "dim": self.dim,
+            "vectors": self.vectors,
+            "chunks": self.chunks,
+        }))
+
+
+# ============================================================
+# INCREMENTAL EMBEDDING
+# ============================================================
+
+class BuildDiff(NamedTuple):
+    files_added: list[str]
+    files_changed: list[str]
+    files_removed: list[str]
+    chunks_reused: int          # vector taken from the manifest
+    chunks_embedded: int        # distinct new texts sent to the embedder
+    chunks_removed: int         # previous texts no longer in the corpus
+    calls: int                  # embedder requests made (batch_size texts each)
+    calls_saved: int            # vs embedding every chunk
+
+
+def _by_source(chunks: Iterable[tuple[str, str]]) -> dict[str, list[str]]:
+    grouped: dict[str, list[str]] = {}
+    for source, digest in chunks:
+        grouped.setdefault(source, []).append(digest)
+    return grouped
+
+
+def embed_incremental(
+    texts: Sequence[str],
+    sources: Sequence[str],
+    manifest: EmbeddingManifest,
+    embed_batch: Callable[[list[str]], list],
+    batch_size: int = 32,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+    checkpoint_every: Optional[int] = None,
+) -> tuple[list[array], BuildDiff]:
+    """
+    Vectors for texts (in order), embedding only texts the manifest lacks.
+
+    embed_batch gets checkpoint_every texts at a time (default
+    batch_size); pass a larger value with a pipeline that batches and
+    parallelizes requests itself (backend/embedding_pipeline.py). calls
+    counts requests of batch_size.
+
+    New vectors are added to manifest as each embed_batch call returns,
+    so a failed run keeps what it paid for if the caller saves the
+    manifest anyway. On success the manifest is trimmed to the current
+    chunks.
+    """
+    current = [(source, content_hash(text)) for source, text in zip(sources, texts)]
+    previous = manifest.chunks
+
+    missing: dict[str, str] = {}
+    for (_, digest), text in zip(current, texts):
+        if digest not in manifest and digest not in missing:
+            missing[digest] = text
+
+    pending = list(missing.items())
+    step = checkpoint_every or batch_size
+    calls = 0
+    for start in range(0, len(pending), step):
+        batch = pending[start:start + step]
+        vectors = embed_batch([text for _, text in batch])
+        if len(vectors) != len(batch):
+            raise ValueError(f"Embedder returned {len(vectors)} vectors for {len(batch)} texts")
+        for (digest, _), vector in zip(batch, vectors):
+            manifest.put(digest, vector)
+        calls += math.ceil(len(batch) / batch_size)
+        if on_batch:
+            on_batch(min(start + step, len(pending)), len(pending))
+
+    result = [manifest.get(digest) for _, digest in current]
+
+    old_files, new_files = _by_source(previous), _by_source(current)
+    current_digests = {digest for _, digest in current}
+    diff = BuildDiff(
+        files_added=sorted(set(new_files) - set(old_files)),
+        files_changed=sorted(s for s in set(new_files) & set(old_files) if new_files[s] != old_files[s]),
+        files_removed=sorted(set(old_files) - set(new_files)),
+        chunks_reused=sum(1 for _, digest in current if digest not in missing),
+        chunks_embedded=len(missing),
+        chunks_removed=len({d for _, d in previous} - current_digests),
+        calls=calls,
+        calls_saved=math.ceil(len(texts) / batch_size) - calls,
+    )
+    manifest.retain(current)
+    return result, diff
+
+
+def format_diff(diff: BuildDiff) -> str:
+    lines = [
+        f"files: +{len(diff.files_added)} ~{len(diff.files_changed)} -{len(diff.files_removed)}",
+        f"chunks: {diff.chunks_reused} reused, {diff.chunks_embedded} embedded, {diff.chunks_removed} removed",
+        f"embedding calls: {diff.calls} made, {diff.calls_saved} saved",
+    ]
+    for label, files in (("+", diff.files_added), ("~", diff.files_changed), ("-", diff.files_removed)):
+        lines.extend(f"  {label} {f}" for f in files)
+    return "\n".join(lines)
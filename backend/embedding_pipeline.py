@@ -0,0 +1,206 @@
+#backend/embedding_pipeline.py
+#
+"""
+Parallel, rate-limited document embedding for the index builds.
+
+build.py sent one batch of 32 texts at a time and backend/build_index.py
+one text per request. The pipeline keeps several requests in flight on
+a small thread pool behind a shared token bucket (backend/rate_limit.py),
+and:
+
+- sizes batches adaptively: each success doubles the next batch up to
+  the backend's max_batch, each throttle halves it
+- retries throttling / transient errors with exponential backoff and
+  jitter; a throttle also pauses every worker for that delay
+- reassembles results in input order, whatever order batches finish in
+
+Backends are the embedders in backend/embedders.py (anything with
+model_id, max_batch and embed(texts) -> list of vectors).
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from backend.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "4"))
+# Bedrock InvokeModel requests per second across all workers
+EMBED_RATE_PER_SEC = float(os.getenv("EMBED_RATE_PER_SEC", "8"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "6"))
+EMBED_BACKOFF_SECS = float(os.getenv("EMBED_BACKOFF_SECS", "1.0"))
+EMBED_MAX_BACKOFF_SECS = 30.0
+EMBED_INITIAL_BATCH = int(os.getenv("EMBED_INITIAL_BATCH", "32"))
+
+THROTTLING_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+TRANSIENT_CODES = {"ServiceUnavailableException", "InternalServerException", "ModelNotReadyException",
+                   "ModelTimeoutException", "RequestTimeout"}
+# network failures, matched by class name anywhere in the exception's MRO
+# so botocore need not be imported: its EndpointConnectionError,
+# ConnectTimeoutError, ReadTimeoutError and ConnectionClosedError do not
+# subclass the built-in ConnectionError / TimeoutError
+TRANSIENT_ERRORS = {"ConnectionError", "TimeoutError", "EndpointConnectionError", "ConnectTimeoutError",
+                    "ReadTimeoutError", "ConnectionClosedError", "HTTPClientError"}
+
+
+class EmbeddingError(RuntimeError):
+    pass
+
+
+def is_network_error(exc: BaseException) -> bool:
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(exc).__mro__)
+
+
+def error_code(exc: BaseException) -> Optional[str]:
+    """botocore ClientError code (exc.response["Error"]["Code"]), if any."""
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        return (response.get("Error") or {}).get("Code")
+    return None
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+class BatchSizer:
+    """Thread-safe adaptive batch size: doubles on success, halves on throttle."""
+
+    def __init__(self, initial: int, maximum: int):
+        self.maximum = max(1, maximum)
+        self._size = max(1, min(initial, self.maximum))
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def on_success(self):
+        with self._lock:
+            self._size = min(self.maximum, self._size * 2)
+
+    def on_throttle(self):
+        with self._lock:
+            self._size = max(1, self._size // 2)
+
+
+class PipelineStats(NamedTuple):
+    texts: int
+    requests: int           # embed() calls, including retried ones
+    retries: int
+    throttled: int
+    batch_size: int         # adaptive size at the end of the run
+
+
+class EmbeddingPipeline:
+
+    def __init__(
+        self,
+        backend,
+        workers: int = EMBED_WORKERS,
+        rate: float = EMBED_RATE_PER_SEC,
+        max_retries: int = EMBED_MAX_RETRIES,
+        backoff: float = EMBED_BACKOFF_SECS,
+        initial_batch: int = EMBED_INITIAL_BATCH,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sizer = BatchSizer(initial_batch, backend.max_batch)
+        self.bucket = TokenBucket(rate, clock=clock, sleep=sleep)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._texts = self._requests = self._retries = self._throttled = 0
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(self.backoff * (2 ** (attempt - 1)), EMBED_MAX_BACKOFF_SECS)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _embed_batch(self, texts: list[str]) -> list:
+        attempt = 0
+        while True:
+            attempt += 1
+            self.bucket.acquire()
+            with self._lock:
+                self._requests += 1
+            try:
+                vectors = self.backend.embed(texts)
+            except Exception as e:
+                code = error_code(e)
+                throttled = code in THROTTLING_CODES
+                retryable = throttled or code in TRANSIENT_CODES or is_network_error(e)
+                if not retryable or attempt > self.max_retries:
+                    raise EmbeddingError(
+                        f"Embedding {len(texts)} texts with {self.backend.model_id} failed "
+                        f"after {attempt} attempt(s): {code or type(e).__name__}"
+                    ) from e
+
+                delay = self._delay(attempt)
+                with self._lock:
+                    self._retries += 1
+                    self._throttled += throttled
+                if throttled:
+                    self.sizer.on_throttle()
+                    self.bucket.pause(delay)
+                logger.warning("Embedding batch of %d: %s, retry %d in %.1fs",
+                               len(texts), code or type(e).__name__, attempt, delay)
+                self._sleep(delay)
+                continue
+
+            if len(vectors) != len(texts):
+                raise EmbeddingError(f"{self.backend.model_id} returned {len(vectors)} vectors for {len(texts)} texts")
+            self.sizer.on_success()
+            return vectors
+
+    def embed(self, texts: Sequence[str], on_batch: Optional[Callable[[int, int], None]] = None) -> list:
+        """
+        Vectors for texts, in input order. on_batch(done, total) is called
+        on the caller's thread as batches finish. The first batch that
+        fails for good cancels the rest and raises EmbeddingError.
+        """
+        texts = list(texts)
+        total = len(texts)
+        results: list = [None] * total
+        done = 0
+        next_start = 0
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while in_flight or next_start < total:
+                    # batch size is read at submit time, so it follows throttling
+                    while next_start < total and len(in_flight) < self.workers:
+                        stop = min(total, next_start + self.sizer.size)
+                        future = pool.submit(self._embed_batch, texts[next_start:stop])
+                        in_flight[future] = (next_start, stop)
+                        next_start = stop
+
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        start, stop = in_flight.pop(future)
+                        results[start:stop] = future.result()
+                        done += stop - start
+                        if on_batch:
+                            on_batch(done, total)
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+        with self._lock:
+            self._texts += total
+        return results
+
+    def stats(self) -> PipelineStats:
+        with self._lock:
+            return PipelineStats(self._texts, self._requests, self._retries, self._throttled, self.sizer.size)
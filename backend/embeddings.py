@@ -1,36 +1,19 @@
 # backend/embeddings.py
 
-import boto3
-import json
-
-# Configure your region here.
-BEDROCK_REGION = "us-east-1"
+from backend.embedders import BedrockTitanEmbedder
 
 # Titan text embedding model ID (example; pick the one you enabled in Bedrock).
+# The backend itself lives in backend/embedders.py (EMBEDDER=titan).
 EMBED_MODEL_ID = "amazon.titan-embed-text-v2:0"
 
-bedrock_runtime = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+titan = BedrockTitanEmbedder(EMBED_MODEL_ID)
 
 def embed_text_bedrock(text: str) -> list[float]:
     """
     Call Bedrock Titan Embeddings to turn text into a vector.
     Returns a Python list[float].
     """
-    body = {
-        "inputText": text
-    }
-
-    response = bedrock_runtime.invoke_model(
-        modelId=EMBED_MODEL_ID,
-        body=json.dumps(body)
-    )
-
-    response_body = json.loads(response["body"].read())
-
-    # Titan returns the embedding vector usually under "embedding"
-    # If model shape changes, update this field accordingly.
-    embedding = response_body["embedding"]
-    return embedding
+    return titan.embed_query(text)
 
 def chunk_text(doc_text: str, source_name: str, max_chars: int = 500):
     """
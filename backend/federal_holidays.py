@@ -1,6 +1,7 @@
 #backend/federal_holidays.py
 # 
 from datetime import date, timedelta
+from functools import lru_cache
 
 def nth_weekday_of_month(year: int, month: int, weekday: int, n: int) -> date:
     """
@@ -31,9 +32,11 @@ def observe_if_weekend(d: date) -> date:
     return d
 
 
+@lru_cache(maxsize=None)
 def get_federal_holidays(year: int) -> dict[date, str]:
     """
     Returns {date: holiday_name}
+    Cached per year; callers must not mutate the result.
     """
     holidays = {}
 
@@ -6,13 +6,13 @@ from datetime import date
 import calendar
 from datetime import datetime, timedelta,date
 from typing import Optional, List
-import os
 import re
 import logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-from backend.calender_2026 import CALENDAR_2026
-from backend.federal_holidays import get_federal_holidays,nth_weekday_of_month
+from backend.calendar_index import CALENDAR_INDEX
+from backend.federal_holidays import nth_weekday_of_month
+from backend.lunar_index import AMAVASYA, FULLMOON, LunarDate, get_lunar_index
 from backend.sponsorship_catalog import SPONSORSHIP_CATALOG
 from backend.constants import WEEKLY_EVENTS
 
@@ -25,53 +25,20 @@ def get_calendar_events(date: datetime) -> dict:
     """
     Returns merged temple + federal holiday events for a date.
     """
-    events = {}
-
-    # ---------------- TEMPLE EVENTS ----------------
-    if date.year == 2026:
-        month = date.strftime("%B").lower()
-        events = CALENDAR_2026.get(month, {}).get(date.day, {}).copy()
-
-    # ---------------- FEDERAL HOLIDAYS ----------------
-    holidays = get_federal_holidays(date.year)
-    holiday = holidays.get(date.date())
-    if holiday:
-        events.setdefault("holiday", []).append(holiday)
-
-    return events
-
-def load_lunar_dates(year: int, lunar_type: str) -> list[str]:
-    """
-    lunar_type: 'Fullmoon' or 'Amavasya'
-    """
-    base = os.path.join(
-        "data_raw",
-        "Events",
-        str(year),
-        lunar_type
-    )
-
-    if not os.path.isdir(base):
-        logger.error("Lunar directory not found: %s", base)
-        return []
-
-    results = []
-
-    for fname in os.listdir(base):
-        if not fname.endswith(".txt"):
-            continue
-
-        path = os.path.join(base, fname)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    clean = line.strip()
-                    if clean:
-                        results.append(clean)
-        except Exception as e:
-            logger.error("Error reading lunar file %s", path, exc_info=True)
-
-    return results
+    return CALENDAR_INDEX.events_on(date.date())
+
+def format_lunar_date(rec: LunarDate) -> str:
+    # weekday from the date itself; the source files are not always right
+    line = f"• {rec.date:%B} {rec.date.day}, {rec.date.year} ({rec.date:%A})"
+    if rec.time:
+        line += f" at {rec.time}"
+    if rec.events:
+        line += " – " + ", ".join(rec.events)
+    if rec.nakshatra:
+        line += f"\n  Nakshatra: {rec.nakshatra}"
+    if rec.maasa:
+        line += f"\n  Maasa: {rec.maasa}"
+    return line
 
 def handle_lunar_dates(q: str, now: datetime) -> str | None:
     year_match = re.search(r"\b(20\d{2})\b", q)
@@ -90,49 +57,51 @@ def handle_lunar_dates(q: str, now: datetime) -> str | None:
 
     target_month = next((m for m in months if m in q), None)
 
-    # -------------------------------
-    # LOAD DATA
-    # -------------------------------
     if is_poornima:
-        raw_dates = load_lunar_dates(year, "Fullmoon")
+        lunar_type = FULLMOON
         title = "🌕 POORNIMA DATES"
     else:
-        raw_dates = load_lunar_dates(year, "Amavasya")
+        lunar_type = AMAVASYA
         title = "🌑 AMAVASYA DATES"
 
-    if not raw_dates:
-        return (
-            f"{title} ({year})\n"
-            "• Dates not listed.\n\n"
-           
-        )
+    index = get_lunar_index()
 
     # -------------------------------
-    # MONTH FILTER
+    # NEXT (ACROSS YEARS)
     # -------------------------------
-    if target_month:
-        raw_dates = [
-            d for d in raw_dates
-            if target_month.capitalize() in d
-        ]
+    if not (year_match or target_month) and re.search(r"\b(next|upcoming)\b", q):
+        upcoming = index.upcoming(now.date(), lunar_type)
+        if not upcoming:
+            return f"{title} (Upcoming)\n• Dates not listed.\n\n"
+        return "\n".join([f"{title} (Next)"] + [format_lunar_date(r) for r in upcoming])
 
-    if not raw_dates:
+    # -------------------------------
+    # YEAR / MONTH
+    # -------------------------------
+    if not index.for_year(year, lunar_type):
         return (
-            f"{title} ({target_month.capitalize()} {year})\n"
-            "• No dates listed.\n\n"
-            
+            f"{title} ({year})\n"
+            "• Dates not listed.\n\n"
         )
 
+    if target_month:
+        records = index.for_year(year, lunar_type, months.index(target_month) + 1)
+        if not records:
+            return (
+                f"{title} ({target_month.capitalize()} {year})\n"
+                "• No dates listed.\n\n"
+            )
+    else:
+        records = index.for_year(year, lunar_type)
+
     suffix = (
         f" ({target_month.capitalize()} {year})"
         if target_month else f" ({year})"
     )
 
     lines = [title + suffix]
-    for d in raw_dates:
-        lines.append(f"• {d}")
+    lines.extend(format_lunar_date(r) for r in records)
 
-    
     return "\n".join(lines)
 
 # ============================================================
@@ -297,17 +266,15 @@ def handle_calendar_events(q: str, now: datetime) -> str | None:
         "today", "this", "next", "last", "week", "month", "year"
     ]) and not any(m.lower() in q for m in calendar.month_name if m):
 
-        lines = ["🎉 TEMPLE FESTIVALS – 2026", ""]
+        year = now.year
+        lines = [f"🎉 TEMPLE FESTIVALS – {year}", ""]
         found = False
 
-        for month, days in CALENDAR_2026.items():
-            for day, info in days.items():
-                if "festival" in info:
-                    for name in info["festival"]:
-                        found = True
-                        lines.append(
-                            f"• {name} — {month.capitalize()} {day}, 2026"
-                        )
+        for d, _, name in CALENDAR_INDEX.find(
+            date(year, 1, 1), date(year, 12, 31), category="festival"
+        ):
+            found = True
+            lines.append(f"• {name} — {d:%B} {d.day}, {year}")
 
         if not found:
             return None
@@ -325,7 +292,15 @@ def handle_calendar_events(q: str, now: datetime) -> str | None:
     lines = [f"📅 EVENTS – {label}", ""]
     found = False
 
+    # Only days that carry an event or holiday can produce output
+    event_days = set(
+        CALENDAR_INDEX.days_with_events(min(dates).date(), max(dates).date())
+    ) if dates else set()
+
     for d in dates:
+        if d.date() not in event_days:
+            continue
+
         # Skip past dates ONLY for forward-looking queries
         if d.date() < now.date() and not any(w in q for w in ["last", "previous", "yesterday"]):
             continue
@@ -351,7 +326,7 @@ def handle_calendar_events(q: str, now: datetime) -> str | None:
         lines.append("")
 
     if not found:
-        if label.startswith("UPCOMING") or label.endswith("2026"):
+        if label.startswith("UPCOMING") or label[-4:].isdigit():
             lines.append("• No festivals or special events listed in this period.")
         else:
             lines.append("• No special events scheduled.")
@@ -421,43 +396,22 @@ def get_calendar_abhishekam_dates(
     end_date: date | None = None
 ) -> list[str]:
 
-    results: list[date] = []
-
-    CAL_YEAR = 2026  # 🔒 calendar truth source
     today = now.date()
 
     if start_date is None:
         start_date = today
     if end_date is None:
-        end_date = date(CAL_YEAR, 12, 31)
-
-    month_index = {
-        m.lower(): i + 1 for i, m in enumerate(CALENDAR_2026.keys())
-    }
-
-    for month, days in CALENDAR_2026.items():
-        month_num = month_index[month.lower()]
-
-        for day, info in days.items():
-            for event in info.get("abhishekam", []):
+        end_date = CALENDAR_INDEX.end  # 🔒 calendar truth source
 
-                if deity and deity.lower() not in event.lower():
-                    continue
-
-                try:
-                    event_day = date(CAL_YEAR, month_num, day)
-                except ValueError:
-                    continue
-
-                # ✅ HARD FILTER
-                if event_day < today:
-                    continue
-                if not (start_date <= event_day <= end_date):
-                    continue
-
-                results.append(event_day)
+    # ✅ HARD FILTER: never before today
+    start_date = max(start_date, today)
+    if start_date > end_date:
+        return []
 
-    results = sorted(set(results))  # ✅ dedupe + sort
+    results = CALENDAR_INDEX.next_occurrences(
+        start_date, limit, category="abhishekam", deity=deity
+    )
+    results = [d for d in results if d <= end_date]
 
     return [
         d.strftime("%B %d, %Y")
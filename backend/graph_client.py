@@ -0,0 +1,150 @@
+#backend/graph_client.py
+#
+"""
+Shared WhatsApp Graph API client.
+
+One urllib3 PoolManager (vendored at the package root) per process keeps
+TLS connections to graph.facebook.com alive between sends and across warm
+Lambda invocations, so replies and broadcasts skip the handshake. Sends
+return a result dict instead of printing errors:
+
+    {"ok": bool, "status": int, "message_id": str | None, "error": str | None}
+
+status 0 means no HTTP response at all (connect/read timeout, reset).
+"""
+
+import json
+import logging
+import os
+from typing import NamedTuple, Optional
+
+import urllib3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+GRAPH_API_BASE = os.getenv("GRAPH_API_BASE", "https://graph.facebook.com/v22.0")
+GRAPH_CONNECT_TIMEOUT = float(os.getenv("GRAPH_CONNECT_TIMEOUT", "3"))
+GRAPH_READ_TIMEOUT = float(os.getenv("GRAPH_READ_TIMEOUT", "10"))
+# enough for every broadcast worker to hold its own connection
+GRAPH_POOL_SIZE = int(os.getenv("GRAPH_POOL_SIZE", "20"))
+
+
+# ============================================================
+# PAYLOADS
+# ============================================================
+
+def text_message(to: str, body: str) -> dict:
+    return {
+        "messaging_product": "whatsapp",
+        "to": to,
+        "type": "text",
+        "text": {"body": body[:1400]},
+    }
+
+
+def image_message(to: str, link: str, caption: str = "") -> dict:
+    return {
+        "messaging_product": "whatsapp",
+        "to": to,
+        "type": "image",
+        "image": {
+            "link": link,
+            "caption": caption[:1024] if caption else "",
+        },
+    }
+
+
+# ============================================================
+# CLIENT
+# ============================================================
+
+class HttpResponse(NamedTuple):
+    status: int
+    headers: dict
+    body: bytes
+
+
+def _error_text(body: bytes) -> str:
+    """Graph's {"error": {"message": ...}} if present, else the raw body."""
+    try:
+        err = json.loads(body).get("error")
+        if isinstance(err, dict) and err.get("message"):
+            return str(err["message"])
+    except (ValueError, AttributeError):
+        pass
+    return body[:300].decode("utf-8", errors="replace")
+
+
+class GraphClient:
+
+    def __init__(
+        self,
+        phone_id: str,
+        token: str,
+        base_url: str = GRAPH_API_BASE,
+        connect_timeout: float = GRAPH_CONNECT_TIMEOUT,
+        read_timeout: float = GRAPH_READ_TIMEOUT,
+        pool_size: int = GRAPH_POOL_SIZE,
+    ):
+        self.url = f"{base_url.rstrip('/')}/{phone_id}/messages"
+        # a POST is never replayed here; only failed connects are retried
+        self._retries = urllib3.Retry(total=1, connect=1, read=0, redirect=0, status=0, other=0)
+        self._http = urllib3.PoolManager(
+            maxsize=pool_size,
+            block=False,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+        )
+
+    def post(self, payload: dict) -> HttpResponse:
+        """Raw response for one payload; never raises on network errors."""
+        try:
+            resp = self._http.request(
+                "POST", self.url,
+                body=json.dumps(payload).encode(),
+                retries=self._retries,
+                redirect=False,
+            )
+            return HttpResponse(resp.status, dict(resp.headers), resp.data)
+        except urllib3.exceptions.HTTPError as e:
+            return HttpResponse(0, {}, str(e).encode())
+
+    # BroadcastEngine takes any callable payload → HttpResponse
+    __call__ = post
+
+    def send(self, payload: dict) -> dict:
+        resp = self.post(payload)
+        if 200 <= resp.status < 300:
+            try:
+                message_id = json.loads(resp.body)["messages"][0]["id"]
+            except (ValueError, KeyError, IndexError, TypeError):
+                message_id = None
+            return {"ok": True, "status": resp.status, "message_id": message_id, "error": None}
+
+        error = _error_text(resp.body)
+        logger.warning("Graph send to %s failed: %s %s", payload.get("to"), resp.status, error)
+        return {"ok": False, "status": resp.status, "message_id": None, "error": error}
+
+    def send_text(self, to: str, body: str) -> dict:
+        return self.send(text_message(to, body))
+
+    def send_image(self, to: str, link: str, caption: str = "") -> dict:
+        return self.send(image_message(to, link, caption))
+
+
+_client: Optional[GraphClient] = None
+
+
+def get_graph_client() -> GraphClient:
+    """Process-wide client, so the pool outlives a single invocation."""
+    global _client
+    if _client is None:
+        _client = GraphClient(
+            os.getenv("WHATSAPP_PHONE_NUMBER_ID", ""),
+            os.getenv("WHATSAPP_ACCESS_TOKEN", ""),
+        )
+    return _client
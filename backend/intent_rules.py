@@ -0,0 +1,434 @@
+#backend/intent_rules.py
+#
+"""
+Declarative intent rules for ask_temple.classify_intent.
+
+Every keyword from every rule is compiled once into a single Aho-Corasick
+automaton. A query is scanned once to collect all keyword hits, then the
+rules are checked in priority order against that hit set. The first rule
+that fires decides the intent.
+
+Keyword matching is substring matching, the same as the `w in q` checks
+this table replaced.
+"""
+
+import calendar
+from collections import deque
+
+from backend.food_query import FOOD_KEYWORDS
+from backend.utility import normalize_query
+
+time_words = [
+
+    # -------- TODAY --------
+    "today",
+    "today's",
+    "todays",
+    "today schedule",
+    "today events",
+    "today at temple",
+
+    # -------- TOMORROW --------
+    "tomorrow",
+    "tomorrow's",
+    "tomorrows",
+    "tomorrow schedule",
+    "tomorrow events",
+    "tomo",
+    "tomo's events",
+    "tomo's activities",
+
+    # -------- YESTERDAY --------
+    "yesterday",
+    "yesterday's",
+    "yesterdays",
+
+    # -------- WEEK --------
+    "this week",
+    "next week",
+    "last week",
+    "coming week",
+    "upcoming week",
+    "following week",
+    "current week",
+    "weekend",
+    "weekends",
+    "next weekend",
+
+    "upcoming",
+    "coming",
+    "upcoming events",
+    "upcoming activities",
+
+    # -------- MONTH --------
+    "this month",
+    "next month",
+    "last month",
+    "upcoming month",
+    "current month",
+
+    # -------- YEAR --------
+    "this year",
+    "next year",
+    "last year",
+]
+
+calendar_words = [
+
+    # -------- EVENTS --------
+    "event",
+    "events",
+    "festival",
+    "festivals",
+
+    # -------- SCHEDULE --------
+    "schedule",
+    "timings",
+    "timing",
+    "time",
+    "program",
+    "programs",
+    "activity",
+    "activities",
+
+    # -------- HAPPENING --------
+    "happening",
+    "whats happening",
+    "what's happening",
+    "what is happening",
+    "what all is happening",
+
+    # -------- SPECIAL --------
+    "special",
+    "special events",
+    "today's special",
+    "todays special",
+
+    # -------- GENERIC USER PHRASES --------
+    "what's going on",
+    "whats going on",
+    "what is going on",
+    "anything today",
+    "anything special",
+    "anything happening",
+]
+
+MONTH_NAMES = [m.lower() for m in calendar.month_name if m]
+MONTH_ABBRS = [
+    "jan", "feb", "mar", "apr", "may", "jun",
+    "jul", "aug", "sep", "oct", "nov", "dec",
+]
+DIGITS = list("0123456789")
+
+PANCHANG_WORDS = ["panchang", "panchangam", "tithi", "nakshatra", "star"]
+SATYANARAYANA_WORDS = ["satyanarayana", "satya narayana"]
+
+
+# ============================================================
+# RULE TABLE (PRIORITY ORDER)
+# ============================================================
+# require: every group needs at least one keyword hit
+# exclude: any hit in any of these groups blocks the rule
+
+INTENT_RULES = [
+
+    # 🔱 VEDIC RECITATIONS (STRICT)
+    {
+        "name": "vedic_recitation",
+        "intent": "VEDIC_RECITATION",
+        "require": [[
+            "suktham", "sukthams",
+            "sahasranamam", "sahasranama", "sahasranamams",
+            "vishnu sahasranamam", "lalitha sahasranamam",
+            "nama sankeerthanam", "namasankeerthanam",
+            "naama sankeerthanam",
+            "recitation", "chanting", "parayanam",
+        ]],
+    },
+
+    # 🧺 ITEMS / SAMAGRI (HIGH PRIORITY)
+    {
+        "name": "items",
+        "intent": "HOMAM_ITEMS",
+        "require": [["item", "items", "samagri", "materials", "bring", "required", "need"]],
+    },
+
+    # 🚗 VAHANA POOJA
+    {
+        "name": "vahana",
+        "intent": "VAHANA_POOJA",
+        "require": [["vahana", "vehicle", "car pooja"]],
+    },
+
+    # 📞 CONTACTS
+    {
+        "name": "contacts",
+        "intent": "CONTACTS",
+        "require": [[
+            "chairman", "president", "manager", "temple manager",
+            "secretary", "treasurer",
+            "phone", "email", "contact",
+        ]],
+    },
+
+    # 👥 COMMITTEES
+    {
+        "name": "committee",
+        "intent": "COMMITTEE",
+        "require": [[
+            "committee", "committees", "board",
+            "trustee", "leadership", "executive committee",
+        ]],
+    },
+
+    # 🎶 CULTURAL
+    {
+        "name": "cultural",
+        "intent": "CULTURAL",
+        "require": [[
+            "dance", "music", "bhajan", "concert", "cultural", "singing",
+            "cultural programs", "cultural programme",
+        ]],
+    },
+
+    # 📖 STORY / SIGNIFICANCE (NO DATE WORDS)
+    {
+        "name": "story",
+        "intent": "STORY",
+        "require": [["story", "significance", "meaning", "importance", "legend", "about", "why"]],
+        "exclude": [
+            ["date", "dates", "when", "time", "timing"],
+            ["kalyanam", "abhishekam", "homam", "pooja", "seva"],
+        ],
+    },
+
+    # 🪐 PANCHANG (DATE-SENSITIVE)
+    {
+        "name": "panchang_tomorrow",
+        "intent": "PANCHANG_TOMORROW",
+        "require": [PANCHANG_WORDS, ["tomorrow"]],
+    },
+    {
+        "name": "panchang_date",
+        "intent": "PANCHANG_DATE",
+        "require": [PANCHANG_WORDS, DIGITS + MONTH_ABBRS],
+    },
+    {
+        "name": "panchang_today",
+        "intent": "PANCHANG_TODAY",
+        "require": [PANCHANG_WORDS],
+    },
+
+    # 🍽️ FOOD / ANNADANAM
+    {
+        "name": "food",
+        "intent": "FOOD",
+        "require": [["annadanam", "cafeteria", "food", "lunch", "prasadam", "annadanam today"]],
+    },
+
+    # SATYANARAYANA POOJA (HIGH PRIORITY)
+    {
+        "name": "satyanarayana",
+        "intent": "SATYANARAYANA_POOJA",
+        "require": [SATYANARAYANA_WORDS],
+    },
+
+    # 🕰️ TEMPLE HOURS
+    {
+        "name": "temple_hours",
+        "intent": "TEMPLE_HOURS",
+        "require": [["open", "close", "hours", "timing"]],
+        "exclude": [SATYANARAYANA_WORDS],
+    },
+
+    # 📍 LOCATION
+    {
+        "name": "location",
+        "intent": "LOCATION",
+        "require": [["address", "location", "where is", "directions"]],
+    },
+
+    # 🌕 LUNAR DATES (POORNIMA / AMAVASYA)
+    {
+        "name": "lunar_dates",
+        "intent": "LUNAR_DATES",
+        "require": [["poornima", "purnima", "amavasya", "new moon", "full moon"]],
+    },
+
+    # 🔥 HOMAMS
+    {
+        "name": "homams",
+        "intent": "HOMAMS",
+        "require": [["homam"]],
+    },
+
+    # 💍 KALYANAM
+    {
+        "name": "kalyanam",
+        "intent": "KALYANAM",
+        "require": [["kalyanam"]],
+    },
+
+    # 🪔 ABHISHEKAM
+    {
+        "name": "abhishekam_sponsorship",
+        "intent": "ABHISHEKAM_SPONSORSHIP",
+        "require": [["abhishekam"], ["sponsor", "sponsorship", "amount", "cost", "price"]],
+    },
+    {
+        "name": "weekly_abhishekam",
+        "intent": "WEEKLY_ABHISHEKAM",
+        "require": [["abhishekam"]],
+    },
+
+    # 📅 EVENTS (GENERIC — TIME RESOLVED LATER)
+    {
+        "name": "events",
+        "intent": "EVENTS",
+        "require": [time_words + MONTH_NAMES + calendar_words],
+        "exclude": [
+            sorted(FOOD_KEYWORDS),
+            ["daily pooja", "suprabhata", "nitya archana", "archana"],
+        ],
+    },
+
+    # 🌅 DAILY POOJA / SUPRABHATA
+    {
+        "name": "daily_pooja",
+        "intent": "DAILY_POOJA",
+        "require": [["suprabhata", "daily pooja"]],
+    },
+
+    # 🪔 ARJITHA SEVA
+    {
+        "name": "arjitha_seva",
+        "intent": "ARJITHA_SEVA",
+        "require": [["arjitha"]],
+    },
+]
+
+FALLBACK_RULE = {"name": "rag_fallback", "intent": "RAG_FALLBACK", "require": []}
+
+
+# ============================================================
+# AHO-CORASICK KEYWORD AUTOMATON
+# ============================================================
+
+class KeywordAutomaton:
+    """Finds every keyword occurring in a text (overlaps included) in one scan."""
+
+    def __init__(self, keywords):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[str]] = [set()]
+
+        for kw in keywords:
+            self._add(kw)
+        self._link()
+
+    def _add(self, kw: str):
+        node = 0
+        for ch in kw:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(kw)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[str]:
+        hits = set()
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                hits |= out[node]
+        return hits
+
+
+def _compile(rule: dict) -> dict:
+    return {
+        **rule,
+        "require": [frozenset(g) for g in rule.get("require", [])],
+        "exclude": [frozenset(g) for g in rule.get("exclude", [])],
+    }
+
+
+COMPILED_RULES = [_compile(r) for r in INTENT_RULES]
+
+AUTOMATON = KeywordAutomaton(
+    {kw for r in COMPILED_RULES for g in r["require"] + r["exclude"] for kw in g}
+)
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+
+def match_rule(q: str) -> tuple[dict, set[str]]:
+    """First rule firing on an already-normalized query, plus all keyword hits."""
+    hits = AUTOMATON.find(q)
+
+    for rule in COMPILED_RULES:
+        if any(hits & g for g in rule["exclude"]):
+            continue
+        if all(hits & g for g in rule["require"]):
+            return rule, hits
+
+    return FALLBACK_RULE, hits
+
+
+def classify(q: str) -> str:
+    """Intent name for a raw query."""
+    rule, _ = match_rule(normalize_query(q.lower()))
+    return rule["intent"]
+
+
+def explain(q: str) -> dict:
+    """
+    Debug view of a classification: which rule fired, the keywords that
+    fired it, and any higher-priority rule that was blocked by an exclusion.
+    """
+    normalized = normalize_query(q.lower())
+    rule, hits = match_rule(normalized)
+
+    matched = sorted(kw for g in rule["require"] for kw in hits & g)
+
+    # Higher-priority rules that had a hit but were blocked by an exclusion
+    blocked = []
+    for r in COMPILED_RULES:
+        if r is rule:
+            break
+        if all(hits & g for g in r["require"]) and r["exclude"]:
+            blocked.append({
+                "rule": r["name"],
+                "excluded_by": sorted(kw for g in r["exclude"] for kw in hits & g),
+            })
+
+    return {
+        "query": q,
+        "normalized": normalized,
+        "intent": rule["intent"],
+        "rule": rule["name"],
+        "matched": matched,
+        "blocked": blocked,
+        "hits": sorted(hits),
+    }
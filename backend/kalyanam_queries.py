@@ -2,7 +2,7 @@ from datetime import datetime, date
 from typing import Optional
 
 from backend.constants import WEEKLY_EVENTS
-from backend.calender_2026 import CALENDAR_2026
+from backend.calendar_index import CALENDAR_INDEX
 from backend.get_timing import extract_weekly_pattern
 from backend.sponsorship_catalog import SPONSORSHIP_CATALOG
 
@@ -95,39 +95,23 @@ def handle_kalyanam(q: str, now: datetime) -> Optional[str]:
             ])
 
     # --------------------------------------------------
-    # CALENDAR 2026 UPCOMING DATES
+    # CALENDAR UPCOMING DATES
     # --------------------------------------------------
     upcoming = []
 
-    month_index = {
-        m.lower(): i + 1 for i, m in enumerate(CALENDAR_2026.keys())
-    }
+    for d, _, event in CALENDAR_INDEX.find(now.date(), date.max, category="kalyanam"):
+        e = event.lower()
 
-    for month, days in CALENDAR_2026.items():
-        month_num = month_index[month.lower()]
+        if deity_key == "venkateswara" and "venkateswara" not in e:
+            continue
+        if deity_key == "goda" and not any(x in e for x in ["goda", "andal"]):
+            continue
+        if deity_key == "meenakshi" and "meenakshi" not in e:
+            continue
+        if deity_key == "tulasi" and "tulasi" not in e:
+            continue
 
-        for day, info in days.items():
-            for event in info.get("kalyanam", []):
-                e = event.lower()
-
-                if deity_key == "venkateswara" and "venkateswara" not in e:
-                    continue
-                if deity_key == "goda" and not any(x in e for x in ["goda", "andal"]):
-                    continue
-                if deity_key == "meenakshi" and "meenakshi" not in e:
-                    continue
-                if deity_key == "tulasi" and "tulasi" not in e:
-                    continue
-
-                try:
-                    d = date(2026, month_num, day)
-                except ValueError:
-                    continue
-
-                if d >= now.date():
-                    upcoming.append(d)
-
-    upcoming.sort()
+        upcoming.append(d)
 
     lines.append("📅 Upcoming Dates")
     if upcoming:
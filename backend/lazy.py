@@ -0,0 +1,85 @@
+#backend/lazy.py
+#
+"""
+Load-on-first-use helpers that keep the Lambda cold start light.
+
+A greeting or a subscribe command never reaches RAG, so it should not
+pay for importing faiss / numpy / every query handler, reading the FAISS
+index and meta.json, or creating boto3 clients. Two helpers:
+
+- lazy("backend.food_query", "handle_food") is a stand-in for a handler
+  function. The module is imported the first time the handler is called.
+  ask_temple's INTENT_HANDLERS registry is built from these.
+- @lazy_resource turns a zero-argument loader (index, metadata, boto3
+  client) into a thread-safe once-only getter.
+
+To see what a cold start imports:
+
+    python bench_imports.py
+"""
+
+import importlib
+import threading
+from typing import Any, Callable
+
+
+class LazyHandler:
+    """Callable that imports module.name on first use."""
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.__name__ = name
+        self._fn = None
+
+    def resolve(self) -> Callable:
+        if self._fn is None:
+            self._fn = getattr(importlib.import_module(self.module), self.__name__)
+        return self._fn
+
+    @property
+    def loaded(self) -> bool:
+        return self._fn is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"lazy({self.module!r}, {self.__name__!r})"
+
+
+def lazy(module: str, name: str) -> LazyHandler:
+    return LazyHandler(module, name)
+
+
+class LazyResource:
+    """Getter that runs loader once, on first call, and returns its result."""
+
+    def __init__(self, loader: Callable[[], Any]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded = False
+        self.__name__ = loader.__name__
+        self.__doc__ = loader.__doc__
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __call__(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._value = self._loader()
+                    self._loaded = True
+        return self._value
+
+    def reset(self):
+        """Drop the loaded value; the next call loads again."""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+
+
+def lazy_resource(loader: Callable[[], Any]) -> LazyResource:
+    return LazyResource(loader)
@@ -0,0 +1,182 @@
+#backend/lexical_index.py
+#
+"""
+BM25 inverted index over the RAG chunks, fused with FAISS by RRF.
+
+search_by_keywords required every keyword to appear and scanned the
+whole corpus per query. The lexical index instead scores chunks with
+BM25 from per-term postings, so a lookup only touches the postings of
+the query's terms, and a chunk matching most terms (a deity or festival
+name the embedding ranks low) still scores.
+
+build.py writes the index next to index.faiss:
+
+    backend/faiss_store/lexical.idx   (marshal)
+        terms      {term: (start, df)} into the postings arrays
+        doc_ids    array 'I', postings grouped by term
+        tfs        array 'H', term frequency per posting
+        doc_len    array 'I', tokens per chunk
+        chunks_sha256  of the chunk blob it was built from
+
+A missing or stale file (its chunks_sha256 differs from the chunk
+store's) is rebuilt in memory on first use.
+
+rrf_fuse() merges ranked id lists by reciprocal-rank fusion:
+score(d) = sum over lists of 1 / (RRF_K + rank).
+"""
+
+import logging
+import marshal
+import math
+import os
+import re
+from array import array
+from pathlib import Path
+from typing import Container, Iterable, NamedTuple, Optional
+
+from backend.artifact_bundle import atomic_write
+from backend.chunk_store import load_or_build_index
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LEXICAL_INDEX_PATH = Path(os.getenv(
+    "LEXICAL_INDEX_PATH",
+    str(BASE_DIR / "backend" / "faiss_store" / "lexical.idx"),
+))
+
+INDEX_FORMAT = 1
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# only words that carry no meaning for temple questions
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have i in is it its me my of on or
+our the this to was we what when where which who will with you your
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class LexicalHit(NamedTuple):
+    id: int
+    score: float
+
+
+class LexicalIndex:
+
+    def __init__(self, terms: dict[str, tuple[int, int]], doc_ids: array, tfs: array,
+                 doc_len: array, chunks_sha256: Optional[str] = None):
+        self.terms = terms
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.chunks_sha256 = chunks_sha256
+        self.count = len(doc_len)
+        self.avgdl = (sum(doc_len) / self.count) if self.count else 0.0
+
+    # -------------------- BUILD --------------------
+
+    @classmethod
+    def build(cls, texts: Iterable[str], chunks_sha256: Optional[str] = None) -> "LexicalIndex":
+        postings: dict[str, list[tuple[int, int]]] = {}
+        doc_len = array("I")
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_len.append(len(tokens))
+            counts: dict[str, int] = {}
+            for tok in tokens:
+                counts[tok] = counts.get(tok, 0) + 1
+            for tok, tf in counts.items():
+                postings.setdefault(tok, []).append((doc_id, min(tf, 0xFFFF)))
+
+        terms: dict[str, tuple[int, int]] = {}
+        doc_ids, tfs = array("I"), array("H")
+        for term in sorted(postings):
+            plist = postings[term]
+            terms[term] = (len(doc_ids), len(plist))
+            for doc_id, tf in plist:
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+        return cls(terms, doc_ids, tfs, doc_len, chunks_sha256)
+
+    def save(self, path: Path = LEXICAL_INDEX_PATH):
+        atomic_write(path, marshal.dumps({
+            "format": INDEX_FORMAT,
+            "terms": self.terms,
+            "doc_ids": self.doc_ids.tobytes(),
+            "tfs": self.tfs.tobytes(),
+            "doc_len": self.doc_len.tobytes(),
+            "chunks_sha256": self.chunks_sha256,
+        }))
+
+    @classmethod
+    def load(cls, path: Path = LEXICAL_INDEX_PATH) -> Optional["LexicalIndex"]:
+        try:
+            data = marshal.loads(Path(path).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if data.get("format") != INDEX_FORMAT:
+            return None
+        doc_ids, tfs, doc_len = array("I"), array("H"), array("I")
+        doc_ids.frombytes(data["doc_ids"])
+        tfs.frombytes(data["tfs"])
+        doc_len.frombytes(data["doc_len"])
+        return cls(data["terms"], doc_ids, tfs, doc_len, data.get("chunks_sha256"))
+
+    # -------------------- SEARCH --------------------
+
+    def idf(self, term: str) -> float:
+        entry = self.terms.get(term)
+        if entry is None:
+            return 0.0
+        df = entry[1]
+        return math.log(1.0 + (self.count - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10, allowed: Optional[Container[int]] = None) -> list[LexicalHit]:
+        """
+        Top k chunks by BM25 for query; ties go to the lower chunk id.
+        allowed restricts the candidates (a facet partition).
+        """
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            entry = self.terms.get(term)
+            if entry is None:
+                continue
+            start, df = entry
+            idf = self.idf(term)
+            for p in range(start, start + df):
+                doc = self.doc_ids[p]
+                if allowed is not None and doc not in allowed:
+                    continue
+                tf = self.tfs[p]
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.doc_len[doc] / self.avgdl)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [LexicalHit(doc, score) for doc, score in best]
+
+
+def rrf_fuse(rankings: Iterable[Iterable[int]], k: int, rrf_k: int = RRF_K) -> list[int]:
+    """Reciprocal-rank fusion of ranked id lists; ties keep first-seen order."""
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            scores[doc] = scores.get(doc, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores, key=lambda doc: -scores[doc])[:k]
+
+
+def load_or_build(store, path: Path = LEXICAL_INDEX_PATH) -> LexicalIndex:
+    """The saved index if it matches store's chunks, else one built from the store."""
+    return load_or_build_index(
+        store, path, LexicalIndex.load,
+        lambda sha: LexicalIndex.build((store.text(i) for i in range(len(store))), sha),
+        "Lexical index",
+    )
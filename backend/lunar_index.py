@@ -0,0 +1,235 @@
+#backend/lunar_index.py
+#
+"""
+Poornima / Amavasya dates parsed once from data_raw/Events/<year>/Fullmoon
+and data_raw/Events/<year>/Amavasya into typed, date-sorted records.
+
+Month listings are a filter over one year's records and "next full moon"
+is a bisect over every year. Source files are re-parsed only when their
+mtimes change, and that check runs at most every LUNAR_RECHECK_SECS.
+"""
+
+import calendar
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+EVENTS_DIR = BASE_DIR / "data_raw" / "Events"
+LUNAR_RECHECK_SECS = float(os.getenv("LUNAR_RECHECK_SECS", "60"))
+
+FULLMOON = "Fullmoon"
+AMAVASYA = "Amavasya"
+LUNAR_TYPES = (FULLMOON, AMAVASYA)
+
+MONTH_LOOKUP = {
+    **{m.lower(): i for i, m in enumerate(calendar.month_name) if m},
+    **{m.lower(): i for i, m in enumerate(calendar.month_abbr) if m},
+}
+
+_MONTH = r"([A-Za-z]+)"
+_DAY = r"(\d{1,2})(?:st|nd|rd|th)?"
+
+# "November 2025 Full Moon Day/Purnima/Poornima = 5th of November 2025,Karthika Purnima"
+ONE_LINE_RE = re.compile(rf"=\s*{_DAY}\s+of\s+{_MONTH}\s+(\d{{4}})\s*,?\s*(.*)$")
+
+# "January 2026:" followed by "- Purnima: January 2nd (Thursday) at 6:25 AM"
+# and optional "- Event(s):", "- Nakshatra:" and "- Maasa:" lines. Only
+# the clock time is kept: what follows it ("(Tuesday)", ", Prathama
+# afterwards") would contradict the weekday computed from the date.
+BLOCK_HEADER_RE = re.compile(rf"^{_MONTH}\s+(\d{{4}})\s*:\s*$")
+BLOCK_DATE_RE = re.compile(
+    rf"^-\s*(?:purnima|amavasya)\s*:\s*{_MONTH}\s+{_DAY}\b(?:\s*\([^)]*\))?"
+    r"(?:\s+at\s+(\d{1,2}:\d{2}\s*[AP]M))?",
+    re.IGNORECASE,
+)
+BLOCK_EVENT_RE = re.compile(r"^-\s*events?\s*:\s*(.+)$", re.IGNORECASE)
+BLOCK_DETAIL_RE = re.compile(r"^-\s*(nakshatra|maasa)\s*:\s*(.+)$", re.IGNORECASE)
+
+
+class LunarDate(NamedTuple):
+    date: date
+    lunar_type: str
+    time: Optional[str]
+    events: tuple[str, ...]
+    nakshatra: Optional[str] = None
+    maasa: Optional[str] = None
+
+
+# ============================================================
+# PARSING
+# ============================================================
+
+def _split_events(text: str, sep: str) -> tuple[str, ...]:
+    return tuple(e.strip() for e in text.split(sep) if e.strip())
+
+
+def parse_lunar_text(text: str, year: int, lunar_type: str) -> list[LunarDate]:
+    """Records from one lunar file (one-line or block layout)."""
+    records: list[LunarDate] = []
+    block_year = year
+    pending: Optional[dict] = None   # fields of the open block's record
+
+    def flush():
+        if pending:
+            records.append(LunarDate(lunar_type=lunar_type, **{**pending, "events": tuple(pending["events"])}))
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+
+        m = ONE_LINE_RE.search(line)
+        if m:
+            month = MONTH_LOOKUP.get(m.group(2).lower())
+            if month:
+                try:
+                    d = date(int(m.group(3)), month, int(m.group(1)))
+                except ValueError:
+                    continue
+                records.append(LunarDate(d, lunar_type, None, _split_events(m.group(4), ",")))
+            continue
+
+        m = BLOCK_HEADER_RE.match(line)
+        if m and m.group(1).lower() in MONTH_LOOKUP:
+            block_year = int(m.group(2))
+            continue
+
+        m = BLOCK_DATE_RE.match(line)
+        if m:
+            flush()
+            pending = None
+            month = MONTH_LOOKUP.get(m.group(1).lower())
+            if month:
+                try:
+                    pending = {"date": date(block_year, month, int(m.group(2))),
+                               "time": m.group(3), "events": []}
+                except ValueError:
+                    pending = None
+            continue
+
+        m = BLOCK_EVENT_RE.match(line)
+        if m and pending:
+            pending["events"].extend(_split_events(m.group(1), "/"))
+            continue
+
+        m = BLOCK_DETAIL_RE.match(line)
+        if m and pending:
+            pending[m.group(1).lower()] = m.group(2).strip()
+
+    flush()
+    return records
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+class LunarIndex:
+
+    def __init__(self, events_dir: Path = EVENTS_DIR, recheck_secs: float = LUNAR_RECHECK_SECS):
+        self.events_dir = events_dir
+        self.recheck_secs = recheck_secs
+        self._lock = threading.Lock()
+        self._stamp: Optional[tuple] = None
+        self._checked_at = 0.0
+        # lunar_type → date-sorted records over every year, plus parallel dates
+        self._records: dict[str, list[LunarDate]] = {}
+        self._dates: dict[str, list[date]] = {}
+
+    def _source_files(self) -> list[Path]:
+        files = []
+        if not self.events_dir.is_dir():
+            return files
+        for year_dir in sorted(self.events_dir.iterdir()):
+            if not year_dir.name.isdigit():
+                continue
+            for lunar_type in LUNAR_TYPES:
+                folder = year_dir / lunar_type
+                if folder.is_dir():
+                    files.extend(sorted(folder.glob("*.txt")))
+        return files
+
+    def _current_stamp(self, files: list[Path]) -> tuple:
+        stamp = []
+        for path in files:
+            try:
+                st = path.stat()
+                stamp.append((str(path), st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append((str(path), 0, 0))
+        return tuple(stamp)
+
+    def _rebuild(self, files: list[Path]):
+        by_type: dict[str, dict[date, LunarDate]] = {t: {} for t in LUNAR_TYPES}
+
+        for path in files:
+            lunar_type = path.parent.name
+            year = int(path.parent.parent.name)
+            try:
+                text = path.read_text(encoding="utf-8")
+            except OSError:
+                logger.error("Error reading lunar file %s", path, exc_info=True)
+                continue
+            for rec in parse_lunar_text(text, year, lunar_type):
+                by_type[lunar_type].setdefault(rec.date, rec)
+
+        self._records = {t: sorted(recs.values()) for t, recs in by_type.items()}
+        self._dates = {t: [r.date for r in recs] for t, recs in self._records.items()}
+        logger.info("Lunar index built: %s",
+                    {t: len(r) for t, r in self._records.items()})
+
+    def refresh(self, force: bool = False):
+        """Re-parse if any source file was added, removed or modified."""
+        now = time.monotonic()
+        if not force and self._stamp is not None and now - self._checked_at < self.recheck_secs:
+            return
+
+        with self._lock:
+            files = self._source_files()
+            stamp = self._current_stamp(files)
+            if force or stamp != self._stamp:
+                self._rebuild(files)
+                self._stamp = stamp
+            self._checked_at = now
+
+    # -------------------- QUERIES --------------------
+
+    def for_year(self, year: int, lunar_type: str, month: Optional[int] = None) -> list[LunarDate]:
+        self.refresh()
+        dates = self._dates.get(lunar_type, [])
+        records = self._records.get(lunar_type, [])
+
+        if month:
+            lo = bisect_left(dates, date(year, month, 1))
+            last = date(year, month, calendar.monthrange(year, month)[1])
+            hi = bisect_left(dates, last + timedelta(days=1))
+        else:
+            lo = bisect_left(dates, date(year, 1, 1))
+            hi = bisect_left(dates, date(year + 1, 1, 1))
+        return records[lo:hi]
+
+    def upcoming(self, start: date, lunar_type: str, n: int = 1) -> list[LunarDate]:
+        """Next n records on or after start, across years."""
+        self.refresh()
+        lo = bisect_left(self._dates.get(lunar_type, []), start)
+        return self._records.get(lunar_type, [])[lo:lo + n]
+
+
+_index: Optional[LunarIndex] = None
+
+
+def get_lunar_index() -> LunarIndex:
+    global _index
+    if _index is None:
+        _index = LunarIndex()
+    return _index
@@ -0,0 +1,148 @@
+#backend/message_queue.py
+#
+"""
+Queue between the webhook (producer) and the answer worker (consumer).
+
+In async webhook mode the handler only validates and enqueues incoming
+WhatsApp messages and returns 200 to Meta at once. A worker drains the
+queue in batches and does the slow part (answer_user, Bedrock, send).
+
+A queue has one small interface:
+
+    send_batch(messages)            → number enqueued (duplicates dropped)
+    receive(max_messages, wait)     → [QueuedMessage]
+    delete_batch(receipts)
+
+SQSQueue wraps a boto3 SQS client. On a FIFO queue the WhatsApp message
+id is the deduplication id and the sender is the group, so one user's
+messages are answered in order. get_message_queue() only ever returns
+SQS: a process-local queue could not be drained by a worker in another
+Lambda container. The tests use test_support/memory_queue.py.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+MESSAGE_QUEUE_URL = os.getenv("MESSAGE_QUEUE_URL", "")
+# SQS limits
+SQS_BATCH_MAX = 10
+SQS_DEDUPE_WINDOW_SECS = 300
+VISIBILITY_TIMEOUT_SECS = int(os.getenv("MESSAGE_VISIBILITY_TIMEOUT_SECS", "120"))
+
+
+class QueuedMessage(NamedTuple):
+    receipt: str
+    body: dict
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class SQSQueue:
+
+    def __init__(self, client, queue_url: str):
+        self.client = client
+        self.queue_url = queue_url
+        self.fifo = queue_url.endswith(".fifo")
+
+    def send_batch(self, messages: list[dict]) -> int:
+        sent = 0
+        for chunk in _chunks(messages, SQS_BATCH_MAX):
+            entries = []
+            for i, msg in enumerate(chunk):
+                entry = {"Id": str(i), "MessageBody": json.dumps(msg)}
+                if self.fifo:
+                    entry["MessageDeduplicationId"] = msg["id"]
+                    entry["MessageGroupId"] = msg["from"]
+                entries.append(entry)
+            resp = self.client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+            failed = resp.get("Failed", [])
+            if failed:
+                raise RuntimeError(f"SQS rejected {len(failed)} messages: {failed[0].get('Message')}")
+            sent += len(resp.get("Successful", []))
+        return sent
+
+    def receive(self, max_messages: int = SQS_BATCH_MAX, wait_secs: int = 0) -> list[QueuedMessage]:
+        resp = self.client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=min(max_messages, SQS_BATCH_MAX),
+            WaitTimeSeconds=wait_secs,
+        )
+        return [
+            QueuedMessage(m["ReceiptHandle"], json.loads(m["Body"]))
+            for m in resp.get("Messages", [])
+        ]
+
+    def delete_batch(self, receipts: list[str]):
+        for chunk in _chunks(receipts, SQS_BATCH_MAX):
+            self.client.delete_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[{"Id": str(i), "ReceiptHandle": r} for i, r in enumerate(chunk)],
+            )
+
+
+# ============================================================
+# WORKER
+# ============================================================
+
+class DrainResult(NamedTuple):
+    processed: int
+    failed: int
+    batches: int
+
+
+def drain(
+    queue,
+    handle: Callable[[dict], None],
+    batch_size: int = SQS_BATCH_MAX,
+    deadline: Optional[float] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> DrainResult:
+    """
+    Receive and handle batches until the queue is empty or the deadline
+    passes. Handled messages are deleted per batch; a message whose
+    handler raised stays queued and is retried after its visibility
+    timeout.
+    """
+    processed = failed = batches = 0
+    while deadline is None or clock() < deadline:
+        batch = queue.receive(batch_size)
+        if not batch:
+            break
+        batches += 1
+
+        done = []
+        for msg in batch:
+            try:
+                handle(msg.body)
+                done.append(msg.receipt)
+            except Exception:
+                logger.error("Queued message %s failed", msg.body.get("id"), exc_info=True)
+                failed += 1
+        if done:
+            queue.delete_batch(done)
+        processed += len(done)
+
+    return DrainResult(processed, failed, batches)
+
+
+_queue = None
+
+
+def get_message_queue():
+    """The SQS queue at MESSAGE_QUEUE_URL; raises RuntimeError when it is unset."""
+    global _queue
+    if _queue is None:
+        if not MESSAGE_QUEUE_URL:
+            raise RuntimeError("MESSAGE_QUEUE_URL is not set; async webhook mode needs an SQS queue")
+        import boto3
+        _queue = SQSQueue(boto3.client("sqs", region_name="us-east-1"), MESSAGE_QUEUE_URL)
+    return _queue
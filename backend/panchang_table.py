@@ -0,0 +1,305 @@
+#backend/panchang_table.py
+#
+"""
+Preparsed panchang: date → {tithi, nakshatra, events, maasa, paksham, lines}.
+
+Every data_raw/Panchang/<year>/<month>_<year>_panchang.txt file and every
+Maasa_Paksham.txt is parsed once into a single table, either by the build
+step (backend/calendar_store/panchang.json, written next to the calendar
+artifact) or lazily from the text files on first use. Today / tomorrow /
+explicit-date questions are then a dict lookup and "this week" is a range
+over consecutive days.
+"""
+
+import calendar
+import json
+import logging
+import os
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PANCHANG_DIR = BASE_DIR / "data_raw" / "Panchang"
+PANCHANG_ARTIFACT_PATH = Path(os.getenv(
+    "PANCHANG_ARTIFACT_PATH",
+    str(BASE_DIR / "backend" / "calendar_store" / "panchang.json"),
+))
+MAASA_FILENAME = "Maasa_Paksham.txt"
+
+SCHEMA_VERSION = 1
+
+MONTHS = [m.lower() for m in calendar.month_name if m]
+MONTH_ABBRS = {m[:3]: i + 1 for i, m in enumerate(MONTHS)}
+
+# "Jan 1 (Thu): Tithi: ... | Nakshatra: ..." / "Jan 1 - T: ..., N: ..."
+DAY_LINE_RE = re.compile(r"^([A-Za-z]{3})[a-z]*\s+0*(\d{1,2})(?:st|nd|rd|th)?\b")
+TITHI_RE = re.compile(r"\b(?:Tithi|T):\s*(.+?)\s*(?=\||,\s*N:|$)")
+NAKSHATRA_RE = re.compile(r"\b(?:Nakshatra|N):\s*(.+?)\s*(?=\||$)")
+
+# MONTH 1: PUSHYA MAASA (January 1-18)
+MAASA_HEADER_RE = re.compile(r"MONTH\s+\d+:\s+([A-Z\s]+)\s+MAASA")
+
+Entry = dict
+
+
+# ============================================================
+# PARSING
+# ============================================================
+
+def parse_panchang_text(text: str, year: int, month: int) -> dict[date, Entry]:
+    """
+    Daily records of one month file. A record is its day line plus the
+    tithi / nakshatra / event lines under it, up to the next dated line.
+    Only the first record for a day counts (festival notes further down
+    the file mention dates again).
+    """
+    month_full = MONTHS[month - 1]
+    month_abbr = month_full[:3]
+    next_date_re = re.compile(rf"\b({month_abbr}|{month_full})\s+\d{{1,2}}", re.IGNORECASE)
+
+    table: dict[date, Entry] = {}
+    current: Optional[Entry] = None
+
+    for row in text.splitlines():
+        clean = row.strip()
+
+        m = DAY_LINE_RE.match(clean)
+        if m and m.group(1).lower() == month_abbr:
+            try:
+                d = date(year, month, int(m.group(2)))
+            except ValueError:
+                current = None
+                continue
+            if d in table:
+                # a day line repeated right away is a second reading for
+                # the same day; a later mention is a note, not a record
+                if current is not table[d]:
+                    current = None
+                    continue
+                current["lines"].append(clean)
+                _absorb(current, clean)
+                continue
+            current = _new_entry(clean)
+            table[d] = current
+            continue
+
+        if current is None:
+            continue
+
+        if next_date_re.search(clean):
+            current = None
+            continue
+
+        lower = clean.lower()
+        if "tithi" in lower or "nakshatra" in lower or "event:" in lower:
+            current["lines"].append(clean)
+            _absorb(current, clean)
+
+    return table
+
+
+def _new_entry(day_line: str) -> Entry:
+    entry = {
+        "tithi": None,
+        "nakshatra": None,
+        "events": [],
+        "maasa": None,
+        "paksham": None,
+        "lines": [day_line],
+    }
+    _absorb(entry, day_line)
+    return entry
+
+
+def _absorb(entry: Entry, line: str):
+    if line.lower().startswith("event:"):
+        for ev in line.split(":", 1)[1].split("|"):
+            ev = ev.strip()
+            if ev and ev.lower() != "none":
+                entry["events"].append(ev)
+        return
+
+    t = TITHI_RE.search(line)
+    if t and entry["tithi"] is None:
+        entry["tithi"] = t.group(1)
+    n = NAKSHATRA_RE.search(line)
+    if n and entry["nakshatra"] is None:
+        entry["nakshatra"] = n.group(1)
+
+
+def parse_maasa_text(text: str, year: int) -> dict[date, tuple[str, str]]:
+    """
+    {date: (maasa, paksham)} from a Maasa_Paksham.txt guide.
+
+    Rows look like "Jan 1-18 | Sukla Paksham | ..." or
+    "Jan 19-Feb 1 | Sukla Paksham | ..." under a "MONTH n: X MAASA" header.
+    The first row covering a day wins.
+    """
+    result: dict[date, tuple[str, str]] = {}
+    current_maasa: Optional[str] = None
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+
+        m = MAASA_HEADER_RE.match(line)
+        if m:
+            current_maasa = f"{m.group(1).title()} Maasa"
+            continue
+
+        if not current_maasa or "|" not in line:
+            continue
+
+        parts = [p.strip() for p in line.split("|")]
+        date_range, paksham = parts[0], parts[1]
+        if "-" not in date_range or "Paksham" not in paksham:
+            continue
+
+        try:
+            start, end = date_range.split("-")
+            sm, sd = start.split()
+            end_parts = end.split()
+            if len(end_parts) == 1:
+                em, ed = sm, end_parts[0]
+            else:
+                em, ed = end_parts
+            first = date(year, MONTH_ABBRS[sm.lower()], int(sd))
+            last = date(year, MONTH_ABBRS[em.lower()], int(ed))
+        except (ValueError, KeyError) as e:
+            logger.warning("Skipping malformed maasa line: %s | error=%s", line, e)
+            continue
+
+        if last < first:
+            # Dec 20-Jan 7: the end falls in the next year
+            last = last.replace(year=year + 1)
+
+        d = first
+        while d <= last:
+            result.setdefault(d, (current_maasa, paksham))
+            d += timedelta(days=1)
+
+    return result
+
+
+def parse_panchang_dir(panchang_dir: Path = PANCHANG_DIR) -> dict[date, Entry]:
+    """Every year under data_raw/Panchang merged into one table."""
+    table: dict[date, Entry] = {}
+    maasa: dict[date, tuple[str, str]] = {}
+
+    if not panchang_dir.is_dir():
+        logger.error("Panchang directory not found: %s", panchang_dir)
+        return table
+
+    for year_dir in sorted(panchang_dir.iterdir()):
+        if not (year_dir.is_dir() and year_dir.name.isdigit()):
+            continue
+        year = int(year_dir.name)
+
+        for month, month_full in enumerate(MONTHS, start=1):
+            path = year_dir / f"{month_full}_{year}_panchang.txt"
+            if path.exists():
+                table.update(parse_panchang_text(path.read_text(encoding="utf-8"), year, month))
+
+        maasa_path = year_dir / MAASA_FILENAME
+        if maasa_path.exists():
+            for d, value in parse_maasa_text(maasa_path.read_text(encoding="utf-8"), year).items():
+                maasa.setdefault(d, value)
+
+    for d, (maasa_name, paksham) in maasa.items():
+        entry = table.get(d)
+        if entry is not None:
+            entry["maasa"], entry["paksham"] = maasa_name, paksham
+
+    # days with a maasa but no daily record still answer maasa questions
+    for d, (maasa_name, paksham) in maasa.items():
+        if d not in table:
+            table[d] = {
+                "tithi": None, "nakshatra": None, "events": [],
+                "maasa": maasa_name, "paksham": paksham, "lines": [],
+            }
+
+    return dict(sorted(table.items()))
+
+
+# ============================================================
+# TABLE
+# ============================================================
+
+class PanchangTable:
+
+    def __init__(self, entries: dict[date, Entry]):
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, d: date) -> Optional[Entry]:
+        return self._entries.get(d)
+
+    def range(self, start: date, end: date) -> list[tuple[date, Entry]]:
+        """(date, entry) for every day in [start, end] that has a record."""
+        out = []
+        d = start
+        while d <= end:
+            entry = self._entries.get(d)
+            if entry is not None:
+                out.append((d, entry))
+            d += timedelta(days=1)
+        return out
+
+    def maasa_paksham(self, d: date) -> Optional[tuple[str, str]]:
+        entry = self._entries.get(d)
+        if entry and entry["maasa"]:
+            return entry["maasa"], entry["paksham"]
+        return None
+
+
+def to_json(table: dict[date, Entry]) -> dict:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "days": {d.isoformat(): entry for d, entry in table.items()},
+    }
+
+
+def write_panchang_artifact(path: Path = PANCHANG_ARTIFACT_PATH) -> int:
+    table = parse_panchang_dir()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(to_json(table), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+    return len(table)
+
+
+def load_panchang_table(path: Path = PANCHANG_ARTIFACT_PATH) -> PanchangTable:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("schema_version") == SCHEMA_VERSION:
+            return PanchangTable({
+                date.fromisoformat(k): v for k, v in data["days"].items()
+            })
+        logger.warning("Panchang artifact schema %s != %s, parsing text files",
+                       data.get("schema_version"), SCHEMA_VERSION)
+    except FileNotFoundError:
+        logger.warning("Panchang artifact not found: %s, parsing text files", path)
+
+    return PanchangTable(parse_panchang_dir())
+
+
+_table: Optional[PanchangTable] = None
+
+
+def get_panchang_table() -> PanchangTable:
+    """Module-wide table, loaded on first use."""
+    global _table
+    if _table is None:
+        _table = load_panchang_table()
+        logger.info("Panchang table loaded: %d days", len(_table))
+    return _table
@@ -0,0 +1,108 @@
+#backend/posted_events.py
+#
+"""
+"Already broadcast?" markers for scraped events, in the temple-events table.
+
+A daily run used to make one get_item per scraped event and one put_item
+per posted event. PostedEvents resolves all the hashes of a run with
+BatchGetItem (100 keys per call) and writes the markers with
+BatchWriteItem (25 per call). Hashes known to be posted are kept in a
+process-wide set, so a warm container skips DynamoDB for them on the
+next run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+EVENTS_TABLE = os.getenv("EVENTS_TABLE", "temple-events")
+POSTED_TTL_SECS = 90 * 24 * 60 * 60
+
+BATCH_GET_MAX = 100
+BATCH_WRITE_MAX = 25
+MAX_UNPROCESSED_RETRIES = 5
+
+# survives warm invocations; markers are never deleted before their TTL
+_POSTED_CACHE: set[str] = set()
+
+
+def event_hash(event: dict) -> str:
+    dedupe_key = f"{event['filename']}|{event['image_url']}|{event['name']}"
+    return hashlib.md5(dedupe_key.encode()).hexdigest()
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class PostedEvents:
+
+    def __init__(self, dynamodb, table_name: str = EVENTS_TABLE, sleep=time.sleep):
+        """dynamodb: the boto3 DynamoDB service resource."""
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self._sleep = sleep
+
+    def already_posted(self, hashes: Iterable[str]) -> set[str]:
+        """The subset of hashes that already have a posted marker."""
+        hashes = list(dict.fromkeys(hashes))
+        posted = {h for h in hashes if h in _POSTED_CACHE}
+        missing = [h for h in hashes if h not in posted]
+
+        for chunk in _chunks(missing, BATCH_GET_MAX):
+            request = {self.table_name: {
+                "Keys": [{"event_hash": h} for h in chunk],
+                "ProjectionExpression": "event_hash",
+            }}
+            for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+                resp = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(self.table_name, []):
+                    posted.add(item["event_hash"])
+                request = resp.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                self._sleep(0.05 * 2 ** attempt)
+            else:
+                # unresolved keys count as not posted; the run re-checks
+                # them through the broadcast checkpoint anyway
+                logger.warning("BatchGetItem left %d keys unprocessed",
+                               len(request[self.table_name]["Keys"]))
+
+        _POSTED_CACHE.update(posted)
+        return posted
+
+    def mark_posted(self, events: dict[str, dict]):
+        """Write posted markers for {hash: event}."""
+        now = datetime.now()
+        items = [
+            {"PutRequest": {"Item": {
+                "event_hash": h,
+                "event_data": json.dumps(event),
+                "timestamp": now.isoformat(),
+                "ttl": int(now.timestamp()) + POSTED_TTL_SECS,
+            }}}
+            for h, event in events.items()
+        ]
+
+        for chunk in _chunks(items, BATCH_WRITE_MAX):
+            request = {self.table_name: chunk}
+            for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+                resp = self.dynamodb.batch_write_item(RequestItems=request)
+                request = resp.get("UnprocessedItems") or {}
+                if not request:
+                    break
+                self._sleep(0.05 * 2 ** attempt)
+            else:
+                raise RuntimeError(
+                    f"BatchWriteItem left {len(request[self.table_name])} posted markers unwritten"
+                )
+
+        _POSTED_CACHE.update(events)
@@ -0,0 +1,56 @@
+#backend/rate_limit.py
+#
+"""
+Client-side rate limiting shared by the WhatsApp broadcast
+(backend/broadcast.py) and the embedding pipeline
+(backend/embedding_pipeline.py). Kept free of other backend imports so
+the offline build does not pull in the Graph API client.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a send is allowed."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if now < self._paused_until:
+                    wait_for = self._paused_until - now
+                elif self._tokens >= 1 - 1e-9:   # float refill lands a hair short
+                    self._tokens -= 1
+                    return
+                else:
+                    wait_for = (1 - self._tokens) / self.rate
+            self._sleep(wait_for)
+
+    def pause(self, seconds: float):
+        """Hold every sender back, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = now
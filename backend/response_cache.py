@@ -0,0 +1,226 @@
+#backend/response_cache.py
+#
+"""
+Full-answer cache for answer_user.
+
+Key = (normalized query, intent, time bucket, data version)
+
+- time bucket: "static" answers never roll over, "day" answers roll over
+  at local midnight, "hour" answers (open/closed status) every hour
+- data version: calendar artifact version and mtime, fingerprint of
+  SPONSORSHIP_CATALOG and config/temple_status.json; any change drops
+  every cached answer
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from backend.calendar_ingest import CALENDAR_ARTIFACT_PATH
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+TEMPLE_STATUS_PATH = BASE_DIR / "config" / "temple_status.json"
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") != "0"
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# ============================================================
+# PER-INTENT POLICY  (intent name → (bucket, ttl seconds))
+# ============================================================
+
+INTENT_CACHE_POLICY = {
+    # Open/closed status and suprabhata status change during the day
+    "TEMPLE_HOURS": ("hour", HOUR),
+    "DAILY_POOJA": ("hour", HOUR),
+    "EVENTS": ("hour", HOUR),
+
+    # Date-relative answers ("next", "today", "this month")
+    "PANCHANG_TODAY": ("day", DAY),
+    "PANCHANG_TOMORROW": ("day", DAY),
+    "PANCHANG_DATE": ("day", DAY),
+    "LUNAR_DATES": ("day", DAY),
+    "WEEKLY_ABHISHEKAM": ("day", DAY),
+    "ABHISHEKAM_SPONSORSHIP": ("day", DAY),
+    "KALYANAM": ("day", DAY),
+    "SATYANARAYANA_POOJA": ("day", DAY),
+    "FOOD": ("day", DAY),
+    "RAG_FALLBACK": ("day", 6 * HOUR),
+
+    # Reference data
+    "CONTACTS": ("static", 7 * DAY),
+    "LOCATION": ("static", 7 * DAY),
+    "COMMITTEE": ("static", 7 * DAY),
+    "CULTURAL": ("static", 7 * DAY),
+    "VEDIC_RECITATION": ("static", 7 * DAY),
+    "STORY": ("static", 7 * DAY),
+    "HOMAMS": ("static", 7 * DAY),
+    "HOMAM_ITEMS": ("static", 7 * DAY),
+    "ARJITHA_SEVA": ("static", 7 * DAY),
+    "VAHANA_POOJA": ("static", 7 * DAY),
+}
+
+DEFAULT_POLICY = ("day", HOUR)
+
+# Transient failures must not be served for the rest of the day (or the
+# week, for static intents). answer_user's generic fallback is what a
+# handler that raised, or matched nothing, comes back as.
+UNCACHEABLE_MARKERS = [
+    "temporarily unavailable",
+    "currently unavailable",
+    "don’t have specific information",
+    "don't have specific information",
+]
+
+
+def time_bucket(kind: str, now: datetime) -> str:
+    if kind == "static":
+        return "static"
+    if kind == "hour":
+        return now.strftime("%Y-%m-%d %H")
+    return now.strftime("%Y-%m-%d")
+
+
+# ============================================================
+# DATA VERSION (INVALIDATION)
+# ============================================================
+
+def _fingerprint(obj) -> str:
+    return hashlib.sha1(repr(obj).encode("utf-8")).hexdigest()
+
+
+def _file_stamp(path: Path) -> str:
+    try:
+        st = path.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    except OSError:
+        return "missing"
+
+
+def current_data_version() -> str:
+    """
+    Fingerprint of everything an answer is derived from.
+    The catalog is hashed on every call, and the calendar artifact and
+    temple status file are stamped by mtime, so a rebuild or in-place
+    edit is noticed without a restart.
+    """
+    # imported here so the calendar loads on the first answer, not at cold start
+    from backend.calendar_index import CALENDAR_VERSION
+    from backend.sponsorship_catalog import SPONSORSHIP_CATALOG
+
+    parts = [
+        CALENDAR_VERSION,
+        _file_stamp(CALENDAR_ARTIFACT_PATH),
+        _fingerprint(SPONSORSHIP_CATALOG),
+        _file_stamp(TEMPLE_STATUS_PATH),
+    ]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class ResponseCache:
+
+    def __init__(self, max_items: int = RESPONSE_CACHE_SIZE, version_check_secs: float = 30.0):
+        self.max_items = max_items
+        self.version_check_secs = version_check_secs
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = current_data_version()
+        self._version_checked_at = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------- INVALIDATION --------------------
+
+    def invalidate(self, reason: str = "manual"):
+        with self._lock:
+            self._entries.clear()
+            self._version = current_data_version()
+            self._version_checked_at = time.monotonic()
+        logger.info("Response cache invalidated (%s)", reason)
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_secs:
+            return
+        self._version_checked_at = now
+
+        version = current_data_version()
+        if version != self._version:
+            self.invalidate("calendar/sponsorship/status data changed")
+
+    # -------------------- LOOKUP --------------------
+
+    def make_key(self, q: str, intent: str, now: datetime) -> tuple:
+        kind, _ = INTENT_CACHE_POLICY.get(intent, DEFAULT_POLICY)
+        return (q, intent, time_bucket(kind, now))
+
+    def get(self, q: str, intent: str, now: datetime) -> Optional[str]:
+        self._check_version()
+        key = self.make_key(q, intent, now)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, answer = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def put(self, q: str, intent: str, now: datetime, answer: str):
+        if not answer:
+            return
+        lowered = answer.lower()
+        if any(m in lowered for m in UNCACHEABLE_MARKERS):
+            return
+
+        _, ttl = INTENT_CACHE_POLICY.get(intent, DEFAULT_POLICY)
+        key = self.make_key(q, intent, now)
+
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
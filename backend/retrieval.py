@@ -45,36 +45,99 @@ def retrieve_chunks(question: str, k: int = 4):
     return hits
 =======
 import json
-import faiss
-import numpy as np
-import boto3
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-# Load FAISS index + metadata
-faiss_index = faiss.read_index("backend/faiss_store/index.faiss")
+from backend import chunk_facets
+from backend.artifact_bundle import FlatL2Index
+from backend.chunk_facets import DEITY_ALIASES, FacetIndex
+from backend.chunk_store import ChunkStore, open_chunk_store
+from backend.embedders import check_index_embedder, get_embedder
+from backend.embedding_cache import get_embedding_cache
+from backend.lazy import lazy_resource
+from backend.lexical_index import LexicalIndex, load_or_build, rrf_fuse
 
-with open("backend/faiss_store/meta.json", "r", encoding="utf-8") as f:
-    META = json.load(f)["meta"]
+FAISS_INDEX_PATH = "backend/faiss_store/index.faiss"
+META_PATH = "backend/faiss_store/meta.json"
 
-bedrock = boto3.client("bedrock-runtime", region_name="us-east-1")
+QUERY_INPUT_TYPE = "search_query"
 
+# candidates taken from each ranker before fusion
+HYBRID_DEPTH = 20
 
-def embed_query_bedrock(text):
-    """Embed a single query string."""
-    body = {
-        "texts": [text],
-        "input_type": "search_query"
-    }
 
-    resp = bedrock.invoke_model(
-        modelId="cohere.embed-english-v3",
-        body=json.dumps(body),
-        contentType="application/json"
+# FAISS index, chunks and the embedder load on the first RAG
+# query, not at import; see backend/lazy.py. With a prewarmed bundle
+# (backend/artifact_bundle.py) the vectors and the chunk store
+# (backend/chunk_store.py) are memory-mapped instead of parsing
+# meta.json; without one the store is built from meta.json in memory.
+@lazy_resource
+def get_chunk_store() -> ChunkStore:
+    store = open_chunk_store()
+    if store is not None:
+        return store
+    with open(META_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return ChunkStore.from_meta(data["meta"], embedder=data.get("embedder"))
+
+
+@lazy_resource
+def get_lexical_index() -> LexicalIndex:
+    return load_or_build(get_chunk_store())
+
+
+@lazy_resource
+def get_facet_index() -> FacetIndex:
+    return chunk_facets.load_or_build(get_chunk_store())
+
+
+@lazy_resource
+def get_query_embedder():
+    """The EMBEDDER backend (backend/embedders.py); must match the one that built the index."""
+    return get_embedder()
+
+
+@lazy_resource
+def get_faiss_index():
+    store = get_chunk_store()
+    if store.has_vectors():
+        index = FlatL2Index(store.vectors())
+    else:
+        import faiss
+        index = faiss.read_index(FAISS_INDEX_PATH)
+    # fail here, not with meaningless neighbours, if EMBEDDER changed since the build
+    check_index_embedder(store.manifest.get("embedder"), get_query_embedder(), index.d)
+    return index
+
+
+def embed_query(text):
+    """
+    Embed a single query string with the configured embedder. Remote
+    embedders are served from the embedding cache when possible; the
+    local one is faster than a cache lookup.
+    """
+    import numpy as np
+
+    embedder = get_query_embedder()
+    if not embedder.remote:
+        return np.array([embedder.embed_query(text)], dtype="float32")
+
+    cache = get_embedding_cache()
+    vector, info = cache.get_or_embed(
+        embedder.model_id,
+        QUERY_INPUT_TYPE,
+        text,
+        embedder.embed_query,
     )
 
-    data = json.loads(resp["body"].read())
-    return np.array(data["embeddings"], dtype="float32")
+    stats = cache.stats()
+    print(
+        f"[EMBED-CACHE] source={info['source']} {info['ms']:.1f}ms "
+        f"saved≈{info['saved_ms']:.0f}ms | hit_rate={stats['hit_rate']:.0%} "
+        f"total_saved≈{stats['saved_ms']:.0f}ms"
+    )
+
+    return np.array([vector], dtype="float32")
 
 
 def expand_query(query):
@@ -84,21 +147,8 @@ def expand_query(query):
     query_lower = query.lower()
     expansions = []
     
-    # Deity name expansions
-    deity_map = {
-        "hanuman": ["hanuman", "anjaneya", "maruti"],
-        "ganesha": ["ganesha", "ganapathi", "vinayaka", "ganesh"],
-        "shiva": ["shiva", "siva", "maheswara", "rudra"],
-        "vishnu": ["vishnu", "venkateswara", "venkateshwara", "srinivasa"],
-        "lakshmi": ["lakshmi", "mahalakshmi", "sri devi"],
-        "saraswati": ["saraswati", "sarada"],
-        "murugan": ["murugan", "subramanya", "kartikeya"],
-        "sai baba": ["sai baba", "shirdi sai", "sai"],
-        "andal": ["andal", "goda devi"]
-    }
-    
-    # Add deity variations
-    for deity, variations in deity_map.items():
+    # Add deity variations (the same aliases tag chunks with a deity facet)
+    for deity, variations in DEITY_ALIASES.items():
         if deity in query_lower:
             expansions.extend(variations)
     
@@ -153,30 +203,62 @@ def expand_query(query):
     expanded = query
     if expansions:
         # Add most relevant expansions (limit to avoid over-expansion)
-        unique_expansions = list(set(expansions))[:5]
+        # dict.fromkeys keeps first-seen order, so the expanded text (and its
+        # embedding cache key) is stable across Lambda containers
+        unique_expansions = list(dict.fromkeys(expansions))[:5]
         expanded = query + " " + " ".join(unique_expansions)
     
     return expanded
 
 
-def get_chunks(query, k=7):
+def select_chunk_ids(filters):
+    """
+    Chunk ids matching facet filters (see backend/chunk_facets.py), e.g.
+    {"month": "march", "year": 2026}; None when there are no filters.
+    """
+    if not filters:
+        return None
+    return get_facet_index().select(filters)
+
+
+def search_vectors(q_vec, k, ids=None):
+    """FAISS search, restricted to ids when given. Returns (D, I) as index.search does."""
+    index = get_faiss_index()
+    if ids is None:
+        return index.search(q_vec, k)
+    if isinstance(index, FlatL2Index):
+        return index.search(q_vec, k, ids=ids)
+
+    import faiss
+    import numpy as np
+    selector = faiss.IDSelectorBatch(np.asarray(ids, dtype="int64"))
+    return index.search(q_vec, k, params=faiss.SearchParameters(sel=selector))
+
+
+def get_chunks(query, k=7, filters=None):
     """
-    Retrieve top-k most relevant chunks with query expansion
+    Retrieve top-k most relevant chunks with query expansion.
+    filters restricts the search to matching chunks (select_chunk_ids).
     """
     if not query.strip():
         return []
-    
+
+    ids = select_chunk_ids(filters)
+    if ids is not None and not ids:
+        return []
+
     # Expand query for better semantic matching
     expanded_query = expand_query(query)
     
     # Embed the expanded query
-    q_vec = embed_query_bedrock(expanded_query)
+    q_vec = embed_query(expanded_query)
     
-    # Search FAISS index
-    D, I = faiss_index.search(q_vec.reshape(1, -1), k)
+    # Search FAISS index (only the selected partition when filtered)
+    D, I = search_vectors(q_vec.reshape(1, -1), k, ids)
     
-    # Return matched chunks
-    chunks = [META[i] for i in I[0] if 0 <= i < len(META)]
+    # Return matched chunks (views into the chunk store)
+    store = get_chunk_store()
+    chunks = [store[i] for i in I[0] if 0 <= i < len(store)]
     
     # Debug print (remove in production)
     print(f"Query: {query}")
@@ -191,42 +273,30 @@ def search_by_keywords(keywords, k=10):
     Fallback: keyword-based search in metadata
     Useful when semantic search fails
     """
-    results = []
-    keywords_lower = [kw.lower() for kw in keywords]
-    
-    for item in META:
-        text_lower = item["text"].lower()
-        
-        # Check if ALL keywords present
-        if all(kw in text_lower for kw in keywords_lower):
-            results.append(item)
-            if len(results) >= k:
-                break
-    
-    return results
+    # one bytes.find pass per keyword over the precomputed lowercase blob
+    return get_chunk_store().find_all(keywords, k)
 
 
-def hybrid_search(query, k=7):
+def hybrid_search(query, k=7, filters=None):
     """
-    Combines semantic (FAISS) + keyword search for best results
+    Semantic (FAISS) and lexical (BM25) rankings fused by reciprocal rank.
+    Both lists go deeper than k, so a chunk ranked moderately by both
+    can outrank one that only a single ranker likes. With filters, both
+    rankers only see the matching chunks, so all k results match.
     """
-    # Try semantic search first
-    semantic_results = get_chunks(query, k=k)
-    
-    # If semantic search returns few results, supplement with keyword search
-    if len(semantic_results) < 3:
-        # Extract key terms from query
-        query_words = query.lower().split()
-        important_words = [w for w in query_words if len(w) > 3]
-        
-        keyword_results = search_by_keywords(important_words, k=5)
-        
-        # Combine results (deduplicate by text)
-        seen_texts = {chunk["text"] for chunk in semantic_results}
-        for kw_chunk in keyword_results:
-            if kw_chunk["text"] not in seen_texts:
-                semantic_results.append(kw_chunk)
-                seen_texts.add(kw_chunk["text"])
-    
-    return semantic_results[:k]
+    if not query.strip():
+        return []
+
+    ids = select_chunk_ids(filters)
+    if ids is not None and not ids:
+        return []
+
+    depth = max(2 * k, HYBRID_DEPTH)
+    semantic = get_chunks(query, k=depth, filters=filters)
+    allowed = None if ids is None else frozenset(ids)
+    lexical = get_lexical_index().search(expand_query(query), k=depth, allowed=allowed)
+
+    fused = rrf_fuse([[c["id"] for c in semantic], [hit.id for hit in lexical]], k)
+    store = get_chunk_store()
+    return [store[i] for i in fused]
 >>>>>>> dev
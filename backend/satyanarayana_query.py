@@ -5,8 +5,7 @@ import re
 from datetime import datetime
 from backend.items_catalog_query import ITEMS_REQUIRED, POOJA_SAMAGRI_URL
 from backend.sponsorship_catalog import SPONSORSHIP_CATALOG
-from backend.calender_2026 import CALENDAR_2026
-import calendar
+from backend.calendar_index import CALENDAR_INDEX
 
 SATYANARAYANA_SPONSORSHIP_KEYS = {
     "individual": "satyanarayana_swamy_vratham_individual",
@@ -80,23 +79,13 @@ def handle_satyanarayana_pooja(q: str, now: datetime) -> str | None:
     sponsorship = get_satyanarayana_sponsorship()
     upcoming = []
 
-    for month, days in CALENDAR_2026.items():
-        try:
-            month_num = list(calendar.month_name).index(month.capitalize())
-        except ValueError:
-            continue  # skip if month name is not valid
-
-        for day, info in days.items():
-            for key, value in info.items():
-                # Normalize all entries to lowercase and check if 'satyanarayana' is mentioned
-                if isinstance(value, list) and any("satyanarayana" in v.lower() for v in value):
-                    try:
-                        d = date(2026, month_num, day)
-                        if d >= now.date():
-                            upcoming.append(d)
-                    except Exception:
-                        continue
-   
+    # one date per calendar category mentioning satyanarayana
+    seen = set()
+    for d, category, name in CALENDAR_INDEX.find(now.date(), date.max, deity="satyanarayana"):
+        if (d, category) not in seen:
+            seen.add((d, category))
+            upcoming.append(d)
+
     lines = [
         "🪔 SRI SATYANARAYANA SWAMY POOJA",
         "",
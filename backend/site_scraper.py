@@ -0,0 +1,189 @@
+#backend/site_scraper.py
+#
+"""
+Daily scrape of the svtempleco.org Home page for event images.
+
+The page rarely changes between runs, so the scrape is conditional:
+
+- the last ETag / Last-Modified are sent back; a 304 means unchanged
+- otherwise the body's sha256 is compared with the last one
+- only a changed page is parsed, and then only <img src> tags are
+  built (SoupStrainer), not the whole tree
+
+ScrapeState is saved by the caller once a run has fully finished, so a
+run cut short by the deadline scrapes and resumes again next time
+instead of being skipped as "unchanged".
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple, Optional
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BASE_URL = "https://svtempleco.org"
+HOME_URL = f"{BASE_URL}/Home"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+    'Referer': 'https://svtempleco.org/'
+}
+
+# image filenames carrying one of these are event flyers
+EVENT_YEARS = ("2025", "2026")
+
+SCRAPE_TIMEOUT_SECS = 30
+
+CHANGED = "changed"
+NOT_MODIFIED = "not_modified"   # 304 from the server
+UNCHANGED = "unchanged"         # 200, same body hash as last time
+
+
+# ============================================================
+# EXTRACTION
+# ============================================================
+
+def _event_from_src(src: str, base_url: str, page_url: str) -> dict:
+    if src.startswith('../'):
+        img_url = urljoin(base_url, src.replace('../', ''))
+    elif src.startswith('/'):
+        img_url = base_url + src
+    else:
+        img_url = urljoin(page_url, src)
+
+    filename = src.split('/')[-1]
+    event_name = filename.replace('.jpg', '').replace('.jpeg', '').replace('.png', '')
+    for year in EVENT_YEARS:
+        event_name = event_name.replace(year, '')
+    event_name = event_name.replace('_', ' ').strip().title()
+
+    return {
+        'filename': filename,
+        'name': event_name,
+        'image_url': img_url
+    }
+
+
+def extract_events(html: bytes, base_url: str = BASE_URL, page_url: str = HOME_URL) -> list[dict]:
+    """Event flyers from a page, in page order."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    only_imgs = SoupStrainer("img", attrs={"src": True})
+    soup = BeautifulSoup(html, "html.parser", parse_only=only_imgs)
+
+    events = []
+    for img in soup.find_all("img"):
+        src = img.get("src", "")
+        if any(year in src.lower() for year in EVENT_YEARS):
+            events.append(_event_from_src(src, base_url, page_url))
+    return events
+
+
+# ============================================================
+# STATE
+# ============================================================
+
+class ScrapeState(NamedTuple):
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_sha256: Optional[str] = None
+
+
+class FileScrapeStore:
+    """Scrape state in a local JSON file (local runs, tests)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self, url: str) -> ScrapeState:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return ScrapeState(**json.load(f).get(url, {}))
+        except FileNotFoundError:
+            return ScrapeState()
+
+    def save(self, url: str, state: ScrapeState):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        data[url] = state._asdict()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+class DynamoScrapeStore:
+    """Scrape state as one item per URL in the temple-events table."""
+
+    def __init__(self, table, key_name: str = "event_hash"):
+        self.table = table
+        self.key_name = key_name
+
+    def _key(self, url: str) -> dict:
+        return {self.key_name: f"scrape-cache#{url}"}
+
+    def load(self, url: str) -> ScrapeState:
+        item = self.table.get_item(Key=self._key(url)).get("Item") or {}
+        return ScrapeState(item.get("etag"), item.get("last_modified"), item.get("body_sha256"))
+
+    def save(self, url: str, state: ScrapeState):
+        self.table.put_item(Item={
+            **self._key(url),
+            **{k: v for k, v in state._asdict().items() if v is not None},
+            "updated_at": datetime.now().isoformat(),
+        })
+
+
+# ============================================================
+# SCRAPE
+# ============================================================
+
+class ScrapeResult(NamedTuple):
+    status: str                 # CHANGED / NOT_MODIFIED / UNCHANGED
+    events: list[dict]          # empty unless CHANGED
+    state: ScrapeState          # what to save once the run has finished
+
+
+def scrape_events(session, store, url: str = HOME_URL, base_url: str = BASE_URL) -> ScrapeResult:
+    """
+    Conditional GET of url. Raises on HTTP / network errors, the same
+    as the inline scrape did.
+    """
+    previous = store.load(url)
+
+    headers = {}
+    if previous.etag:
+        headers["If-None-Match"] = previous.etag
+    if previous.last_modified:
+        headers["If-Modified-Since"] = previous.last_modified
+
+    response = session.get(url, headers=headers, timeout=SCRAPE_TIMEOUT_SECS, allow_redirects=True)
+    if response.status_code == 304:
+        logger.info("Scrape %s: 304 not modified", url)
+        return ScrapeResult(NOT_MODIFIED, [], previous)
+    response.raise_for_status()
+
+    body = response.content
+    state = ScrapeState(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        body_sha256=hashlib.sha256(body).hexdigest(),
+    )
+    if previous.body_sha256 and state.body_sha256 == previous.body_sha256:
+        logger.info("Scrape %s: body unchanged", url)
+        return ScrapeResult(UNCHANGED, [], state)
+
+    return ScrapeResult(CHANGED, extract_events(body, base_url, url), state)
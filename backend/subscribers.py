@@ -0,0 +1,274 @@
+#backend/subscribers.py
+#
+"""
+Subscriber roster for broadcasts.
+
+The old broadcast path scanned all of temple-subscribers with a
+`subscribed = true` filter. That read every item, inactive ones included.
+The roster instead keeps two GSIs on the table:
+
+- active-index (PK active_shard, SK phone_number) is sparse. Only
+  subscribed items carry active_shard, so a full load reads active
+  subscribers only. It is spread over ROSTER_ACTIVE_SHARDS partitions.
+- roster-changes (PK roster_log, SK roster_version) holds every
+  subscribe/unsubscribe. Each change is stamped with a number from an
+  atomic counter item, so "what changed since version N" is one query.
+
+A snapshot is kept on local disk (/tmp, which survives warm Lambda
+invocations) as a header line plus one phone number per line. sync()
+applies the changes since the snapshot's version by streaming the old
+file into a new one. iter_active() streams phone numbers from the file
+without holding the roster in memory.
+
+Existing items predate these attributes; run once:
+
+    python -m backend.subscribers backfill
+"""
+
+import json
+import logging
+import os
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SUBSCRIBERS_TABLE = os.getenv("SUBSCRIBERS_TABLE", "temple-subscribers")
+ACTIVE_INDEX = "active-index"
+CHANGES_INDEX = "roster-changes"
+ROSTER_ACTIVE_SHARDS = int(os.getenv("ROSTER_ACTIVE_SHARDS", "4"))
+ROSTER_SNAPSHOT_PATH = Path(os.getenv("ROSTER_SNAPSHOT_PATH", "/tmp/subscribers.snapshot"))
+
+# counter item in the same table; its phone_number is not a real number
+VERSION_KEY = "__roster_version__"
+CHANGE_LOG = "log"
+
+# Versions are taken before the item write, so a slow writer can land a
+# version below one already synced. Re-reading a small window catches it;
+# applying a change twice is harmless.
+SYNC_OVERLAP = 25
+
+
+class SubscriberRoster:
+
+    def __init__(
+        self,
+        table,
+        snapshot_path: Path = ROSTER_SNAPSHOT_PATH,
+        shards: int = ROSTER_ACTIVE_SHARDS,
+    ):
+        self.table = table
+        self.snapshot_path = Path(snapshot_path)
+        self.shards = shards
+        self._lock = threading.Lock()
+
+    # -------------------- WRITES --------------------
+
+    def _shard(self, phone: str) -> str:
+        return f"active#{zlib.crc32(phone.encode()) % self.shards}"
+
+    def _next_version(self) -> int:
+        resp = self.table.update_item(
+            Key={"phone_number": VERSION_KEY},
+            UpdateExpression="ADD roster_version :one",
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(resp["Attributes"]["roster_version"])
+
+    def subscribe(self, phone: str):
+        now = datetime.now().isoformat()
+        self.table.put_item(Item={
+            "phone_number": phone,
+            "subscribed": True,
+            "subscribed_at": now,
+            "updated_at": now,
+            "active_shard": self._shard(phone),
+            "roster_log": CHANGE_LOG,
+            "roster_version": self._next_version(),
+        })
+
+    def unsubscribe(self, phone: str):
+        self.table.update_item(
+            Key={"phone_number": phone},
+            UpdateExpression=(
+                "SET subscribed = :val, updated_at = :time, "
+                "roster_log = :log, roster_version = :ver "
+                "REMOVE active_shard"
+            ),
+            ExpressionAttributeValues={
+                ":val": False,
+                ":time": datetime.now().isoformat(),
+                ":log": CHANGE_LOG,
+                ":ver": self._next_version(),
+            },
+        )
+
+    def is_subscribed(self, phone: str) -> bool:
+        item = self.table.get_item(Key={"phone_number": phone}).get("Item")
+        return bool(item and item.get("subscribed", False))
+
+    # -------------------- QUERY HELPERS --------------------
+
+    def _query_all(self, **kwargs) -> Iterator[dict]:
+        while True:
+            resp = self.table.query(**kwargs)
+            yield from resp.get("Items", [])
+            if "LastEvaluatedKey" not in resp:
+                return
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    def _current_version(self) -> int:
+        item = self.table.get_item(Key={"phone_number": VERSION_KEY}).get("Item")
+        return int(item["roster_version"]) if item else 0
+
+    def _active_from_index(self) -> Iterator[str]:
+        for shard in range(self.shards):
+            for item in self._query_all(
+                IndexName=ACTIVE_INDEX,
+                KeyConditionExpression="active_shard = :s",
+                ExpressionAttributeValues={":s": f"active#{shard}"},
+            ):
+                yield item["phone_number"]
+
+    def _changes_since(self, version: int) -> dict[str, bool]:
+        """{phone: subscribed} for changes with roster_version > version, last wins."""
+        changes: dict[str, bool] = {}
+        for item in self._query_all(
+            IndexName=CHANGES_INDEX,
+            KeyConditionExpression="roster_log = :log AND roster_version > :v",
+            ExpressionAttributeValues={":log": CHANGE_LOG, ":v": version},
+        ):
+            changes[item["phone_number"]] = bool(item.get("subscribed"))
+        return changes
+
+    # -------------------- SNAPSHOT --------------------
+
+    def _read_header(self) -> Optional[dict]:
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                return json.loads(f.readline())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_snapshot(self, version: int, phones: Iterator[str]) -> int:
+        """Stream phones into a new snapshot file; returns the count."""
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        body = self.snapshot_path.with_suffix(".body")
+        count = 0
+        with open(body, "w", encoding="utf-8") as f:
+            for phone in phones:
+                f.write(phone + "\n")
+                count += 1
+
+        # header first, so readers never see a body without its version
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as out, open(body, encoding="utf-8") as src:
+            out.write(json.dumps({"version": version, "count": count}) + "\n")
+            for line in src:
+                out.write(line)
+        os.replace(tmp, self.snapshot_path)
+        body.unlink()
+        return count
+
+    def _snapshot_phones(self) -> Iterator[str]:
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                phone = line.rstrip("\n")
+                if phone:
+                    yield phone
+
+    def _differs(self, changes: dict[str, bool]) -> bool:
+        """True if applying changes would alter the snapshot."""
+        present = {p for p in self._snapshot_phones() if p in changes}
+        return any((phone in present) != subscribed for phone, subscribed in changes.items())
+
+    def sync(self) -> dict:
+        """
+        Bring the local snapshot up to date: a full load from the sparse
+        index the first time, then only the changes since its version.
+        Returns the snapshot header {"version", "count"}.
+        """
+        with self._lock:
+            header = self._read_header()
+
+            if header is None:
+                version = self._current_version()
+                count = self._write_snapshot(version, self._active_from_index())
+                logger.info("Roster loaded: %d active subscribers (version %d)", count, version)
+                return {"version": version, "count": count}
+
+            changes = self._changes_since(max(0, header["version"] - SYNC_OVERLAP))
+            if not changes or not self._differs(changes):
+                return header
+
+            version = max(header["version"], self._current_version())
+
+            def merged():
+                for phone in self._snapshot_phones():
+                    if phone in changes:
+                        if changes.pop(phone):
+                            yield phone
+                    else:
+                        yield phone
+                for phone, subscribed in changes.items():
+                    if subscribed:
+                        yield phone
+
+            count = self._write_snapshot(version, merged())
+            logger.info("Roster synced to version %d: %d active subscribers", version, count)
+            return {"version": version, "count": count}
+
+    def iter_active(self) -> Iterator[str]:
+        """Phone numbers of active subscribers, streamed from the snapshot."""
+        if self._read_header() is None:
+            self.sync()
+        yield from self._snapshot_phones()
+
+    __iter__ = iter_active
+
+    def count(self) -> int:
+        header = self._read_header() or self.sync()
+        return header["count"]
+
+    # -------------------- MIGRATION --------------------
+
+    def backfill(self) -> int:
+        """Stamp pre-roster items with active_shard / roster_version (one full scan)."""
+        updated = 0
+        kwargs: dict = {}
+        while True:
+            resp = self.table.scan(**kwargs)
+            for item in resp.get("Items", []):
+                phone = item["phone_number"]
+                if phone == VERSION_KEY or "roster_version" in item:
+                    continue
+                if item.get("subscribed"):
+                    self.table.update_item(
+                        Key={"phone_number": phone},
+                        UpdateExpression="SET active_shard = :s, roster_log = :log, roster_version = :ver",
+                        ExpressionAttributeValues={
+                            ":s": self._shard(phone), ":log": CHANGE_LOG, ":ver": self._next_version(),
+                        },
+                    )
+                    updated += 1
+            if "LastEvaluatedKey" not in resp:
+                return updated
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+if __name__ == "__main__":
+    import sys
+
+    import boto3
+
+    if sys.argv[1:] != ["backfill"]:
+        sys.exit("usage: python -m backend.subscribers backfill")
+
+    table = boto3.resource("dynamodb", region_name="us-east-1").Table(SUBSCRIBERS_TABLE)
+    print(f"Backfilled {SubscriberRoster(table).backfill()} subscribers")
@@ -5,7 +5,7 @@ from backend.constants import GLOBAL_NORMALIZATION_MAP,MONTH_NORMALIZATION_MAP,W
 from backend.items_catalog_query import ITEMS_REQUIRED
 from datetime import datetime,time,date
 from backend.federal_holidays import get_federal_holidays
-from backend.calender_2026 import CALENDAR_2026
+from backend.calendar_index import CALENDAR_INDEX
 from datetime import datetime, date
 from zoneinfo import ZoneInfo
 import calendar
@@ -156,10 +156,7 @@ def handle_temple_hours(q: str, now: datetime) -> str | None:
     holiday_name = holidays.get(today)
 
     # ---------------- FESTIVALS (DISPLAY ONLY) ----------------
-    festival_names = []
-    if today.year == 2026:
-        month = today.strftime("%B").lower()
-        festival_names = CALENDAR_2026.get(month, {}).get(today.day, {}).get("festival", [])
+    festival_names = CALENDAR_INDEX.events_on(today, include_holidays=False).get("festival", [])
 
     # ---------------- TIME SLOTS ----------------
     full_day_slot = (time(9, 0), time(20, 0))
@@ -6,8 +6,11 @@ from backend.constants import CANONICAL_INTENTS, GLOBAL_NORMALIZATION_MAP, MONTH
 # UTILITY FUNCTIONS
 # ============================================================
 
+import hashlib
 import re
-from difflib import get_close_matches
+from difflib import SequenceMatcher
+from functools import lru_cache
+from backend.artifact_bundle import BUNDLE_DIR, load_tables, save_tables
 from backend.items_catalog_query import ITEMS_REQUIRED
 
 INTENT_NORMALIZATION = {
@@ -122,23 +125,189 @@ def normalize_intent(q: str) -> str:
 def norm(q: str) -> str:
     return q.lower().strip()
 
+# ============================================================
+# COMPILED NORMALIZATION MAP
+# ============================================================
+# Keys are applied longest-first and a replacement can feed a later,
+# shorter key (godha → goda → andal), so the order is part of the output.
+# Every key is indexed by its first characters: a key can only match
+# where a word starts with that prefix, so each query only visits (and
+# compiles) the few keys that can actually fire.
+
+_NORM_PREFIX_LEN = 3
+
+
+def _build_normalization_tables() -> dict:
+    order = sorted(GLOBAL_NORMALIZATION_MAP, key=len, reverse=True)
+    prefix_index: dict[str, list[int]] = {}
+    always_check: list[int] = []
+    for rank, key in enumerate(order):
+        prefix = key[:_NORM_PREFIX_LEN]
+        if len(prefix) == _NORM_PREFIX_LEN and prefix.isalnum():
+            prefix_index.setdefault(prefix, []).append(rank)
+        else:
+            always_check.append(rank)
+    return {"norm_order": order, "norm_prefix_index": prefix_index, "norm_always_check": always_check}
+
+
+@lru_cache(maxsize=None)
+def _rule_pattern(key: str) -> re.Pattern:
+    # compiled on first use: a query only ever visits a few keys
+    return re.compile(rf"\b{key}\b")
+
+
+_WORD_START_RE = re.compile(r"\b(?=\w)")
+
+
+def _candidate_rules(q: str, after: int = -1) -> list[int]:
+    """Ranks of rules whose key prefix starts a word in q, in apply order."""
+    ranks = set(_NORM_ALWAYS_CHECK)
+    for m in _WORD_START_RE.finditer(q):
+        p = m.start()
+        bucket = _NORM_PREFIX_INDEX.get(q[p:p + _NORM_PREFIX_LEN])
+        if bucket:
+            ranks.update(bucket)
+    return sorted(r for r in ranks if r > after)
+
+
 def normalize_query(q: str) -> str:
     q = q.lower().strip()
     print("in normalize query", q)
 
-    for k in sorted(GLOBAL_NORMALIZATION_MAP, key=len, reverse=True):
-        v = GLOBAL_NORMALIZATION_MAP[k]
+    pending = _candidate_rules(q)
+    i = 0
+    while i < len(pending):
+        rank = pending[i]
+        i += 1
+        k, v = NORMALIZATION_RULES[rank]
 
         # word-boundary safe replacement
-        new_q = re.sub(rf"\b{k}\b", v, q)
+        new_q = _rule_pattern(k).sub(v, q)
         if new_q != q:
             q = new_q
             print(f"mapped '{k}' → '{v}' => {q}")
+            # the replacement may have introduced new (shorter) keys
+            pending = _candidate_rules(q, after=rank)
+            i = 0
 
     return q
 
 
 
+# ============================================================
+# AUTOCORRECT INDEX
+# ============================================================
+# get_close_matches(w, TEMPLE_VOCAB, n=1, cutoff) scores every vocab entry
+# with SequenceMatcher. Two bounds let us skip almost all of them:
+#
+# 1. real_quick_ratio (lengths only): 2*min(L, l) / (L + l) >= cutoff
+# 2. ratio >= cutoff means the strings share a common subsequence that is
+#    at most D = (1 - cutoff) * (L + l) deletions away from either side,
+#    so they meet in a SymSpell-style deletion dictionary.
+#
+# Candidates from the index go through the same quick_ratio / ratio checks
+# get_close_matches uses, so corrections are identical.
+
+MAX_INDEX_DELETES = 2
+
+
+def _deletes(word: str, depth: int) -> set[str]:
+    """All strings reachable from word by deleting up to depth characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+def _build_vocab_tables() -> dict:
+    by_length: dict[int, list[str]] = {}
+    delete_index: dict[str, set[str]] = {}
+    for word in sorted(TEMPLE_VOCAB):
+        by_length.setdefault(len(word), []).append(word)
+        for variant in _deletes(word, MAX_INDEX_DELETES):
+            delete_index.setdefault(variant, set()).add(word)
+    return {
+        "vocab_by_length": by_length,
+        "delete_index": {k: tuple(sorted(v)) for k, v in delete_index.items()},
+    }
+
+
+# ============================================================
+# PRECOMPILED TABLES
+# ============================================================
+# The rule order / prefix index and the autocorrect index only depend on
+# constants. build.py stores them in the artifact bundle; they are loaded
+# from there when the fingerprint of their inputs still matches, and
+# rebuilt here otherwise.
+
+TABLES_FINGERPRINT = hashlib.sha1(repr((
+    list(GLOBAL_NORMALIZATION_MAP.items()),   # insertion order breaks length ties
+    sorted(TEMPLE_VOCAB),
+    _NORM_PREFIX_LEN,
+    MAX_INDEX_DELETES,
+)).encode("utf-8")).hexdigest()
+
+
+def _build_tables() -> dict:
+    return {**_build_normalization_tables(), **_build_vocab_tables()}
+
+
+def write_normalization_tables(out_dir=BUNDLE_DIR):
+    """Build step: store the tables in the artifact bundle."""
+    save_tables(_build_tables(), TABLES_FINGERPRINT, out_dir)
+
+
+_TABLES = load_tables(TABLES_FINGERPRINT) or _build_tables()
+
+NORMALIZATION_RULES = [(k, GLOBAL_NORMALIZATION_MAP[k]) for k in _TABLES["norm_order"]]
+_NORM_PREFIX_INDEX: dict[str, list[int]] = _TABLES["norm_prefix_index"]
+_NORM_ALWAYS_CHECK: list[int] = _TABLES["norm_always_check"]
+VOCAB_BY_LENGTH: dict[int, list[str]] = _TABLES["vocab_by_length"]
+DELETE_INDEX: dict[str, tuple[str, ...]] = _TABLES["delete_index"]
+
+
+def _vocab_candidates(w: str, cutoff: float) -> set[str]:
+    length = len(w)
+    candidates = set()
+    depth = -1
+
+    for size, words in VOCAB_BY_LENGTH.items():
+        if 2.0 * min(size, length) / (size + length) < cutoff:
+            continue
+        max_deletes = int((1.0 - cutoff) * (size + length) + 1e-9)
+        if max_deletes > MAX_INDEX_DELETES:
+            # too far apart for the index, compare directly
+            candidates.update(words)
+        else:
+            depth = max(depth, max_deletes)
+
+    if depth >= 0:
+        for variant in _deletes(w, depth):
+            candidates.update(DELETE_INDEX.get(variant, ()))
+
+    return candidates
+
+
+@lru_cache(maxsize=4096)
+def correct_token(w: str, cutoff: float = 0.88) -> str:
+    """Best TEMPLE_VOCAB match for one token (same result as get_close_matches n=1)."""
+    s = SequenceMatcher()
+    s.set_seq2(w)
+
+    best = None
+    for x in _vocab_candidates(w, cutoff):
+        s.set_seq1(x)
+        if s.real_quick_ratio() >= cutoff and \
+           s.quick_ratio() >= cutoff:
+            score = s.ratio()
+            if score >= cutoff and (best is None or (score, x) > best):
+                best = (score, x)
+
+    return best[1] if best else w
+
+
 def autocorrect_query(q: str, cutoff: float = 0.88) -> str:
     """
     Lightweight spelling correction using stdlib only.
@@ -152,14 +321,7 @@ def autocorrect_query(q: str, cutoff: float = 0.88) -> str:
             corrected.append(w)
             continue
 
-        matches = get_close_matches(
-            w,
-            TEMPLE_VOCAB,
-            n=1,
-            cutoff=cutoff
-        )
-
-        corrected.append(matches[0] if matches else w)
+        corrected.append(correct_token(w, cutoff))
 
     return " ".join(corrected)
 
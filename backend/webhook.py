@@ -0,0 +1,98 @@
+#backend/webhook.py
+#
+"""
+WhatsApp webhook payload helpers shared by the sync and async paths.
+
+Meta can batch several messages, changes and entries into one POST.
+extract_messages() flattens all of them; dispatch() answers them on a
+small thread pool. One sender's messages run in order on one worker,
+different senders run in parallel, and a failing message does not stop
+the others. enqueue_new() is the async path: it hands only message ids
+not seen before to the queue.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+WEBHOOK_CONCURRENCY = int(os.getenv("WEBHOOK_CONCURRENCY", "4"))
+
+
+def extract_messages(body: dict) -> list[dict]:
+    """
+    Every well-formed text message in a webhook payload, across all
+    entries and changes, as {"id", "from", "text", "timestamp"}.
+    Status callbacks and non-text messages are skipped.
+    """
+    messages = []
+    for entry in body.get("entry", []) or []:
+        for change in entry.get("changes", []) or []:
+            for msg in change.get("value", {}).get("messages", []) or []:
+                text = (msg.get("text") or {}).get("body")
+                if not (text and msg.get("from") and msg.get("id")):
+                    continue
+                messages.append({
+                    "id": msg["id"],
+                    "from": msg["from"],
+                    "text": text,
+                    "timestamp": msg.get("timestamp"),
+                })
+    return messages
+
+
+class DispatchResult(NamedTuple):
+    handled: int
+    failed: list[str]       # message ids whose handler raised
+
+
+def dispatch(
+    messages: list[dict],
+    handle: Callable[[dict], None],
+    max_workers: int = WEBHOOK_CONCURRENCY,
+) -> DispatchResult:
+    """Run handle on every message; returns once all of them are done."""
+    by_sender: dict[str, list[dict]] = {}
+    for msg in messages:
+        by_sender.setdefault(msg["from"], []).append(msg)
+
+    def run_sender(batch: list[dict]) -> list[str]:
+        failed = []
+        for msg in batch:
+            try:
+                handle(msg)
+            except Exception:
+                logger.error("Message %s from %s failed", msg["id"], msg["from"], exc_info=True)
+                failed.append(msg["id"])
+        return failed
+
+    if len(by_sender) <= 1 or max_workers <= 1:
+        failed = [mid for batch in by_sender.values() for mid in run_sender(batch)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(by_sender))) as pool:
+            failed = [mid for ids in pool.map(run_sender, by_sender.values()) for mid in ids]
+
+    return DispatchResult(len(messages) - len(failed), failed)
+
+
+def enqueue_new(messages: list[dict], queue, dedupe) -> int:
+    """
+    Enqueue the messages whose id dedupe (a MessageDedupe) has not seen,
+    so a redelivered webhook never reaches the queue twice. If the
+    enqueue fails the claims are released and the error is raised, so
+    Meta's retry is enqueued. Returns the number enqueued.
+    """
+    fresh = [msg for msg in messages if dedupe.claim(msg["id"])]
+    if len(fresh) < len(messages):
+        logger.info("Dropped %d redelivered messages", len(messages) - len(fresh))
+    if not fresh:
+        return 0
+    try:
+        return queue.send_batch(fresh)
+    except Exception:
+        for msg in fresh:
+            dedupe.release(msg["id"])
+        raise
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Memory and per-query allocation benchmark for backend/chunk_store.py.
+
+Compares the meta.json list of dicts with the chunk store on the
+committed meta.json:
+
+- resident memory added by loading and reading every text once
+  (fresh interpreter, /proc/self/statm; mmapped pages count as resident)
+- Python heap held by the loaded chunks (tracemalloc)
+- keyword search as hybrid_search runs it (words longer than 3 chars of
+  every regression-suite query): time and peak allocation per query,
+  and whether both return the same chunks
+
+Usage:
+    python bench_chunk_store.py
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from backend.artifact_bundle import FAISS_DIR, write_bundle
+from backend.chunk_store import open_chunk_store
+from bench_utility import load_query_corpus
+
+BASE_DIR = Path(__file__).resolve().parent
+META_PATH = FAISS_DIR / "meta.json"
+
+RSS_PROBE = """
+import json, os, sys
+from backend.chunk_store import open_chunk_store
+
+def rss_kb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+before = rss_kb()
+if sys.argv[1] == "meta":
+    with open(sys.argv[2], encoding="utf-8") as f:
+        chunks = json.load(f)["meta"]
+    touched = sum(len(c["text"]) for c in chunks)
+else:
+    chunks = open_chunk_store(sys.argv[2])
+    touched = sum(len(c["text"]) for c in chunks)
+print(rss_kb() - before)
+"""
+
+
+def legacy_search(meta: list[dict], keywords: list[str], k: int) -> list[dict]:
+    """search_by_keywords before the chunk store."""
+    results = []
+    keywords_lower = [kw.lower() for kw in keywords]
+    for item in meta:
+        text_lower = item["text"].lower()
+        if all(kw in text_lower for kw in keywords_lower):
+            results.append(item)
+            if len(results) >= k:
+                break
+    return results
+
+
+def rss_kb(kind: str, path: Path) -> int:
+    out = subprocess.run([sys.executable, "-c", RSS_PROBE, kind, str(path)],
+                         cwd=BASE_DIR, capture_output=True, text=True, check=True)
+    return int(out.stdout.strip())
+
+
+def heap_of(load) -> tuple[object, int]:
+    tracemalloc.start()
+    obj = load()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, held
+
+
+def per_query(search, queries: list[list[str]]) -> tuple[float, float]:
+    """(µs per query, mean peak KB allocated per query)"""
+    t = time.perf_counter()
+    for words in queries:
+        search(words)
+    us = (time.perf_counter() - t) / len(queries) * 1e6
+
+    peaks = []
+    for words in queries:
+        tracemalloc.start()
+        search(words)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return us, sum(peaks) / len(peaks) / 1024
+
+
+def main():
+    queries = [[w for w in q.lower().split() if len(w) > 3] for q in load_query_corpus()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def load_meta():
+            with open(META_PATH, encoding="utf-8") as f:
+                return json.load(f)["meta"]
+
+        meta, meta_heap = heap_of(load_meta)
+        write_bundle(meta, None, tmp)
+        store, store_heap = heap_of(lambda: open_chunk_store(tmp))
+
+        mismatches = sum(
+            [c["id"] for c in legacy_search(meta, words, 5)] != [c["id"] for c in store.find_all(words, 5)]
+            for words in queries
+        )
+        legacy_us, legacy_kb = per_query(lambda w: legacy_search(meta, w, 5), queries)
+        store_us, store_kb = per_query(lambda w: store.find_all(w, 5), queries)
+
+        meta_rss, store_rss = rss_kb("meta", META_PATH), rss_kb("store", Path(tmp))
+
+    print(f"Chunk store ({len(meta)} chunks, {len(queries)} keyword queries)")
+    print(f"  RSS after load      meta.json {meta_rss / 1024:6.1f} MB   store {store_rss / 1024:6.1f} MB")
+    print(f"  heap held           meta.json {meta_heap / 1024:6.0f} KB   store {store_heap / 1024:6.0f} KB")
+    print(f"  keyword search      before {legacy_us:8.1f} µs/query, {legacy_kb:7.1f} KB peak alloc")
+    print(f"                      after  {store_us:8.1f} µs/query, {store_kb:7.1f} KB peak alloc")
+    print(f"  mismatches          {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
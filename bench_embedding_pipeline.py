@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Embedding throughput benchmark: build.py's old serial loop vs
+backend/embedding_pipeline.py, against a simulated Bedrock.
+
+The simulated backend sleeps a fixed per-request latency plus a
+per-text cost and, optionally, throttles a share of requests, so this
+runs offline. The texts are the chunks of the committed meta.json.
+
+Usage:
+    python bench_embedding_pipeline.py [--latency-ms 40] [--per-text-ms 0.5] [--throttle 0.05]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+
+from backend.artifact_bundle import FAISS_DIR
+from backend.embedding_pipeline import EmbeddingPipeline
+from test_support.fake_embedder import FakeEmbedder, FakeThrottle
+
+
+class SimulatedBedrock(FakeEmbedder):
+    model_id = "simulated-cohere"
+
+    def __init__(self, latency: float, per_text: float, throttle: float, seed: int = 7):
+        super().__init__(dim=16, max_batch=96)
+        self.latency = latency
+        self.per_text = per_text
+        self.throttle_rate = throttle
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def embed(self, texts):
+        with self._rng_lock:
+            self.requests.append(texts)
+            throttled = self._rng.random() < self.throttle_rate
+        time.sleep(self.latency + self.per_text * len(texts))
+        if throttled:
+            raise FakeThrottle()
+        return [self.vector(t, self.dim) for t in texts]
+
+
+def serial_loop(backend, texts, batch_size=32):
+    """build.py before the pipeline (a throttle there aborted the build; here it is retried once)."""
+    vectors = []
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        try:
+            vectors.extend(backend.embed(batch))
+        except FakeThrottle:
+            vectors.extend(backend.embed(batch))
+    return vectors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.5)
+    parser.add_argument("--throttle", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with open(FAISS_DIR / "meta.json", encoding="utf-8") as f:
+        texts = [c["text"] for c in json.load(f)["meta"]]
+
+    def backend():
+        return SimulatedBedrock(args.latency_ms / 1000, args.per_text_ms / 1000, args.throttle)
+
+    serial = backend()
+    t = time.perf_counter()
+    expected = serial_loop(serial, texts)
+    serial_s = time.perf_counter() - t
+
+    pipelined = backend()
+    pipeline = EmbeddingPipeline(pipelined, rate=1000, backoff=0.05)
+    t = time.perf_counter()
+    got = pipeline.embed(texts)
+    pipeline_s = time.perf_counter() - t
+    stats = pipeline.stats()
+
+    print(f"Embedding {len(texts)} chunks (simulated {args.latency_ms:.0f} ms/request "
+          f"+ {args.per_text_ms} ms/text, {args.throttle:.0%} throttled)")
+    print(f"  serial, 32/batch   {serial_s:6.2f} s  {len(serial.requests):4d} requests")
+    print(f"  pipeline           {pipeline_s:6.2f} s  {stats.requests:4d} requests, "
+          f"{stats.retries} retries, final batch {stats.batch_size}, {pipeline.workers} workers")
+    print(f"  speedup            {serial_s / pipeline_s:.1f}x, same vectors: {got == expected}")
+
+
+if __name__ == "__main__":
+    main()
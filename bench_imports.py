@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Cold-start import profile for the Lambda entry point.
+
+Runs `python -X importtime -c "import app"` in fresh interpreters and
+digests the report: total import time (median of REPEAT runs), the
+slowest modules by self time, and whether any of the heavy modules that
+should load lazily (boto3, faiss, numpy, retrieval, query handlers,
+calendar data) were pulled in at import.
+
+Usage:
+    python bench_imports.py                  # print the digest
+    python bench_imports.py --write          # also update reports/import_profile.txt
+    python bench_imports.py backend.ask_temple
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+REPORT_PATH = BASE_DIR / "reports" / "import_profile.txt"
+REPEAT = 5
+TOP = 15
+
+# must not be imported by a cold `import app`; they load on first use
+LAZY_MODULES = [
+    "boto3",
+    "botocore",
+    "faiss",
+    "numpy",
+    "bs4",
+    "backend.ask_temple",
+    "backend.retrieval",
+    "backend.get_timing",
+    "backend.calendar_index",
+    "backend.calender_2026",
+    "backend.sponsorship_catalog",
+    "backend.panchangam",
+    "backend.story_query",
+]
+
+
+def profile(target: str) -> list[tuple[str, int, int]]:
+    """[(module, self_us, cumulative_us)] from one fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"import {target} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def digest(target: str, repeat: int = REPEAT) -> str:
+    runs = [profile(target) for _ in range(repeat)]
+    totals = [sum(self_us for _, self_us, _ in rows) for rows in runs]
+    rows = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    loaded = {name for name, _, _ in rows}
+
+    lines = [
+        f"import {target}",
+        f"  total: {statistics.median(totals) / 1000:.1f} ms "
+        f"(median of {repeat}, min {min(totals) / 1000:.1f} ms), {len(rows)} modules",
+        "",
+        f"  slowest {TOP} by self time:",
+    ]
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[1])[:TOP]:
+        lines.append(f"    {self_us / 1000:8.2f} ms self {cumulative_us / 1000:8.2f} ms cumulative  {name}")
+
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    lines.append("")
+    lines.append("  lazy modules imported eagerly: " + (", ".join(eager) if eager else "none"))
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("target", nargs="?", default="app")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--write", action="store_true", help=f"write the digest to {REPORT_PATH.name}")
+    args = parser.parse_args()
+
+    text = digest(args.target, args.repeat)
+    print(text, end="")
+    if args.write:
+        REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        REPORT_PATH.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Init-time benchmark: legacy artifact loading vs the prewarmed bundle.
+
+Before: json.load(meta.json), faiss.read_index(index.faiss) and building
+the utility normalization / autocorrect tables from backend.constants.
+After: opening the chunk store (mmapped blobs + offsets), memory-mapping
+vectors.npy and loading the precompiled tables.
+
+The bundle is written to a temporary directory from the committed
+meta.json (and index.faiss when faiss is installed), so this runs
+without re-embedding. Steps whose dependency is not installed (faiss,
+numpy) are reported as skipped.
+
+Usage:
+    python bench_init.py
+"""
+
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from backend import utility
+from backend.artifact_bundle import FAISS_DIR, load_tables, write_bundle
+from backend.chunk_store import open_chunk_store
+
+REPEAT = 15
+
+
+def timed(fn, repeat: int = REPEAT) -> float:
+    """Median wall time of fn() in ms."""
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return statistics.median(samples)
+
+
+def read_vectors():
+    index_path = FAISS_DIR / "index.faiss"
+    if not index_path.exists() or not index_path.stat().st_size:
+        return None, None
+    try:
+        import faiss
+    except ImportError:
+        return None, None
+    index = faiss.read_index(str(index_path))
+    return index, index.reconstruct_n(0, index.ntotal)
+
+
+def main():
+    meta_path = FAISS_DIR / "meta.json"
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)["meta"]
+    index, vectors = read_vectors()
+
+    rows = []
+
+    def load_meta():
+        with open(meta_path, encoding="utf-8") as f:
+            json.load(f)
+
+    rows.append(("chunks", "meta.json json.load", timed(load_meta)))
+    rows.append(("tables", "build from constants", timed(utility._build_tables)))
+    if index is not None:
+        import faiss
+        rows.append(("vectors", "faiss.read_index", timed(lambda: faiss.read_index(str(FAISS_DIR / "index.faiss")))))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_bundle(meta, vectors, tmp)
+        utility.write_normalization_tables(tmp)
+
+        rows.append(("chunks", "chunk store open", timed(lambda: open_chunk_store(tmp))))
+        rows.append(("tables", "bundle load", timed(lambda: load_tables(utility.TABLES_FINGERPRINT, tmp))))
+        store = open_chunk_store(tmp)
+        if store.has_vectors():
+            rows.append(("vectors", "np.load mmap", timed(store.vectors)))
+
+        sizes = {p.name: p.stat().st_size for p in Path(tmp).iterdir()}
+
+    print(f"Init artifacts ({len(meta)} chunks, median of {REPEAT})")
+    for what in ("chunks", "tables", "vectors"):
+        found = [(how, ms) for w, how, ms in rows if w == what]
+        if not found:
+            print(f"  {what:8s} skipped (faiss / index.faiss not available)")
+            continue
+        for how, ms in found:
+            print(f"  {what:8s} {how:24s} {ms:8.2f} ms")
+
+    legacy = sum(ms for w, how, ms in rows if how in ("meta.json json.load", "build from constants", "faiss.read_index"))
+    bundled = sum(ms for w, how, ms in rows if how in ("chunk store open", "bundle load", "np.load mmap"))
+    print(f"  total    before {legacy:.2f} ms → after {bundled:.2f} ms ({legacy / bundled:.1f}x)")
+    print("  bundle files: " + ", ".join(f"{name} {size / 1024:.0f} KB" for name, size in sorted(sizes.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the query normalization helpers in backend/utility.py.
+
+Runs over the query lists in the regression test files (read with ast, so
+the bot does not need to be importable) and compares the current
+implementation against the original loop it replaced.
+
+Usage:
+    python bench_utility.py
+"""
+
+import ast
+import contextlib
+import os
+import re
+import time
+from difflib import get_close_matches
+from pathlib import Path
+
+from backend.constants import GLOBAL_NORMALIZATION_MAP
+from backend.utility import TEMPLE_VOCAB, autocorrect_query, correct_token, normalize_query
+
+BASE_DIR = Path(__file__).resolve().parent
+CORPUS_FILES = [
+    "test_250_queries.py",
+    "test_regression.py",
+    "test_events.py",
+    "test_abhishekam.py",
+    "test_rag.py",
+]
+REPEAT = 20
+
+
+# ============================================================
+# CORPUS
+# ============================================================
+
+def load_query_corpus(files=CORPUS_FILES) -> list[str]:
+    """Collect every string in module-level list literals of the test files."""
+    queries = []
+    for name in files:
+        tree = ast.parse((BASE_DIR / name).read_text(encoding="utf-8"))
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.List):
+                for elt in node.value.elts:
+                    if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
+                        queries.append(elt.value)
+                    elif isinstance(elt, ast.Tuple) and elt.elts:
+                        first = elt.elts[0]
+                        if isinstance(first, ast.Constant) and isinstance(first.value, str):
+                            queries.append(first.value)
+    return queries
+
+
+# ============================================================
+# BASELINES (ORIGINAL IMPLEMENTATIONS)
+# ============================================================
+
+def legacy_normalize_query(q: str) -> str:
+    q = q.lower().strip()
+    print("in normalize query", q)
+
+    for k in sorted(GLOBAL_NORMALIZATION_MAP, key=len, reverse=True):
+        v = GLOBAL_NORMALIZATION_MAP[k]
+        new_q = re.sub(rf"\b{k}\b", v, q)
+        if new_q != q:
+            q = new_q
+            print(f"mapped '{k}' → '{v}' => {q}")
+
+    return q
+
+
+def legacy_autocorrect_query(q: str, cutoff: float = 0.88) -> str:
+    corrected = []
+    for w in q.split():
+        if len(w) < 4 or not w.isalpha():
+            corrected.append(w)
+            continue
+        matches = get_close_matches(w, TEMPLE_VOCAB, n=1, cutoff=cutoff)
+        corrected.append(matches[0] if matches else w)
+    return " ".join(corrected)
+
+
+def autocorrect_query_cold(q: str) -> str:
+    """Current autocorrect with the per-token memo cleared (index only)."""
+    correct_token.cache_clear()
+    return autocorrect_query(q)
+
+
+# ============================================================
+# TIMING
+# ============================================================
+
+def per_call_us(fn, queries, repeat=REPEAT) -> float:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for q in queries:
+                fn(q)
+        elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(queries)) * 1e6
+
+
+def compare(label, before, after, queries):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        mismatches = [q for q in queries if before(q) != after(q)]
+
+    before_us = per_call_us(before, queries)
+    after_us = per_call_us(after, queries)
+
+    print(f"{label}")
+    print(f"  queries     : {len(queries)}")
+    print(f"  before      : {before_us:8.1f} µs/call")
+    print(f"  after       : {after_us:8.1f} µs/call")
+    print(f"  speedup     : {before_us / after_us:8.1f}x")
+    print(f"  mismatches  : {len(mismatches)}")
+    for q in mismatches[:10]:
+        print(f"    ✗ {q!r}")
+    return not mismatches
+
+
+def main():
+    queries = load_query_corpus()
+    # autocorrect runs on lowercased, normalized text in answer_user
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        normalized = [normalize_query(q) for q in queries]
+
+    ok = compare("normalize_query", legacy_normalize_query, normalize_query, queries)
+    print()
+    ok &= compare("autocorrect_query (index, memo cleared)",
+                  legacy_autocorrect_query, autocorrect_query_cold, normalized)
+    print()
+    ok &= compare("autocorrect_query (index + memo)",
+                  legacy_autocorrect_query, autocorrect_query, normalized)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
 import os
+import shutil
+import sys
 import json
 from pathlib import Path
-import boto3
 import numpy as np
 import faiss
 
+from backend.artifact_bundle import BUNDLE_DIR, publish_staged, write_bundle
+from backend.calendar_ingest import build_calendar_artifact
+from backend.chunk_facets import FACET_INDEX_PATH, FacetIndex, extract_facets
+from backend.embedding_manifest import EmbeddingManifest, embed_incremental, format_diff
+from backend.embedders import get_embedder
+from backend.embedding_pipeline import EmbeddingPipeline
+from backend.lexical_index import LEXICAL_INDEX_PATH, LexicalIndex
+from backend.panchang_table import write_panchang_artifact
+from backend.utility import write_normalization_tables
+
 DATA_DIR = Path("data_raw")
 FAISS_DIR = Path("backend/faiss_store")
 FAISS_DIR.mkdir(parents=True, exist_ok=True)
+# every output of a build is written here, checked, then published
+STAGING_DIR = FAISS_DIR / "staging"
 
-bedrock = boto3.client("bedrock-runtime", region_name="us-east-1")
+DOC_INPUT_TYPE = "search_document"
 
 # ============================================================
 # IMPROVED CHUNKING STRATEGY
@@ -229,25 +242,35 @@ def load_all_text_chunks():
     return chunks, sources
 
 
-# ---------- EMBEDDINGS (UNCHANGED) -------------
-def embed_bedrock(text_list):
-    body = {
-        "texts": text_list,
-        "input_type": "search_document"
-    }
+# ---------- EMBEDDINGS -------------
+# The embedder comes from EMBEDDER (backend/embedders.py). Batching,
+# concurrency, rate limiting and throttling retries live in
+# backend/embedding_pipeline.py; the manifest is updated between runs of
+# EMBED_CHECKPOINT_EVERY texts.
+EMBED_CHECKPOINT_EVERY = 480
+
+
+def make_embedding_pipeline(embedder):
+    if embedder.remote:
+        return EmbeddingPipeline(embedder)
+    # CPU-bound and free: no rate limit, one worker (the GIL serializes it anyway)
+    return EmbeddingPipeline(embedder, workers=1, rate=1e6)
 
-    resp = bedrock.invoke_model(
-        modelId="cohere.embed-english-v3",
-        body=json.dumps(body),
-        contentType="application/json"
-    )
 
-    data = json.loads(resp["body"].read())
-    return data["embeddings"]
+def check_staged_counts(**counts):
+    """Refuse to publish a build whose outputs disagree on the number of chunks."""
+    if len(set(counts.values())) != 1:
+        raise RuntimeError("❌ Staged outputs disagree, not publishing: "
+                           + ", ".join(f"{name}={n}" for name, n in counts.items()))
 
 
 # ---------- BUILD INDEX -------------
-def build_index():
+def build_index(full=False):
+    """
+    Incremental by default: chunks whose text is already in the
+    embedding manifest (backend/embedding_manifest.py) reuse their
+    vector. full=True ignores the manifest and re-embeds everything.
+    """
     print("Loading and chunking text with IMPROVED strategy...")
     chunks, sources = load_all_text_chunks()
     print(f"Total chunks: {len(chunks)}")
@@ -278,23 +301,30 @@ def build_index():
         print(f"\n--- Chunk {i+1} ({sources[i]}) ---")
         print(chunk[:200] + "..." if len(chunk) > 200 else chunk)
 
-    # Embed in batches
-    vectors = []
-    batch_size = 32
+    # Embed only texts the manifest has no vector for
+    embedder = get_embedder()
+    pipeline = make_embedding_pipeline(embedder)
+    if full:
+        embeddings = EmbeddingManifest(embedder.id, DOC_INPUT_TYPE)
+    else:
+        embeddings = EmbeddingManifest.load(embedder.id, DOC_INPUT_TYPE)
 
-    print("\nEmbedding chunks with Bedrock...")
-    for i in range(0, len(chunks), batch_size):
-        batch = chunks[i:i+batch_size]
-        
-        # Double-check batch sizes before sending
-        for j, text in enumerate(batch):
-            if len(text) > 2048:
-                print(f"⚠️  Truncating chunk {i+j} from {len(text)} to 2048 chars")
-                batch[j] = text[:2000]
-        
-        embeds = embed_bedrock(batch)
-        vectors.extend(embeds)
-        print(f"Embedded {min(i+batch_size, len(chunks))}/{len(chunks)} chunks")
+    print(f"\nEmbedding new chunks with {embedder.id} ({'full' if full else 'incremental'})...")
+    try:
+        vectors, diff = embed_incremental(
+            chunks, sources, embeddings, pipeline.embed, pipeline.backend.max_batch,
+            on_batch=lambda done, total: print(f"Embedded {done}/{total} new chunks"),
+            checkpoint_every=EMBED_CHECKPOINT_EVERY,
+        )
+    finally:
+        # vectors already paid for survive a failed run
+        embeddings.save()
+
+    print("\n🔁 Build diff")
+    print(format_diff(diff))
+    stats = pipeline.stats()
+    print(f"{embedder.id}: {stats.requests} requests, {stats.retries} retries "
+          f"({stats.throttled} throttled), final batch size {stats.batch_size}")
 
     vectors = np.array(vectors, dtype="float32")
     dim = vectors.shape[1]
@@ -303,16 +333,42 @@ def build_index():
     index = faiss.IndexFlatL2(dim)
     index.add(vectors)
 
+    # Stage every output, check them against each other, then publish
+    # them together: a failure part-way leaves the live index untouched
+    shutil.rmtree(STAGING_DIR, ignore_errors=True)
+    STAGING_DIR.mkdir(parents=True)
+
     print("\nSaving FAISS index...")
-    faiss.write_index(index, str(FAISS_DIR / "index.faiss"))
+    faiss.write_index(index, str(STAGING_DIR / "index.faiss"))
 
     print("Saving metadata...")
     meta = []
     for i, text in enumerate(chunks):
-        meta.append({"id": i, "source": sources[i], "text": text})
+        meta.append({"id": i, "source": sources[i], "text": text,
+                     "facets": extract_facets(sources[i], text)})
+
+    with open(STAGING_DIR / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"embedder": embedder.id, "meta": meta}, f, indent=2)
+
+    print("Writing prewarmed artifact bundle...")
+    manifest = write_bundle(meta, vectors, STAGING_DIR / "bundle", embedder=embedder.id)
+    write_normalization_tables(STAGING_DIR / "bundle")
+    lexical_index = LexicalIndex.build(chunks, manifest["chunks_sha256"])
+    lexical_index.save(STAGING_DIR / "lexical.idx")
+    facet_index = FacetIndex.build((m["facets"] for m in meta), manifest["chunks_sha256"])
+    facet_index.save(STAGING_DIR / "facets.idx")
+
+    check_staged_counts(faiss=index.ntotal, meta=len(meta), bundle=manifest["count"],
+                        lexical=lexical_index.count, facets=facet_index.count)
+    publish_staged(STAGING_DIR, {
+        "index.faiss": FAISS_DIR / "index.faiss",
+        "meta.json": FAISS_DIR / "meta.json",
+        "lexical.idx": LEXICAL_INDEX_PATH,
+        "facets.idx": FACET_INDEX_PATH,
+    }, BUNDLE_DIR)
 
-    with open(FAISS_DIR / "meta.json", "w", encoding="utf-8") as f:
-        json.dump({"meta": meta}, f, indent=2)
+    print("🏷️  Facets: " + ", ".join(f"{facet} {len(facet_index.values(facet))}" for facet in ("category", "year", "month", "deity")))
+    print(f"📦 Bundle: {manifest['count']} chunks, {len(manifest['sources'])} sources → {BUNDLE_DIR}")
 
     print("🎉 DONE – FAISS index built successfully!")
     print(f"📊 Total vectors: {len(vectors)}, Dimension: {dim}")
@@ -320,4 +376,8 @@ def build_index():
 
 if __name__ == "__main__":
     import re  # Import for regex in abhishekam chunking
-    build_index()
\ No newline at end of file
+    calendar_artifact = build_calendar_artifact()
+    print(f"📅 Calendar artifact: years {calendar_artifact['years']}, "
+          f"version {calendar_artifact['version'][:12]}")
+    print(f"🌙 Panchang table: {write_panchang_artifact()} days")
+    build_index(full="--full" in sys.argv[1:])
\ No newline at end of file
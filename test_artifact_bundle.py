@@ -0,0 +1,88 @@
+"""Tests for backend/artifact_bundle.py (prewarmed init artifacts)."""
+
+import json
+
+import pytest
+
+from backend import utility
+from backend.artifact_bundle import (
+    MANIFEST, FlatL2Index, load_tables, publish_staged, save_tables, write_bundle,
+)
+from backend.chunk_store import open_chunk_store
+
+META = [
+    {"id": 0, "source": "data_raw/Poojas/Abhishekam.txt", "text": "ABHISHEKAM - SACRED BATHING"},
+    {"id": 1, "source": "data_raw/Events/2026/jan.txt", "text": "Sankranti – Jan 14 🪔 Pongal"},
+    {"id": 2, "source": "data_raw/Poojas/Abhishekam.txt", "text": "1st Saturday - Sri Venkateswara: $151"},
+]
+
+
+def test_bundle_round_trips_meta(tmp_path):
+    manifest = write_bundle(META, None, tmp_path)
+    assert manifest["count"] == 3
+    assert manifest["sources"] == ["data_raw/Poojas/Abhishekam.txt", "data_raw/Events/2026/jan.txt"]
+
+    bundle = open_chunk_store(tmp_path)
+    assert len(bundle) == 3
+    assert list(bundle) == META
+    assert bundle[1]["text"] == "Sankranti – Jan 14 🪔 Pongal"
+    assert bundle[-1] == META[-1]
+    assert not bundle.has_vectors()
+    with pytest.raises(IndexError):
+        bundle[3]
+
+
+def test_missing_or_inconsistent_bundle_is_ignored(tmp_path):
+    assert open_chunk_store(tmp_path) is None
+
+    write_bundle(META, None, tmp_path)
+    manifest = json.loads((tmp_path / MANIFEST).read_text())
+    manifest["count"] = 5
+    (tmp_path / MANIFEST).write_text(json.dumps(manifest))
+    assert open_chunk_store(tmp_path) is None
+
+
+def test_publish_staged_swaps_every_output_in(tmp_path):
+    live, staging = tmp_path / "live", tmp_path / "staging"
+    write_bundle(META[:1], None, live / "bundle")
+    (live / "meta.json").parent.mkdir(exist_ok=True)
+    (live / "meta.json").write_text("old")
+
+    write_bundle(META, None, staging / "bundle")
+    (staging / "meta.json").write_text("new")
+    publish_staged(staging, {"meta.json": live / "meta.json"}, live / "bundle")
+
+    assert (live / "meta.json").read_text() == "new"
+    assert len(open_chunk_store(live / "bundle")) == 3
+    assert not staging.exists() and not (live / "bundle.old").exists()
+
+
+def test_tables_only_load_for_matching_fingerprint(tmp_path):
+    assert load_tables("abc", tmp_path) is None
+    save_tables({"x": (1, 2)}, "abc", tmp_path)
+    assert load_tables("abc", tmp_path) == {"x": (1, 2)}
+    assert load_tables("def", tmp_path) is None
+
+
+def test_precompiled_utility_tables_match_in_process_build(tmp_path):
+    utility.write_normalization_tables(tmp_path)
+    assert load_tables(utility.TABLES_FINGERPRINT, tmp_path) == utility._build_tables()
+
+
+def test_flat_l2_index_matches_brute_force(tmp_path):
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((50, 8)).astype("float32")
+    write_bundle([{"id": i, "source": "s", "text": f"chunk {i}"} for i in range(50)], vectors, tmp_path)
+
+    bundle = open_chunk_store(tmp_path)
+    index = FlatL2Index(bundle.vectors())
+    query = rng.standard_normal((1, 8)).astype("float32")
+    D, I = index.search(query, 5)
+
+    expected = ((vectors - query) ** 2).sum(axis=1)
+    assert list(I[0]) == list(np.argsort(expected)[:5])
+    assert np.allclose(D[0], np.sort(expected)[:5], atol=1e-4)
+
+    D, I = index.search(query, 60)
+    assert list(I[0][50:]) == [-1] * 10
@@ -0,0 +1,197 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.broadcast import BroadcastEngine, DynamoCheckpoint, FileCheckpoint
+from backend.graph_client import GraphClient, image_message
+from backend.rate_limit import TokenBucket
+from test_support.local_dynamodb import LocalTable
+
+
+# --------------------------------------------------
+# LOCAL STAND-IN FOR graph.facebook.com
+# --------------------------------------------------
+class FakeGraph:
+    """
+    Records every POST. `script` maps a recipient to the statuses it
+    returns on successive attempts; anything unscripted gets 200.
+    """
+
+    def __init__(self, script=None):
+        self.script = {k: list(v) for k, v in (script or {}).items()}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def respond(self, payload):
+        with self.lock:
+            self.requests.append(payload)
+            statuses = self.script.get(payload["to"])
+            return statuses.pop(0) if statuses else 200
+
+
+@pytest.fixture
+def graph():
+    fake = FakeGraph()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            payload = json.loads(self.rfile.read(length))
+            status = fake.respond(payload)
+            body = json.dumps({"messages": [{"id": "wamid.1"}]} if status == 200 else {"error": status})
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fake.base_url = f"http://127.0.0.1:{server.server_address[1]}/v22.0"
+    yield fake
+    server.shutdown()
+    server.server_close()
+
+
+def _engine(graph, **kwargs):
+    sender = GraphClient("PHONE", "TOKEN", base_url=graph.base_url)
+    kwargs.setdefault("rate", 1000)
+    kwargs.setdefault("backoff", 0.001)
+    return BroadcastEngine(sender, workers=4, **kwargs)
+
+
+def _payload(phone):
+    return image_message(phone, "https://example.org/e.jpg", "Event")
+
+
+PHONES = [f"1303555{i:04d}" for i in range(40)]
+
+
+# --------------------------------------------------
+# TESTS
+# --------------------------------------------------
+def test_sends_to_every_recipient_once(graph):
+    report = _engine(graph).run("evt", PHONES + PHONES[:5], _payload)
+
+    assert report.complete
+    assert report.delivered == len(PHONES)
+    assert sorted(r["to"] for r in graph.requests) == sorted(PHONES)
+    assert graph.requests[0]["image"]["link"] == "https://example.org/e.jpg"
+
+
+def test_retries_throttling_and_server_errors(graph):
+    graph.script = {PHONES[0]: [429, 200], PHONES[1]: [500, 503, 200], PHONES[2]: [400]}
+
+    report = _engine(graph).run("evt", PHONES[:3], _payload)
+
+    assert report.results[PHONES[0]].attempts == 2
+    assert report.results[PHONES[1]].attempts == 3
+    assert report.results[PHONES[1]].ok
+    # 4xx other than 429 is permanent
+    assert report.results[PHONES[2]].attempts == 1
+    assert not report.results[PHONES[2]].ok
+    assert (report.delivered, report.failed) == (2, 1)
+
+
+def test_gives_up_after_max_retries(graph):
+    graph.script = {PHONES[0]: [503] * 10}
+
+    report = _engine(graph, max_retries=2).run("evt", PHONES[:1], _payload)
+
+    result = report.results[PHONES[0]]
+    assert (result.ok, result.status, result.attempts) == (False, 503, 3)
+    assert report.complete
+
+
+def test_deadline_checkpoints_and_resumes(graph, tmp_path):
+    checkpoint = FileCheckpoint(tmp_path)
+    clock = {"t": 0.0}
+    sent = []
+
+    client = GraphClient("PHONE", "TOKEN", base_url=graph.base_url)
+
+    def send_until_deadline(payload):
+        sent.append(payload["to"])
+        if len(sent) >= 10:
+            clock["t"] = 100.0
+        return client.post(payload)
+
+    first = BroadcastEngine(
+        send_until_deadline, workers=1, rate=1000, checkpoint=checkpoint,
+        clock=lambda: clock["t"],
+    ).run("evt", PHONES, _payload, deadline=50.0)
+
+    assert not first.complete
+    assert first.delivered == 10
+    assert len(checkpoint.load("evt")) == 10
+
+    second = _engine(graph, checkpoint=checkpoint).run("evt", PHONES, _payload)
+
+    assert second.complete
+    assert second.resumed == 10
+    assert len(second.results) == len(PHONES) - 10
+    assert second.delivered == len(PHONES)
+    assert sorted(r["to"] for r in graph.requests) == sorted(PHONES)
+
+
+def test_dynamo_checkpoint_appends_bounded_chunks(graph):
+    table = LocalTable("temple-events", "event_hash")
+    checkpoint = DynamoCheckpoint(table)
+
+    report = _engine(graph, checkpoint=checkpoint).run("evt", PHONES, _payload)
+    assert report.complete
+
+    # each item holds one save's worth of recipients, never the whole run
+    chunks = [json.loads(item["done"]) for key, item in table.items.items() if key.count("#") == 2]
+    assert len(chunks) == 2 and sum(len(c) for c in chunks) == len(PHONES)
+    assert table.items["broadcast-checkpoint#evt"]["chunks"] == 2
+    assert checkpoint.load("evt") == report.done
+
+    checkpoint.clear("evt")
+    assert checkpoint.load("evt") == {} and not table.items
+
+
+def test_checkpoint_failure_does_not_abort_the_broadcast(graph, tmp_path):
+    class Flaky(FileCheckpoint):
+        calls = 0
+
+        def save(self, run_id, finished):
+            Flaky.calls += 1
+            if Flaky.calls == 1:
+                raise RuntimeError("ValidationException: Item size has exceeded the maximum allowed size")
+            super().save(run_id, finished)
+
+    checkpoint = Flaky(tmp_path)
+    report = _engine(graph, checkpoint=checkpoint).run("evt", PHONES, _payload)
+
+    assert report.complete and report.delivered == len(PHONES)
+    # the failed chunk is carried into the next save
+    assert checkpoint.load("evt") == report.done
+
+
+def test_token_bucket_limits_rate():
+    clock = {"t": 0.0}
+    waits = []
+
+    def sleep(s):
+        waits.append(s)
+        clock["t"] += s
+
+    bucket = TokenBucket(rate=10, capacity=1, clock=lambda: clock["t"], sleep=sleep)
+    for _ in range(5):
+        bucket.acquire()
+
+    # first token is free, the next four wait 0.1 s each
+    assert clock["t"] == pytest.approx(0.4)
+
+    bucket.pause(2.0)
+    bucket.acquire()
+    # the pause refills the bucket, but nothing goes out before it ends
+    assert clock["t"] == pytest.approx(2.4)
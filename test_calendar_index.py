@@ -0,0 +1,60 @@
+from datetime import date
+
+from backend.calendar_index import CALENDAR_INDEX, CalendarIndex
+from backend.calender_2026 import CALENDAR_2026
+
+SAMPLE = {
+    "january": {
+        3: {"abhishekam": ["Sri Siva Abhishekam"], "festival": ["Bhogi"]},
+        10: {"abhishekam": ["Sri Venkateswara Abhishekam"]},
+    },
+    "february": {
+        7: {"abhishekam": ["Sri Siva Abhishekam"], "kalyanam": ["Sri Andal Kalyanam"]},
+    },
+}
+
+
+def test_events_on_matches_calendar_shape():
+    index = CalendarIndex({2026: SAMPLE})
+    assert index.events_on(date(2026, 1, 3), include_holidays=False) == SAMPLE["january"][3]
+    assert index.events_on(date(2026, 1, 4), include_holidays=False) == {}
+
+
+def test_events_on_adds_federal_holiday():
+    index = CalendarIndex({2026: SAMPLE})
+    assert index.events_on(date(2026, 1, 1)) == {"holiday": ["New Year’s Day"]}
+
+
+def test_find_by_category_and_deity():
+    index = CalendarIndex({2026: SAMPLE})
+    found = index.find(date(2026, 1, 1), date(2026, 12, 31), category="abhishekam", deity="SIVA")
+    assert [d for d, _, _ in found] == [date(2026, 1, 3), date(2026, 2, 7)]
+    assert index.find(date(2026, 1, 4), date(2026, 2, 6), category="abhishekam", deity="siva") == []
+
+
+def test_next_occurrences_dedupes_dates():
+    index = CalendarIndex({2026: SAMPLE})
+    assert index.next_occurrences(date(2026, 1, 4), 5) == [date(2026, 1, 10), date(2026, 2, 7)]
+    assert index.next_occurrences(date(2026, 1, 1), 1, category="kalyanam") == [date(2026, 2, 7)]
+
+
+def test_unknown_category_is_empty():
+    index = CalendarIndex({2026: SAMPLE})
+    assert index.find(date(2026, 1, 1), date(2026, 12, 31), category="homam", deity="x") == []
+
+
+def test_index_covers_every_calendar_entry():
+    total = sum(
+        len(names)
+        for days in CALENDAR_2026.values()
+        for info in days.values()
+        for names in info.values()
+    )
+    assert len(CALENDAR_INDEX.find(date(2026, 1, 1), date(2026, 12, 31))) == total
+
+
+def test_days_with_events_includes_holidays():
+    index = CalendarIndex({2026: SAMPLE})
+    assert index.days_with_events(date(2026, 1, 1), date(2026, 1, 31)) == [
+        date(2026, 1, 1), date(2026, 1, 3), date(2026, 1, 10),
+    ]
@@ -0,0 +1,89 @@
+import json
+from datetime import date
+
+from backend.calendar_index import CALENDAR_INDEX, CALENDAR_VERSION
+from backend.calendar_ingest import (
+    CALENDAR_ARTIFACT_PATH,
+    collect_calendars,
+    make_artifact,
+    parse_events_text,
+    split_title,
+)
+
+HEADLINES = """
+IMPORTANT EVENTS OF THE MONTH
+
+Jan 13 - Bhogi / Sri Goda (Andal) Kalyanam
+Jan 14 - Makara Sankranti / Pongal
+"""
+
+BLOCKS = """
+Saturday, Jan 4, 11:00 AM
+- Sri Venkateswara Swamy Abhishekam (Moola Murthy)
+- Sponsorship: $51
+- Special Event: Bhogi
+
+Sunday, Jan 26, 11:00 AM
+- Sri Sudarsana/Narasimha Homam & Abhishekam
+
+Full Moon Day - Sunday/Monday, May 11-12, 2025 at 06:30 PM
+- Sri Satyanarayana Swamy Pooja and Vratam
+
+Every Day:
+- 09:00 AM: Sri Venkateswara Suprabhata Seva
+"""
+
+LONG_FORM = """
+NOVEMBER 2ND, 2025 - SRI TULASI KALYANAM
+
+Date: Sunday, November 2, 2025
+- November 10, 2025 - Karthika Somavara Siva Abhishekam
+"""
+
+
+def test_split_title():
+    assert split_title("Bhogi / Sri Goda (Andal) Kalyanam") == [
+        ("festival", "Bhogi"),
+        ("kalyanam", "Sri Goda (Andal) Kalyanam"),
+    ]
+    assert split_title("Sri Sudarsana / Narasimha Homam") == [
+        ("homam", "Sri Sudarsana / Narasimha Homam"),
+    ]
+
+
+def test_parse_headlines():
+    parsed = parse_events_text(HEADLINES, 2025)
+    assert parsed["january"][13] == {
+        "festival": ["Bhogi"],
+        "kalyanam": ["Sri Goda (Andal) Kalyanam"],
+    }
+    assert parsed["january"][14] == {"festival": ["Makara Sankranti / Pongal"]}
+
+
+def test_parse_dated_blocks():
+    parsed = parse_events_text(BLOCKS, 2025)
+    assert parsed["january"][4] == {"abhishekam": ["Sri Venkateswara Swamy Abhishekam (Moola Murthy)"]}
+    assert parsed["january"][26] == {
+        "homam": ["Sri Sudarsana/Narasimha Homam"],
+        "abhishekam": ["Sri Sudarsana/Narasimha Abhishekam"],
+    }
+    assert parsed["may"][11] == {"satyanarayana": ["Sri Satyanarayana Swamy Pooja and Vratam"]}
+    assert set(parsed) == {"january", "may"}
+
+
+def test_parse_long_form():
+    parsed = parse_events_text(LONG_FORM, 2025)
+    assert parsed == {"november": {2: {"kalyanam": ["Sri Tulasi Kalyanam"]}}}
+
+
+def test_every_year_on_disk_is_indexed():
+    assert {2025, 2026} <= set(CALENDAR_INDEX.years)
+    assert CALENDAR_INDEX.events_on(date(2025, 11, 2))["kalyanam"] == ["Sri Tulasi Kalyanam"]
+
+
+def test_committed_artifact_is_current():
+    """Rebuild with `python -m backend.calendar_ingest` if this fails."""
+    with open(CALENDAR_ARTIFACT_PATH, encoding="utf-8") as f:
+        committed = json.load(f)
+    assert committed["version"] == make_artifact(collect_calendars())["version"]
+    assert CALENDAR_VERSION == committed["version"]
@@ -0,0 +1,85 @@
+"""Tests for backend/chunk_facets.py (facet extraction + pre-partitioned filters)."""
+
+import pytest
+
+from backend.chunk_facets import FacetIndex, extract_facets, load_or_build
+from backend.chunk_store import ChunkStore
+from backend.lexical_index import LexicalIndex
+
+META = [
+    {"source": "data_raw\\Panchang\\2026\\march_2026_panchang.txt",
+     "text": "Mar 3 (Tue): Tithi: Purnima 6:38 AM | Event: Full moon Satyanarayana Pooja"},
+    {"source": "data_raw\\Panchang\\2026\\april_2026_panchang.txt",
+     "text": "Apr 1 (Wed): Tithi: Purnima 8:12 PM | Event: Full moon Satyanarayana Pooja"},
+    {"source": "data_raw\\Events\\2025\\Fullmoon\\Purnima_dates_2025.txt",
+     "text": "March 2025:\n- Purnima: March 14th (Friday)\n- Hanuman Chalisa after the full moon pooja"},
+    {"source": "data_raw\\Poojas\\Abhishekam.txt",
+     "text": "May the blessings of Sri Venkateswara be with you. Anjaneya Abhishekam on Saturdays."},
+]
+
+
+def _facets():
+    return [extract_facets(m["source"], m["text"]) for m in META]
+
+
+def test_extract_facets_from_path_and_text():
+    panchang, _, events, pooja = _facets()
+    assert panchang == {
+        "source": ["data_raw/Panchang/2026/march_2026_panchang.txt"],
+        "category": ["panchang"], "year": ["2026"], "month": ["march"], "deity": [],
+    }
+    assert events["year"] == ["2025"] and events["month"] == ["march"]
+    assert events["deity"] == ["hanuman"]
+    # "May" as a word is not a month; aliases map to the canonical deity
+    assert pooja["month"] == [] and pooja["year"] == []
+    assert pooja["deity"] == ["hanuman", "vishnu"]
+
+
+def test_select_ands_facets_and_ors_values():
+    index = FacetIndex.build(_facets())
+    assert index.select({"month": "March"}) == [0, 2]
+    assert index.select({"month": "march", "year": 2026}) == [0]
+    assert index.select({"month": ["march", "april"], "category": "panchang"}) == [0, 1]
+    assert index.select({"source": "data_raw/Poojas/Abhishekam.txt"}) == [3]
+    assert index.select({"month": "june"}) == []
+    assert index.select({}) is None
+    with pytest.raises(ValueError):
+        index.select({"colour": "red"})
+
+
+def test_filtered_lexical_search_only_ranks_the_partition():
+    texts = [m["text"] for m in META]
+    index = FacetIndex.build(_facets())
+    lexical = LexicalIndex.build(texts)
+
+    assert 1 in [h.id for h in lexical.search("full moon purnima", k=3)]
+
+    march = frozenset(index.select({"month": "march"}))
+    hits = lexical.search("full moon purnima", k=3, allowed=march)
+    assert sorted(h.id for h in hits) == [0, 2]
+
+
+def test_save_load_round_trip_and_staleness(tmp_path):
+    store = ChunkStore.from_meta([{"id": i, **m} for i, m in enumerate(META)])
+    path = tmp_path / "facets.idx"
+
+    FacetIndex.build(_facets(), store.manifest["chunks_sha256"]).save(path)
+    loaded = load_or_build(store, path)
+    assert loaded.chunks_sha256 == store.manifest["chunks_sha256"]
+    assert loaded.select({"deity": "hanuman"}) == [2, 3]
+
+    # built from other chunks: ignored and rebuilt from the store
+    FacetIndex.build(_facets()[:2], "other").save(path)
+    rebuilt = load_or_build(store, path)
+    assert rebuilt.count == 4 and rebuilt.select({"year": "2025"}) == [2]
+
+
+def test_flat_index_searches_only_the_given_ids():
+    np = pytest.importorskip("numpy")
+    from backend.artifact_bundle import FlatL2Index
+
+    vectors = np.array([[0, 0], [1, 0], [5, 5], [0, 1]], dtype="float32")
+    index = FlatL2Index(vectors)
+    D, I = index.search(np.array([[0, 0]], dtype="float32"), 3, ids=[2, 3])
+    assert I.tolist() == [[3, 2, -1]]
+    assert D[0][:2].tolist() == [1.0, 50.0]
@@ -0,0 +1,64 @@
+"""Tests for backend/chunk_store.py."""
+
+from backend.artifact_bundle import write_bundle
+from backend.chunk_store import ChunkStore, open_chunk_store
+
+META = [
+    {"id": 0, "source": "a.txt", "text": "Hanuman Abhishekam on the 4th Saturday"},
+    {"id": 1, "source": "b.txt", "text": "Sri Venkateswara Kalyanam"},
+    {"id": 2, "source": "a.txt", "text": "ABHISHEKAM sponsorship $151 – İstanbul"},
+    {"id": 3, "source": "c.txt", "text": "hanu"},
+    {"id": 4, "source": "c.txt", "text": "man festival"},
+]
+
+
+def legacy(meta, keywords, k):
+    out = []
+    for item in meta:
+        low = item["text"].lower()
+        if all(kw.lower() in low for kw in keywords):
+            out.append(item)
+            if len(out) >= k:
+                break
+    return out
+
+
+def stores(tmp_path):
+    write_bundle(META, None, tmp_path)
+    return [open_chunk_store(tmp_path), ChunkStore.from_meta(META)]
+
+
+def test_views_behave_like_meta_dicts(tmp_path):
+    for store in stores(tmp_path):
+        view = store[2]
+        assert view["text"] == META[2]["text"]
+        assert view.get("source") == "a.txt"
+        assert view.get("missing", "x") == "x"
+        assert view["id"] == 2 and view.text == META[2]["text"]
+        assert dict(view) == META[2]
+        assert view == META[2]
+        assert list(store) == META
+
+
+def test_sources_are_interned(tmp_path):
+    store = stores(tmp_path)[0]
+    assert store.sources == ["a.txt", "b.txt", "c.txt"]
+    assert store[0]["source"] is store[2]["source"]
+
+
+def test_find_all_matches_legacy_keyword_search(tmp_path):
+    cases = [
+        ["abhishekam"], ["hanuman", "saturday"], ["kalyanam", "hanuman"],
+        ["istanbul"], ["i̇stanbul"], [], ["hanuman"], ["SPONSORSHIP"],
+    ]
+    for store in stores(tmp_path):
+        for keywords in cases:
+            for k in (1, 5):
+                got = [c["id"] for c in store.find_all(keywords, k)]
+                assert got == [c["id"] for c in legacy(META, keywords, k)], keywords
+
+
+def test_match_across_chunk_boundary_is_not_a_hit(tmp_path):
+    # "hanu" + "man festival" are adjacent in the blob
+    for store in stores(tmp_path):
+        assert [c["id"] for c in store.find_all(["hanuman"], 10)] == [0]
@@ -0,0 +1,92 @@
+"""Tests for backend/dedupe_store.py (webhook message-id dedupe)."""
+
+import pytest
+
+from backend.dedupe_store import DynamoDedupeStore, MessageDedupe, TTLSet
+from test_support.local_dynamodb import LocalTable
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_set_expires_and_bounds():
+    clock = FakeClock()
+    s = TTLSet(ttl=10, max_size=3, clock=clock)
+    assert s.add("a")
+    assert not s.add("a")
+
+    clock.now = 11
+    assert "a" not in s
+    assert s.add("a")
+
+    for key in "bcd":
+        s.add(key)
+    assert len(s) == 3
+    assert "a" not in s   # oldest evicted
+
+
+def test_redelivery_dropped_across_containers():
+    table = LocalTable("temple-events", "event_hash")
+    wall = FakeClock(1_700_000_000)
+    # two warm containers: separate local sets, one table
+    first = MessageDedupe(DynamoDedupeStore(table, wall_clock=wall))
+    second = MessageDedupe(DynamoDedupeStore(table, wall_clock=wall))
+
+    assert first.claim("wamid.1")
+    assert not first.claim("wamid.1")
+    assert not second.claim("wamid.1")
+    assert second.claim("wamid.2")
+    assert table.items["wamid#wamid.1"]["ttl"] > wall.now
+
+
+def test_warm_repeat_skips_the_table():
+    table = LocalTable("temple-events", "event_hash")
+    dedupe = MessageDedupe(DynamoDedupeStore(table))
+    dedupe.claim("wamid.1")
+    calls = len(table.calls)
+    assert not dedupe.claim("wamid.1")
+    assert len(table.calls) == calls
+
+
+def test_expired_marker_can_be_claimed_again():
+    table = LocalTable("temple-events", "event_hash")
+    wall = FakeClock(1_700_000_000)
+    store = DynamoDedupeStore(table, ttl_secs=60, wall_clock=wall)
+
+    assert store.put_if_absent("wamid.1")
+    assert not store.put_if_absent("wamid.1")
+    # DynamoDB TTL has not deleted the item yet
+    wall.now += 61
+    assert store.put_if_absent("wamid.1")
+
+
+def test_release_lets_retry_through():
+    table = LocalTable("temple-events", "event_hash")
+    dedupe = MessageDedupe(DynamoDedupeStore(table))
+    assert dedupe.claim("wamid.1")
+    dedupe.release("wamid.1")
+    assert dedupe.claim("wamid.1")
+
+
+def test_store_outage_fails_open():
+    class Broken:
+        def put_item(self, **kwargs):
+            raise ConnectionError("dynamodb down")
+
+    dedupe = MessageDedupe(DynamoDedupeStore(Broken()))
+    assert dedupe.claim("wamid.1")
+    assert not dedupe.claim("wamid.1")   # still deduped locally
+
+
+def test_other_table_errors_propagate_from_store():
+    class Broken:
+        def put_item(self, **kwargs):
+            raise ConnectionError("dynamodb down")
+
+    with pytest.raises(ConnectionError):
+        DynamoDedupeStore(Broken()).put_if_absent("wamid.1")
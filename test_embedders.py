@@ -0,0 +1,95 @@
+"""Tests for backend/embedders.py (pluggable embedding backends)."""
+
+import io
+import json
+import math
+
+import pytest
+
+from backend.artifact_bundle import write_bundle
+from backend.chunk_store import ChunkStore, open_chunk_store
+from backend.embedders import (
+    BedrockCohereEmbedder, BedrockTitanEmbedder, EmbedderMismatchError, LocalHashEmbedder,
+    check_index_embedder, get_embedder,
+)
+from backend.embedding_pipeline import EmbeddingPipeline
+
+
+class RecordingClient:
+    """bedrock-runtime client double: records invoke_model calls, answers with fixed vectors."""
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke_model(self, modelId, body, contentType):
+        body = json.loads(body)
+        self.calls.append((modelId, body))
+        if "texts" in body:
+            payload = {"embeddings": [[float(len(t)), 0.0] for t in body["texts"]]}
+        else:
+            payload = {"embedding": [float(len(body["inputText"])), 1.0]}
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+
+def _distance(a, b):
+    return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+def test_local_embedder_is_deterministic_normalized_and_topical():
+    embedder = LocalHashEmbedder(dim=256)
+    hanuman = embedder.embed_query("Hanuman Abhishekam on the 4th Saturday")
+    assert hanuman == LocalHashEmbedder(dim=256).embed_query("Hanuman Abhishekam on the 4th Saturday")
+    assert len(hanuman) == 256
+    assert sum(x * x for x in hanuman) == pytest.approx(1.0)
+
+    query = embedder.embed_query("when is hanuman abhishekam")
+    other = embedder.embed_query("Temple cafeteria lunch menu and timings")
+    assert _distance(query, hanuman) < _distance(query, other)
+    assert embedder.embed_query("the of and") == [0.0] * 256
+    assert embedder.id == "local-hash:v1-256" and not embedder.remote
+
+
+def test_cohere_separates_document_and_query_input_types():
+    client = RecordingClient()
+    embedder = BedrockCohereEmbedder(client=client)
+    assert embedder.embed(["Om", "x" * 3000]) == [[2.0, 0.0], [2000.0, 0.0]]
+    assert embedder.embed_query("when is ugadi") == [13.0, 0.0]
+    assert [body["input_type"] for _, body in client.calls] == ["search_document", "search_query"]
+    assert embedder.id == "bedrock-cohere:cohere.embed-english-v3"
+
+
+def test_titan_runs_one_text_per_request_through_the_pipeline():
+    client = RecordingClient()
+    embedder = BedrockTitanEmbedder(client=client)
+    pipeline = EmbeddingPipeline(embedder, workers=2, rate=1000)
+    assert pipeline.embed(["a", "bb", "ccc"]) == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+    assert sorted(body["inputText"] for _, body in client.calls) == ["a", "bb", "ccc"]
+    assert {model for model, _ in client.calls} == {"amazon.titan-embed-text-v2:0"}
+
+
+def test_get_embedder_selects_by_name():
+    assert isinstance(get_embedder("local"), LocalHashEmbedder)
+    assert isinstance(get_embedder("Titan", client=RecordingClient()), BedrockTitanEmbedder)
+    assert isinstance(get_embedder("cohere", client=RecordingClient()), BedrockCohereEmbedder)
+    with pytest.raises(ValueError):
+        get_embedder("word2vec")
+
+
+def test_index_embedder_mismatch_is_caught_at_load(tmp_path):
+    local = LocalHashEmbedder(dim=64)
+    meta = [{"id": 0, "source": "s", "text": "Ugadi"}]
+
+    write_bundle(meta, None, tmp_path, embedder=local.id)
+    store = open_chunk_store(tmp_path)
+    check_index_embedder(store.manifest["embedder"], local, 64)
+
+    with pytest.raises(EmbedderMismatchError):
+        check_index_embedder(store.manifest["embedder"], BedrockCohereEmbedder(client=RecordingClient()))
+    with pytest.raises(EmbedderMismatchError):
+        check_index_embedder(store.manifest["embedder"], local, 1024)
+
+    # indexes from before the embedder was recorded were built with Cohere
+    legacy = ChunkStore.from_meta(meta)
+    check_index_embedder(legacy.manifest["embedder"], BedrockCohereEmbedder(client=RecordingClient()), 1024)
+    with pytest.raises(EmbedderMismatchError):
+        check_index_embedder(legacy.manifest["embedder"], local)
@@ -0,0 +1,72 @@
+import pytest
+
+from backend.embedding_cache import EmbeddingCache, make_cache_key
+
+MODEL_ID = "cohere.embed-english-v3"
+
+
+# --------------------------------------------------
+# FAKE EMBEDDER (COUNTS CALLS)
+# --------------------------------------------------
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return [float(len(text)), 0.5, -1.25]
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "embed_cache.sqlite3")
+
+
+def test_key_ignores_case_and_spacing():
+    a = make_cache_key(MODEL_ID, "search_query", "What is  Ekadasi")
+    b = make_cache_key(MODEL_ID, "search_query", "what is ekadasi ")
+    assert a == b
+
+
+def test_key_separates_model_and_input_type():
+    base = make_cache_key(MODEL_ID, "search_query", "what is ekadasi")
+    assert base != make_cache_key(MODEL_ID, "search_document", "what is ekadasi")
+    assert base != make_cache_key("amazon.titan-embed-text-v2:0", "search_query", "what is ekadasi")
+
+
+def test_repeated_query_skips_embedding(cache_path):
+    cache = EmbeddingCache(path=cache_path)
+    embed = FakeEmbedder()
+
+    v1, info1 = cache.get_or_embed(MODEL_ID, "search_query", "what is ekadasi", embed)
+    v2, info2 = cache.get_or_embed(MODEL_ID, "search_query", "What is Ekadasi", embed)
+
+    assert embed.calls == 1
+    assert v1 == v2
+    assert info1["source"] == "bedrock"
+    assert info2["source"] == "memory"
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_disk_layer_survives_new_process(cache_path):
+    embed = FakeEmbedder()
+    EmbeddingCache(path=cache_path).get_or_embed(MODEL_ID, "search_query", "temple hours", embed)
+
+    # Simulates a cold start: empty memory, same SQLite file
+    fresh = EmbeddingCache(path=cache_path)
+    vector, info = fresh.get_or_embed(MODEL_ID, "search_query", "temple hours", embed)
+
+    assert embed.calls == 1
+    assert info["source"] == "disk"
+    assert vector == [12.0, 0.5, -1.25]
+
+
+def test_lru_evicts_oldest_in_memory():
+    cache = EmbeddingCache(path=None, max_items=2)
+    embed = FakeEmbedder()
+
+    for q in ["a query", "b query", "c query"]:
+        cache.get_or_embed(MODEL_ID, "search_query", q, embed)
+
+    cache.get_or_embed(MODEL_ID, "search_query", "a query", embed)
+    assert embed.calls == 4
@@ -0,0 +1,97 @@
+"""Tests for backend/embedding_manifest.py (incremental document embedding)."""
+
+import pytest
+
+from backend.embedding_manifest import EmbeddingManifest, content_hash, embed_incremental
+
+MODEL, INPUT_TYPE = "cohere.embed-english-v3", "search_document"
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), float(sum(map(ord, t)) % 97), 1.0] for t in texts]
+
+
+def _corpus():
+    texts = ["Ugadi on March 19", "Rama Navami on March 26", "Temple hours 9-12",
+             "Hanuman Jayanthi in May", "Diwali in October"]
+    sources = ["events/march.txt", "events/march.txt", "info.txt", "events/may.txt", "events/oct.txt"]
+    return texts, sources
+
+
+def test_first_build_embeds_everything_in_batches():
+    texts, sources = _corpus()
+    manifest = EmbeddingManifest(MODEL, INPUT_TYPE)
+    embed = FakeEmbedder()
+
+    vectors, diff = embed_incremental(texts, sources, manifest, embed, batch_size=2)
+    assert [len(batch) for batch in embed.calls] == [2, 2, 1]
+    assert [list(v) for v in vectors] == [v for batch in embed.calls for v in FakeEmbedder()(batch)]
+    assert diff.chunks_embedded == 5 and diff.chunks_reused == 0
+    assert diff.files_added == ["events/march.txt", "events/may.txt", "events/oct.txt", "info.txt"]
+    assert diff.calls == 3 and diff.calls_saved == 0
+
+
+def test_rebuild_embeds_only_new_text_and_drops_removed(tmp_path):
+    texts, sources = _corpus()
+    path = tmp_path / "embeddings.marshal"
+    manifest = EmbeddingManifest(MODEL, INPUT_TYPE)
+    first, _ = embed_incremental(texts, sources, manifest, FakeEmbedder(), batch_size=2)
+    manifest.save(path)
+
+    # one chunk edited, one file deleted, one chunk added
+    texts2 = ["Ugadi on March 19", "Rama Navami on March 27", "Temple hours 9-12",
+              "Diwali in October", "Holi on March 2"]
+    sources2 = ["events/march.txt", "events/march.txt", "info.txt", "events/oct.txt", "events/march.txt"]
+    manifest = EmbeddingManifest.load(MODEL, INPUT_TYPE, path)
+    embed = FakeEmbedder()
+    vectors, diff = embed_incremental(texts2, sources2, manifest, embed, batch_size=2)
+
+    assert embed.calls == [["Rama Navami on March 27", "Holi on March 2"]]
+    assert vectors[0] == first[0] and vectors[3] == first[4]
+    assert diff.files_changed == ["events/march.txt"]
+    assert diff.files_removed == ["events/may.txt"] and diff.files_added == []
+    assert (diff.chunks_reused, diff.chunks_embedded, diff.chunks_removed) == (3, 2, 2)
+    assert diff.calls == 1 and diff.calls_saved == 2
+
+    # removed texts are no longer kept
+    assert content_hash("Hanuman Jayanthi in May") not in manifest
+    assert len(manifest.vectors) == 5
+
+
+def test_duplicate_texts_are_embedded_once():
+    manifest = EmbeddingManifest(MODEL, INPUT_TYPE)
+    embed = FakeEmbedder()
+    vectors, diff = embed_incremental(["Om", "Om", "Namah"], ["a", "b", "a"], manifest, embed)
+    assert embed.calls == [["Om", "Namah"]]
+    assert vectors[0] == vectors[1]
+    assert diff.chunks_embedded == 2
+
+
+def test_manifest_for_another_model_is_ignored(tmp_path):
+    path = tmp_path / "embeddings.marshal"
+    manifest = EmbeddingManifest(MODEL, INPUT_TYPE)
+    manifest.put(content_hash("Om"), [1.0, 2.0])
+    manifest.save(path)
+
+    assert content_hash("Om") in EmbeddingManifest.load(MODEL, INPUT_TYPE, path)
+    assert len(EmbeddingManifest.load("amazon.titan-embed-text-v2:0", INPUT_TYPE, path).vectors) == 0
+    assert len(EmbeddingManifest.load(MODEL, INPUT_TYPE, tmp_path / "missing").vectors) == 0
+
+
+def test_failed_batch_keeps_vectors_already_embedded():
+    manifest = EmbeddingManifest(MODEL, INPUT_TYPE)
+    embed = FakeEmbedder()
+
+    def flaky(texts):
+        if len(embed.calls) == 1:
+            raise RuntimeError("ThrottlingException")
+        return embed(texts)
+
+    with pytest.raises(RuntimeError):
+        embed_incremental(["a", "b", "c"], ["s", "s", "s"], manifest, flaky, batch_size=2)
+    assert content_hash("a") in manifest and content_hash("c") not in manifest
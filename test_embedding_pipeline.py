@@ -0,0 +1,138 @@
+"""Tests for backend/embedding_pipeline.py (parallel, rate-limited embedding)."""
+
+import threading
+import time
+from array import array
+
+import pytest
+
+from backend.embedding_manifest import EmbeddingManifest, embed_incremental
+from backend.embedding_pipeline import EmbeddingError, EmbeddingPipeline
+from test_support.fake_embedder import FakeEmbedder, FakeThrottle
+
+
+class FakeTime:
+    """Clock advanced only by sleep(), so backoff and rate limiting cost no real time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+def _pipeline(backend, **kwargs):
+    t = FakeTime()
+    kwargs.setdefault("rate", 1000)
+    return EmbeddingPipeline(backend, sleep=t.sleep, clock=t.clock, **kwargs), t
+
+
+TEXTS = [f"chunk {i}: Sri Venkateswara Swamy temple" for i in range(50)]
+
+
+def test_results_come_back_in_input_order():
+    class SlowFirst(FakeEmbedder):
+        # earlier batches finish last
+        def embed(self, texts):
+            time.sleep(0.02 if texts[0] == TEXTS[0] else 0.0)
+            return super().embed(texts)
+
+    backend = SlowFirst(max_batch=4)
+    pipeline, _ = _pipeline(backend, workers=4, initial_batch=4)
+    assert pipeline.embed(TEXTS) == [FakeEmbedder.vector(t) for t in TEXTS]
+    assert sum(len(r) for r in backend.requests) == len(TEXTS)
+
+
+def test_batch_size_grows_to_the_backend_limit():
+    backend = FakeEmbedder(max_batch=8)
+    pipeline, _ = _pipeline(backend, workers=1, initial_batch=2)
+    pipeline.embed(TEXTS[:30])
+    assert [len(r) for r in backend.requests] == [2, 4, 8, 8, 8]
+    assert pipeline.stats().requests == 5
+
+
+def test_throttling_is_retried_with_backoff_and_shrinks_batches():
+    backend = FakeEmbedder(max_batch=8, throttle=2)
+    pipeline, t = _pipeline(backend, workers=1, initial_batch=8, backoff=1.0)
+    progress = []
+
+    vectors = pipeline.embed(TEXTS[:20], on_batch=lambda done, total: progress.append(done))
+    assert vectors == [FakeEmbedder.vector(x) for x in TEXTS[:20]]
+    # 8 throttled twice (size 8 -> 4 -> 2), retried as is, then 4 -> 8 again
+    assert [len(r) for r in backend.requests] == [8, 8, 8, 4, 8]
+    assert progress == [8, 12, 20]
+
+    stats = pipeline.stats()
+    assert (stats.retries, stats.throttled) == (2, 2)
+    # exponential backoff with jitter in [0.5, 1.0] of 1s, 2s
+    backoffs = [s for s in t.sleeps if s >= 0.5]
+    assert 0.5 <= backoffs[0] <= 1.0 and 1.0 <= backoffs[1] <= 2.0
+
+
+def test_gives_up_after_max_retries():
+    backend = FakeEmbedder(throttle=10)
+    pipeline, _ = _pipeline(backend, workers=2, max_retries=2)
+    with pytest.raises(EmbeddingError) as err:
+        pipeline.embed(TEXTS[:5])
+    assert isinstance(err.value.__cause__, FakeThrottle)
+    assert len(backend.requests) == 3
+
+
+def test_non_retryable_errors_fail_fast():
+    class Broken(FakeEmbedder):
+        def embed(self, texts):
+            self.requests.append(texts)
+            raise ValueError("ValidationException: input too long")
+
+    backend = Broken()
+    pipeline, t = _pipeline(backend, workers=1)
+    with pytest.raises(EmbeddingError):
+        pipeline.embed(TEXTS[:3])
+    assert len(backend.requests) == 1 and not t.sleeps
+
+
+def test_drives_incremental_build():
+    backend = FakeEmbedder(max_batch=16)
+    pipeline, _ = _pipeline(backend, workers=3, initial_batch=16)
+    manifest = EmbeddingManifest(backend.model_id, "search_document")
+
+    vectors, diff = embed_incremental(TEXTS, ["s"] * len(TEXTS), manifest, pipeline.embed,
+                                      batch_size=16, checkpoint_every=32)
+    assert vectors == [array("f", FakeEmbedder.vector(x)) for x in TEXTS]
+    assert diff.chunks_embedded == 50 and diff.calls == 4
+
+
+def test_botocore_network_errors_are_retried():
+    # shaped like botocore.exceptions: none subclass the built-in ConnectionError
+    class BotoCoreError(Exception):
+        pass
+
+    class HTTPClientError(BotoCoreError):
+        pass
+
+    class ReadTimeoutError(HTTPClientError):
+        pass
+
+    class EndpointConnectionError(BotoCoreError):
+        pass
+
+    class Flaky(FakeEmbedder):
+        errors = [ReadTimeoutError(), EndpointConnectionError()]
+
+        def embed(self, texts):
+            if self.errors:
+                self.requests.append(texts)
+                raise self.errors.pop(0)
+            return super().embed(texts)
+
+    backend = Flaky()
+    pipeline, _ = _pipeline(backend, workers=1)
+    assert pipeline.embed(TEXTS[:3]) == [FakeEmbedder.vector(x) for x in TEXTS[:3]]
+    assert pipeline.stats().retries == 2
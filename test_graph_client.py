@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.graph_client import GraphClient
+
+
+@pytest.fixture
+def graph():
+    state = {"ports": set(), "requests": [], "status": 200, "delay": 0.0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+
+        def do_POST(self):
+            state["ports"].add(self.client_address[1])
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            state["requests"].append((self.path, self.headers["Authorization"], payload))
+            time.sleep(state["delay"])
+
+            status = state["status"]
+            if status == 200:
+                body = {"messages": [{"id": f"wamid.{len(state['requests'])}"}]}
+            else:
+                body = {"error": {"message": "Invalid parameter", "code": 100}}
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["base_url"] = f"http://127.0.0.1:{server.server_address[1]}/v22.0"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_sends_reuse_one_connection(graph):
+    client = GraphClient("PHONE", "TOKEN", base_url=graph["base_url"])
+
+    results = [client.send_text("13035550000", f"hello {i}") for i in range(5)]
+
+    assert all(r["ok"] for r in results)
+    assert results[-1]["message_id"] == "wamid.5"
+    assert len(graph["ports"]) == 1
+    path, auth, payload = graph["requests"][0]
+    assert path == "/v22.0/PHONE/messages"
+    assert auth == "Bearer TOKEN"
+    assert payload["text"]["body"] == "hello 0"
+
+
+def test_error_result_is_structured(graph):
+    graph["status"] = 400
+    client = GraphClient("PHONE", "TOKEN", base_url=graph["base_url"])
+
+    result = client.send_image("13035550000", "https://example.org/e.jpg", "caption")
+
+    assert result == {"ok": False, "status": 400, "message_id": None, "error": "Invalid parameter"}
+
+
+def test_read_timeout_is_status_zero(graph):
+    graph["delay"] = 0.5
+    client = GraphClient("PHONE", "TOKEN", base_url=graph["base_url"], read_timeout=0.1)
+
+    result = client.send_text("13035550000", "hello")
+
+    assert result["ok"] is False
+    assert result["status"] == 0
+    # the POST is not replayed after a read timeout
+    time.sleep(0.6)
+    assert len(graph["requests"]) == 1
@@ -0,0 +1,50 @@
+import pytest
+
+from backend.intent_rules import KeywordAutomaton, classify, explain
+
+# --------------------------------------------------
+# EXPECTED ROUTING (PRIORITY ORDER MATTERS)
+# --------------------------------------------------
+CASES = [
+    ("vishnu sahasranamam", "VEDIC_RECITATION"),
+    ("items required for homam", "HOMAM_ITEMS"),
+    ("vahana pooja", "VAHANA_POOJA"),
+    ("temple manager phone", "CONTACTS"),
+    ("board of trustees", "COMMITTEE"),
+    ("bhajans at temple", "CULTURAL"),
+    ("story of diwali", "STORY"),
+    ("kalyanam significance", "KALYANAM"),
+    ("panchang tomorrow", "PANCHANG_TOMORROW"),
+    ("panchang jan 22", "PANCHANG_DATE"),
+    ("today's tithi", "PANCHANG_TODAY"),
+    ("cafeteria timing", "FOOD"),
+    ("satyanarayana pooja timing", "SATYANARAYANA_POOJA"),
+    ("temple hours", "TEMPLE_HOURS"),
+    ("temple address", "LOCATION"),
+    ("full moon dates", "LUNAR_DATES"),
+    ("chandi homam", "HOMAMS"),
+    ("hanuman abhishekam cost", "ABHISHEKAM_SPONSORSHIP"),
+    ("siva abhishekam", "WEEKLY_ABHISHEKAM"),
+    ("events this week", "EVENTS"),
+    ("daily pooja", "DAILY_POOJA"),
+    ("arjitha seva", "ARJITHA_SEVA"),
+    ("what is ekadasi", "RAG_FALLBACK"),
+]
+
+
+@pytest.mark.parametrize("query,intent", CASES)
+def test_classify(query, intent):
+    assert classify(query) == intent
+
+
+def test_explain_reports_rule_and_blocked():
+    info = explain("story of diwali dates")
+
+    assert info["intent"] == "RAG_FALLBACK"
+    assert info["blocked"][0]["rule"] == "story"
+    assert "dates" in info["blocked"][0]["excluded_by"]
+
+
+def test_automaton_finds_overlapping_keywords():
+    ac = KeywordAutomaton(["event", "events", "special events", "vent"])
+    assert ac.find("any special events") == {"event", "events", "special events", "vent"}
@@ -0,0 +1,52 @@
+"""Tests for backend/lazy.py and the light cold start of app.py."""
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from backend.lazy import lazy, lazy_resource
+from bench_imports import LAZY_MODULES
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def test_lazy_handler_imports_on_first_call():
+    handler = lazy("backend.webhook", "extract_messages")
+    assert not handler.loaded
+    assert handler.__name__ == "extract_messages"
+    assert handler({}) == []
+    assert handler.loaded
+
+
+def test_lazy_resource_loads_once_across_threads():
+    calls = []
+
+    @lazy_resource
+    def get_thing():
+        calls.append(1)
+        return object()
+
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(get_thing())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len({id(x) for x in seen}) == 1
+
+    get_thing.reset()
+    get_thing()
+    assert len(calls) == 2
+
+
+def test_app_cold_import_stays_light():
+    probe = (
+        "import sys, app; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=BASE_DIR,
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
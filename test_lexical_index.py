@@ -0,0 +1,58 @@
+"""Tests for backend/lexical_index.py (BM25 + reciprocal-rank fusion)."""
+
+from backend.chunk_store import ChunkStore
+from backend.lexical_index import LexicalIndex, load_or_build, rrf_fuse, tokenize
+
+TEXTS = [
+    "Hanuman Abhishekam is performed on the 4th Saturday of every month.",
+    "Sri Venkateswara Kalyanam: sponsorship $116. Kalyanam on the 2nd Saturday.",
+    "Ugadi festival celebrations with panchanga sravanam.",
+    "Temple hours: weekdays 9 AM-12 PM and 6 PM-8 PM.",
+    "Anjaneya (Hanuman) Jayanthi special pooja and Hanuman Chalisa recitation.",
+]
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert tokenize("When is the Hanuman Abhishekam?") == ["hanuman", "abhishekam"]
+
+
+def test_bm25_ranks_by_term_weight():
+    index = LexicalIndex.build(TEXTS)
+    hits = index.search("hanuman abhishekam", k=3)
+    assert [h.id for h in hits] == [0, 4]
+    assert hits[0].score > hits[1].score
+
+    # partial matches still score, unlike the all-keywords scan
+    assert [h.id for h in index.search("ugadi panchangam dates", k=3)] == [2]
+    assert index.search("zzz", k=3) == []
+
+
+def test_lookup_only_touches_query_postings():
+    index = LexicalIndex.build(TEXTS)
+    start, df = index.terms["kalyanam"]
+    assert df == 1
+    assert list(index.doc_ids[start:start + df]) == [1]
+    assert index.tfs[start] == 2
+
+
+def test_save_load_round_trip_and_staleness(tmp_path):
+    store = ChunkStore.from_meta([{"id": i, "source": "s", "text": t} for i, t in enumerate(TEXTS)])
+    path = tmp_path / "lexical.idx"
+
+    LexicalIndex.build(TEXTS, store.manifest["chunks_sha256"]).save(path)
+    loaded = load_or_build(store, path)
+    assert loaded.chunks_sha256 == store.manifest["chunks_sha256"]
+    assert loaded.search("kalyanam", 2) == LexicalIndex.build(TEXTS).search("kalyanam", 2)
+
+    # built from other chunks: ignored and rebuilt from the store
+    LexicalIndex.build(TEXTS[:4] + ["Diwali"], "other").save(path)
+    rebuilt = load_or_build(store, path)
+    assert [h.id for h in rebuilt.search("hanuman", 5)] == [4, 0]
+
+
+def test_rrf_fuse_rewards_agreement():
+    semantic = [3, 1, 0, 2]
+    lexical = [0, 4, 1]
+    assert rrf_fuse([semantic, lexical], k=3) == [0, 1, 3]
+    # a chunk only the lexical side finds still makes the cut
+    assert 4 in rrf_fuse([semantic, lexical], k=5)
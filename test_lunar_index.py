@@ -0,0 +1,124 @@
+import os
+from datetime import date, datetime
+
+from backend.get_timing import handle_lunar_dates
+from backend.lunar_index import AMAVASYA, EVENTS_DIR, FULLMOON, LunarIndex, parse_lunar_text
+
+ONE_LINE = """
+November 2025 Full Moon Day/Purnima/Poornima = 5th of November 2025,Karthika Purnima
+January 2025 Full Moon Day/Purnima/Poornima = 13th of Jan 2025,Bhogi , Sri Goda(Andal)Kalyanam
+"""
+
+BLOCK = """
+2026 AMAVASYA (NEW MOON) DATES
+All times in Denver Mountain Time (MST/MDT)
+
+January 2026:
+- Amavasya: January 18th (Sunday) at 12:50 PM
+- Nakshatra: Uttarashadha 11:10 PM
+
+February 2026:
+- Amavasya: February 16th (Monday) at 5:02 AM (Tuesday)
+- Event: Maha Sivaratri
+"""
+
+
+def _write(root, year, lunar_type, text, name="dates.txt"):
+    folder = root / str(year) / lunar_type
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_parse_one_line_format():
+    records = parse_lunar_text(ONE_LINE, 2025, FULLMOON)
+    assert [r.date for r in records] == [date(2025, 11, 5), date(2025, 1, 13)]
+    assert records[1].events == ("Bhogi", "Sri Goda(Andal)Kalyanam")
+    assert records[0].time is None
+
+
+def test_parse_block_format():
+    records = parse_lunar_text(BLOCK, 2026, AMAVASYA)
+    assert [r.date for r in records] == [date(2026, 1, 18), date(2026, 2, 16)]
+    assert records[0].time == "12:50 PM"
+    assert records[0].events == ()
+    assert records[1].events == ("Maha Sivaratri",)
+
+
+def test_parse_real_purnima_file_keeps_clock_time_nakshatra_and_maasa():
+    text = (EVENTS_DIR / "2026" / FULLMOON / "Purnima_dates_2026.txt").read_text(encoding="utf-8")
+    records = {r.date: r for r in parse_lunar_text(text, 2026, FULLMOON)}
+
+    # "- Purnima: March 2nd (Monday) at 4:37 AM (Tuesday)"
+    holi = records[date(2026, 3, 2)]
+    assert holi.time == "4:37 AM"
+    assert holi.events[0] == "Holi"
+    assert holi.nakshatra == "Magha 7:00 PM"
+    assert holi.maasa == "Phalguna Maasa Sukla Paksham"
+
+    assert records[date(2026, 1, 2)].nakshatra == "Mrigasira 7:34 AM, Arudra afterwards"
+    assert all(r.time and r.maasa for r in records.values())
+
+    text = (EVENTS_DIR / "2026" / AMAVASYA / "Amavasya_dates_2026.txt").read_text(encoding="utf-8")
+    # "- Amavasya: April 16th (Thursday) at 4:42 AM, Amavasya afterwards"
+    april = next(r for r in parse_lunar_text(text, 2026, AMAVASYA) if r.date == date(2026, 4, 16))
+    assert april.time == "4:42 AM"
+
+
+def test_year_month_and_upcoming(tmp_path):
+    _write(tmp_path, 2025, FULLMOON, ONE_LINE)
+    _write(tmp_path, 2026, AMAVASYA, BLOCK)
+    index = LunarIndex(tmp_path, recheck_secs=0)
+
+    assert [r.date for r in index.for_year(2025, FULLMOON)] == [date(2025, 1, 13), date(2025, 11, 5)]
+    assert [r.date for r in index.for_year(2026, AMAVASYA, 2)] == [date(2026, 2, 16)]
+    assert index.for_year(2026, AMAVASYA, 3) == []
+    assert index.for_year(2026, FULLMOON) == []
+
+    assert [r.date for r in index.upcoming(date(2025, 2, 1), FULLMOON)] == [date(2025, 11, 5)]
+    assert index.upcoming(date(2025, 11, 6), FULLMOON) == []
+
+
+def test_reparses_only_when_files_change(tmp_path):
+    path = _write(tmp_path, 2026, AMAVASYA, BLOCK)
+    index = LunarIndex(tmp_path, recheck_secs=0)
+    assert len(index.for_year(2026, AMAVASYA)) == 2
+
+    records = index._records
+    index.for_year(2026, AMAVASYA)
+    assert index._records is records
+
+    path.write_text(BLOCK.split("February")[0], encoding="utf-8")
+    os.utime(path, ns=(0, 1))
+    assert len(index.for_year(2026, AMAVASYA)) == 1
+
+
+def test_recheck_interval_skips_stat(tmp_path):
+    path = _write(tmp_path, 2026, AMAVASYA, BLOCK)
+    index = LunarIndex(tmp_path, recheck_secs=3600)
+    assert len(index.for_year(2026, AMAVASYA)) == 2
+
+    path.unlink()
+    assert len(index.for_year(2026, AMAVASYA)) == 2
+    index.refresh(force=True)
+    assert index.for_year(2026, AMAVASYA) == []
+
+
+def test_handle_lunar_dates():
+    now = datetime(2026, 10, 18)
+
+    out = handle_lunar_dates("amavasya in november", now)
+    assert out.splitlines() == [
+        "🌑 AMAVASYA DATES (November 2026)",
+        "• November 8, 2026 (Sunday) at 12:03 AM – Deepavali (Diwali)",
+        "  Nakshatra: Swathi 6:45 PM",
+        "  Maasa: Kartika Maasa Krishna Paksham",
+    ]
+
+    out = handle_lunar_dates("next full moon", now)
+    assert out.splitlines()[0] == "🌕 POORNIMA DATES (Next)"
+    assert "October 25, 2026" in out
+
+    assert "Dates not listed" in handle_lunar_dates("amavasya 2031", now)
+    assert handle_lunar_dates("temple hours", now) is None
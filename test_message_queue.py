@@ -0,0 +1,179 @@
+"""Tests for the async webhook queue (backend/message_queue.py, backend/webhook.py)."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from backend import message_queue
+from backend.message_queue import drain, get_message_queue
+from backend.dedupe_store import MessageDedupe
+from backend.webhook import dispatch, extract_messages
+from test_support.memory_queue import InMemoryQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def msg(i, sender="15550001"):
+    return {"id": f"wamid.{i}", "from": sender, "text": f"question {i}", "timestamp": "1700000000"}
+
+
+def test_extract_messages_covers_all_entries_and_skips_statuses():
+    body = {"entry": [
+        {"changes": [
+            {"value": {"messages": [
+                {"id": "a", "from": "1", "text": {"body": "hi"}, "timestamp": "1"},
+                {"id": "b", "from": "1", "text": {"body": "timings?"}},
+            ]}},
+            {"value": {"statuses": [{"id": "s", "status": "delivered"}]}},
+        ]},
+        {"changes": [
+            {"value": {"messages": [
+                {"id": "c", "from": "2", "type": "image", "image": {}},
+                {"id": "d", "from": "2", "text": {"body": "subscribe"}},
+            ]}},
+        ]},
+    ]}
+    out = extract_messages(body)
+    assert [m["id"] for m in out] == ["a", "b", "d"]
+    assert out[0] == {"id": "a", "from": "1", "text": "hi", "timestamp": "1"}
+    assert extract_messages({}) == []
+
+
+def test_redelivered_webhook_is_deduplicated():
+    clock = FakeClock()
+    q = InMemoryQueue(dedupe_window=300, clock=clock)
+    assert q.send_batch([msg(1), msg(2)]) == 2
+    # Meta retries the same delivery
+    assert q.send_batch([msg(1), msg(2)]) == 0
+    assert len(q) == 2
+
+    clock.now = 301
+    assert q.send_batch([msg(1)]) == 1
+
+
+def test_unacknowledged_message_becomes_visible_again():
+    clock = FakeClock()
+    q = InMemoryQueue(visibility_timeout=60, clock=clock)
+    q.send_batch([msg(1)])
+
+    first = q.receive()
+    assert [m.body["id"] for m in first] == ["wamid.1"]
+    assert q.receive() == []
+
+    clock.now = 61
+    again = q.receive()
+    assert [m.body["id"] for m in again] == ["wamid.1"]
+    q.delete_batch([again[0].receipt])
+    assert len(q) == 0
+
+
+def test_drain_deletes_handled_and_keeps_failed():
+    clock = FakeClock()
+    q = InMemoryQueue(visibility_timeout=60, clock=clock)
+    q.send_batch([msg(i) for i in range(25)])
+
+    handled = []
+
+    def handle(body):
+        if body["id"] == "wamid.7":
+            raise RuntimeError("bedrock throttled")
+        handled.append(body["id"])
+
+    result = drain(q, handle, batch_size=10)
+    assert result.processed == 24
+    assert result.failed == 1
+    assert result.batches == 3
+    assert handled == [f"wamid.{i}" for i in range(25) if i != 7]
+
+    # the failed message is retried once its visibility timeout runs out
+    assert len(q) == 1
+    clock.now = 61
+    result = drain(q, lambda body: handled.append(body["id"]))
+    assert result.processed == 1
+    assert handled[-1] == "wamid.7"
+    assert len(q) == 0
+
+
+def test_drain_stops_at_deadline():
+    clock = FakeClock()
+    q = InMemoryQueue(clock=clock)
+    q.send_batch([msg(i) for i in range(30)])
+
+    def handle(body):
+        clock.now += 1
+
+    result = drain(q, handle, batch_size=10, deadline=15, clock=clock)
+    assert result.processed == 20
+    assert result.batches == 2
+    assert len(q) == 10
+
+
+def test_dispatch_answers_every_message_and_isolates_failures():
+    messages = [msg(i, sender=f"1555000{i % 3}") for i in range(9)]
+    answered, lock = [], threading.Lock()
+
+    def handle(m):
+        if m["id"] == "wamid.4":
+            raise RuntimeError("boom")
+        with lock:
+            answered.append(m["id"])
+
+    result = dispatch(messages, handle, max_workers=3)
+    assert result.handled == 8
+    assert result.failed == ["wamid.4"]
+    assert sorted(answered) == sorted(m["id"] for m in messages if m["id"] != "wamid.4")
+
+
+def test_dispatch_keeps_per_sender_order_and_runs_senders_concurrently():
+    messages = [msg(i, sender="A" if i < 3 else "B") for i in range(6)]
+    order = {"A": [], "B": []}
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def handle(m):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        order[m["from"]].append(m["id"])
+        with lock:
+            running[0] -= 1
+
+    dispatch(messages, handle, max_workers=4)
+    assert order["A"] == ["wamid.0", "wamid.1", "wamid.2"]
+    assert order["B"] == ["wamid.3", "wamid.4", "wamid.5"]
+    assert peak[0] == 2
+
+
+def test_no_process_local_fallback_without_a_queue_url(monkeypatch):
+    monkeypatch.setattr(message_queue, "MESSAGE_QUEUE_URL", "")
+    monkeypatch.setattr(message_queue, "_queue", None)
+    with pytest.raises(RuntimeError):
+        get_message_queue()
+
+
+def test_async_webhook_enqueues_a_redelivered_message_once(monkeypatch):
+    import app
+
+    # no dedupe window in the queue itself: the handler's check must catch it
+    q = InMemoryQueue(dedupe_window=0)
+    monkeypatch.setattr(app, "WEBHOOK_MODE", "async")
+    monkeypatch.setattr(app, "get_message_queue", lambda: q)
+    dedupe = MessageDedupe()
+    monkeypatch.setattr(app, "get_enqueue_dedupe", lambda: dedupe)
+
+    body = {"entry": [{"changes": [{"value": {"messages": [
+        {"id": "wamid.A", "from": "1", "text": {"body": "temple hours"}, "timestamp": "1700000000"},
+    ]}}]}]}
+    event = {"httpMethod": "POST", "body": json.dumps(body)}
+
+    assert app.handler(event, None) == {"statusCode": 200}
+    assert app.handler(event, None) == {"statusCode": 200}
+    assert [m.body["id"] for m in q.receive()] == ["wamid.A"]
@@ -0,0 +1,93 @@
+import json
+from datetime import date, datetime
+
+from backend.panchang_table import (
+    PANCHANG_ARTIFACT_PATH,
+    get_panchang_table,
+    parse_maasa_text,
+    parse_panchang_dir,
+    parse_panchang_text,
+    to_json,
+)
+from backend.panchangam import get_maasa_paksham, get_today_panchang, handle_panchang
+
+MONTH_FILE = """
+JANUARY 2026 PANCHANG - DAILY TITHI & TEMPLE EVENTS
+Month: Pushya Maasa (December 19, 2025 - January 17, 2026)
+
+Jan 1 (Thu): Tithi: Trayodasi 9:52 AM | Nakshatra: Rohini 10:17 AM
+Event: New Year Day | Pushya Maasa Sukla Paksham
+
+Jan 2 (Fri): Tithi: Chaturdasi 6:25 AM, Purnima afterwards | Nakshatra: Mrigasira 7:34 AM
+Event: None
+
+VAIKUNTA EKADASI (Jan 1):
+Jan 1 is noted again here.
+"""
+
+OLD_FORMAT = """
+Jul 20 - T: Dasami 6:33 AM, N: Swathi 7:14 AM
+
+Jul 20 - T: Ekadasi 9:11 PM, N: Krittika 10:15 AM
+Event: Adi Krittika
+"""
+
+MAASA_FILE = """
+MONTH 1: PUSHYA MAASA (January 1-18)
+   Jan 1-18    | Sukla Paksham  | New Year
+   Jan 18-19   | Krishna Paksham| (short)
+
+MONTH 2: MAGHA MAASA (January 19 - February 16)
+   Jan 19-Feb 1  | Sukla Paksham  | Vasanta Panchami
+"""
+
+
+def test_parse_daily_records():
+    table = parse_panchang_text(MONTH_FILE, 2026, 1)
+    assert set(table) == {date(2026, 1, 1), date(2026, 1, 2)}
+
+    jan1 = table[date(2026, 1, 1)]
+    assert jan1["tithi"] == "Trayodasi 9:52 AM"
+    assert jan1["nakshatra"] == "Rohini 10:17 AM"
+    assert jan1["events"] == ["New Year Day", "Pushya Maasa Sukla Paksham"]
+    assert len(jan1["lines"]) == 2
+
+    assert table[date(2026, 1, 2)]["events"] == []
+
+
+def test_repeated_day_line_is_kept():
+    table = parse_panchang_text(OLD_FORMAT, 2025, 7)
+    entry = table[date(2025, 7, 20)]
+    assert entry["tithi"] == "Dasami 6:33 AM"
+    assert len(entry["lines"]) == 3
+    assert entry["events"] == ["Adi Krittika"]
+
+
+def test_parse_maasa_first_row_wins():
+    maasa = parse_maasa_text(MAASA_FILE, 2026)
+    assert maasa[date(2026, 1, 18)] == ("Pushya Maasa", "Sukla Paksham")
+    assert maasa[date(2026, 1, 19)] == ("Pushya Maasa", "Krishna Paksham")
+    assert maasa[date(2026, 1, 20)] == ("Magha Maasa", "Sukla Paksham")
+    assert maasa[date(2026, 2, 1)] == ("Magha Maasa", "Sukla Paksham")
+
+
+def test_lookup_and_range():
+    table = get_panchang_table()
+    assert table.get(date(2026, 1, 13))["lines"][0].startswith("Jan 13 (Tue)")
+    assert [d.day for d, _ in table.range(date(2026, 1, 12), date(2026, 1, 18))] == list(range(12, 19))
+    assert get_today_panchang(datetime(2026, 1, 17, 9))[0].startswith("Jan 17 (Sat)")
+    assert get_maasa_paksham(date(2026, 1, 19)) == ("Pushya Maasa", "Krishna Paksham")
+    assert get_maasa_paksham(date(2030, 1, 1)) is None
+
+
+def test_week_view():
+    out = handle_panchang("panchang this week", datetime(2026, 1, 13, 9))
+    assert out.startswith("🌙 PANCHANG – THIS WEEK")
+    assert "Tuesday, Jan 13" in out and "Sunday, Jan 18" in out
+
+
+def test_committed_artifact_is_current():
+    """Rebuild with `python -m backend.calendar_ingest` if this fails."""
+    with open(PANCHANG_ARTIFACT_PATH, encoding="utf-8") as f:
+        committed = json.load(f)
+    assert committed == json.loads(json.dumps(to_json(parse_panchang_dir())))
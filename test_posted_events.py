@@ -0,0 +1,68 @@
+import pytest
+
+from backend import posted_events
+from backend.posted_events import PostedEvents, event_hash
+from test_support.local_dynamodb import LocalDynamoDB
+
+
+def _event(i):
+    return {
+        "filename": f"event_{i}_2026.jpg",
+        "name": f"Event {i}",
+        "image_url": f"https://svtempleco.org/images/event_{i}_2026.jpg",
+    }
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(posted_events, "_POSTED_CACHE", set())
+    db = LocalDynamoDB()
+    db.create_table("temple-events", key="event_hash")
+    return db
+
+
+def test_hash_matches_legacy_key():
+    import hashlib
+
+    e = _event(1)
+    legacy = hashlib.md5(f"{e['filename']}|{e['image_url']}|{e['name']}".encode()).hexdigest()
+    assert event_hash(e) == legacy
+
+
+def test_batch_roundtrip(db):
+    store = PostedEvents(db, sleep=lambda s: None)
+    events = {event_hash(_event(i)): _event(i) for i in range(30)}
+
+    store.mark_posted(dict(list(events.items())[:20]))
+    # 20 markers fit in one BatchWriteItem call
+    assert db.calls == ["batch_write_item"]
+
+    posted_events._POSTED_CACHE.clear()
+    found = store.already_posted(list(events) + [event_hash(_event(99))])
+
+    assert found == set(list(events)[:20])
+    assert db.calls.count("batch_get_item") == 1
+    assert db.Table("temple-events").calls == []
+
+
+def test_chunks_and_unprocessed_retry(db):
+    store = PostedEvents(db, sleep=lambda s: None)
+    events = {event_hash(_event(i)): _event(i) for i in range(130)}
+
+    db.unprocessed = 2
+    store.mark_posted(events)
+    assert len(db.Table("temple-events").items) == 130
+
+    posted_events._POSTED_CACHE.clear()
+    db.unprocessed = 1
+    assert store.already_posted(events) == set(events)
+
+
+def test_warm_cache_skips_dynamodb(db):
+    store = PostedEvents(db, sleep=lambda s: None)
+    events = {event_hash(_event(i)): _event(i) for i in range(3)}
+    store.mark_posted(events)
+    db.calls.clear()
+
+    assert store.already_posted(events) == set(events)
+    assert db.calls == []
@@ -0,0 +1,53 @@
+import pytest
+
+from backend.utility import autocorrect_query, normalize_query
+from bench_utility import load_query_corpus, legacy_autocorrect_query, legacy_normalize_query
+
+CORPUS = load_query_corpus()
+
+# --------------------------------------------------
+# KNOWN OUTPUTS (INCLUDING CHAINED REPLACEMENTS)
+# --------------------------------------------------
+GOLDEN = [
+    ("Godha Kalyanam", "andal kalyanam"),
+    ("goda devi", "andal"),
+    ("tulsi devi pooja", "tulasi pooja"),
+    ("Shiva abisekam", "siva abhishekam"),
+    ("ganesha vratham", "ganapati pooja"),
+    ("satya narayana pooja", "satyanarayana pooja"),
+    ("temple hours", "temple hours"),
+]
+
+
+@pytest.mark.parametrize("query,expected", GOLDEN)
+def test_golden_normalization(query, expected):
+    assert normalize_query(query) == expected
+
+
+@pytest.mark.parametrize("query", CORPUS)
+def test_matches_original_loop(query):
+    assert normalize_query(query) == legacy_normalize_query(query)
+
+
+# --------------------------------------------------
+# AUTOCORRECT (INDEX MUST AGREE WITH get_close_matches)
+# --------------------------------------------------
+TYPOS = [
+    "abhishekm",
+    "satyanarayna pooja",
+    "panchng today",
+    "kalyanm dates",
+    "hanumn abhishekam",
+    "tommorow events",
+    "sahasranamm",
+]
+
+
+@pytest.mark.parametrize("query", TYPOS + CORPUS)
+def test_autocorrect_matches_difflib(query):
+    q = query.lower()
+    assert autocorrect_query(q) == legacy_autocorrect_query(q)
+
+
+def test_autocorrect_fixes_typo():
+    assert autocorrect_query("abhishekm") == "abhishekam"
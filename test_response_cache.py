@@ -0,0 +1,72 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from backend import response_cache
+from backend.response_cache import ResponseCache
+from backend.sponsorship_catalog import SPONSORSHIP_CATALOG
+
+TZ = ZoneInfo("America/Denver")
+
+MORNING = datetime(2026, 1, 13, 8, 30, tzinfo=TZ)
+NOON = datetime(2026, 1, 13, 12, 30, tzinfo=TZ)
+NEXT_DAY = datetime(2026, 1, 14, 8, 30, tzinfo=TZ)
+
+
+def test_static_answer_survives_day_change():
+    cache = ResponseCache()
+    cache.put("temple address", "LOCATION", MORNING, "• 1495 South Ridge Road")
+
+    assert cache.get("temple address", "LOCATION", NEXT_DAY) == "• 1495 South Ridge Road"
+
+
+def test_panchang_rolls_over_at_midnight():
+    cache = ResponseCache()
+    cache.put("panchang today", "PANCHANG_TODAY", MORNING, "🌙 Today's Panchang")
+
+    assert cache.get("panchang today", "PANCHANG_TODAY", NOON) == "🌙 Today's Panchang"
+    assert cache.get("panchang today", "PANCHANG_TODAY", NEXT_DAY) is None
+
+
+def test_temple_hours_bucketed_by_hour():
+    cache = ResponseCache()
+    cache.put("temple hours", "TEMPLE_HOURS", MORNING, "🕉️ TEMPLE STATUS: CLOSED NOW")
+
+    assert cache.get("temple hours", "TEMPLE_HOURS", NOON) is None
+
+
+def test_transient_failures_not_cached():
+    cache = ResponseCache()
+    cache.put("what is ekadasi", "RAG_FALLBACK", MORNING, "• AI assistance is temporarily unavailable.")
+
+    assert cache.get("what is ekadasi", "RAG_FALLBACK", MORNING) is None
+
+
+def test_generic_fallback_not_cached():
+    # what _answer_for_intent returns when a handler raised
+    cache = ResponseCache()
+    cache.put("homam list", "HOMAMS", MORNING, "• I don’t have specific information on that right now.")
+
+    assert cache.get("homam list", "HOMAMS", NEXT_DAY) is None
+    assert cache.get("homam list", "HOMAMS", MORNING) is None
+
+
+def test_catalog_change_invalidates():
+    cache = ResponseCache(version_check_secs=0)
+    cache.put("abhishekam cost", "ABHISHEKAM_SPONSORSHIP", MORNING, "💰 Sponsorship")
+
+    SPONSORSHIP_CATALOG["test_seva"] = {"temple": 1}
+    try:
+        assert cache.get("abhishekam cost", "ABHISHEKAM_SPONSORSHIP", MORNING) is None
+    finally:
+        del SPONSORSHIP_CATALOG["test_seva"]
+
+
+def test_calendar_rebuild_invalidates(tmp_path, monkeypatch):
+    artifact = tmp_path / "calendar.json"
+    artifact.write_text("{}")
+    monkeypatch.setattr(response_cache, "CALENDAR_ARTIFACT_PATH", artifact)
+    cache = ResponseCache(version_check_secs=0)
+    cache.put("abhishekam cost", "ABHISHEKAM_SPONSORSHIP", MORNING, "💰 Sponsorship")
+
+    artifact.write_text('{"version": "rebuilt"}')
+    assert cache.get("abhishekam cost", "ABHISHEKAM_SPONSORSHIP", MORNING) is None
@@ -0,0 +1,114 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from backend.site_scraper import (
+    CHANGED,
+    NOT_MODIFIED,
+    UNCHANGED,
+    FileScrapeStore,
+    extract_events,
+    scrape_events,
+)
+
+PAGE = b"""
+<html><body>
+  <img src="../images/logo.png">
+  <div class="events">
+    <img src="../images/Vaikunta_Ekadasi_2025.jpg" alt="flyer">
+    <p><img src="/uploads/Ugadi_2026.png"></p>
+    <img alt="no src">
+    <img src="Balavihar_2026.jpeg">
+  </div>
+</body></html>
+"""
+
+
+def test_extract_events_only_reads_img_src():
+    events = extract_events(PAGE, "https://svtempleco.org", "https://svtempleco.org/Home")
+
+    assert events == [
+        {
+            "filename": "Vaikunta_Ekadasi_2025.jpg",
+            "name": "Vaikunta Ekadasi",
+            "image_url": "https://svtempleco.org/images/Vaikunta_Ekadasi_2025.jpg",
+        },
+        {
+            "filename": "Ugadi_2026.png",
+            "name": "Ugadi",
+            "image_url": "https://svtempleco.org/uploads/Ugadi_2026.png",
+        },
+        {
+            "filename": "Balavihar_2026.jpeg",
+            "name": "Balavihar",
+            "image_url": "https://svtempleco.org/Balavihar_2026.jpeg",
+        },
+    ]
+
+
+@pytest.fixture
+def site():
+    state = {"body": PAGE, "etag": '"v1"', "honour_etag": True, "seen": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["seen"].append(dict(self.headers))
+            if state["honour_etag"] and self.headers.get("If-None-Match") == state["etag"]:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", state["etag"])
+            self.send_header("Content-Length", str(len(state["body"])))
+            self.end_headers()
+            self.wfile.write(state["body"])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_address[1]}/Home"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_get_and_body_hash(site, tmp_path):
+    store = FileScrapeStore(tmp_path / "scrape.json")
+    base = site["url"].rsplit("/", 1)[0]
+
+    first = scrape_events(requests.Session(), store, site["url"], base)
+    assert first.status == CHANGED
+    assert len(first.events) == 3
+    store.save(site["url"], first.state)
+
+    second = scrape_events(requests.Session(), store, site["url"], base)
+    assert site["seen"][-1]["If-None-Match"] == '"v1"'
+    assert second.status == NOT_MODIFIED
+    assert second.events == []
+
+    # server ignores validators but the page is the same
+    site["honour_etag"] = False
+    site["etag"] = '"v2"'
+    third = scrape_events(requests.Session(), store, site["url"], base)
+    assert third.status == UNCHANGED
+    assert third.state.etag == '"v2"'
+
+    site["body"] = PAGE.replace(b"Ugadi", b"Sankranti")
+    fourth = scrape_events(requests.Session(), store, site["url"], base)
+    assert fourth.status == CHANGED
+    assert fourth.events[1]["name"] == "Sankranti"
+
+
+def test_unsaved_state_scrapes_again(site, tmp_path):
+    store = FileScrapeStore(tmp_path / "scrape.json")
+    base = site["url"].rsplit("/", 1)[0]
+
+    scrape_events(requests.Session(), store, site["url"], base)
+    # an interrupted run never saves, so the next run still sees the events
+    again = scrape_events(requests.Session(), store, site["url"], base)
+    assert again.status == CHANGED
+    assert "If-None-Match" not in site["seen"][-1]
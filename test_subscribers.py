@@ -0,0 +1,89 @@
+import pytest
+
+from backend.subscribers import ACTIVE_INDEX, CHANGES_INDEX, SubscriberRoster
+from test_support.local_dynamodb import LocalTable
+
+
+@pytest.fixture
+def table():
+    return LocalTable(
+        "temple-subscribers",
+        key="phone_number",
+        indexes={
+            ACTIVE_INDEX: ("active_shard", "phone_number"),
+            CHANGES_INDEX: ("roster_log", "roster_version"),
+        },
+    )
+
+
+@pytest.fixture
+def roster(table, tmp_path):
+    return SubscriberRoster(table, snapshot_path=tmp_path / "roster.snapshot", shards=3)
+
+
+def test_subscribe_unsubscribe_status(roster):
+    roster.subscribe("13035550001")
+    assert roster.is_subscribed("13035550001")
+
+    roster.unsubscribe("13035550001")
+    assert not roster.is_subscribed("13035550001")
+    assert not roster.is_subscribed("13035559999")
+
+
+def test_full_load_reads_only_active_items(roster, table):
+    for i in range(10):
+        roster.subscribe(f"1303555{i:04d}")
+    for i in range(0, 10, 2):
+        roster.unsubscribe(f"1303555{i:04d}")
+
+    header = roster.sync()
+
+    assert header["count"] == 5
+    assert sorted(roster.iter_active()) == [f"1303555{i:04d}" for i in range(1, 10, 2)]
+    assert "scan" not in table.calls
+
+
+def test_delta_sync_applies_only_changes(roster, table, tmp_path):
+    for i in range(6):
+        roster.subscribe(f"1303555{i:04d}")
+    roster.sync()
+
+    roster.unsubscribe("13035550002")
+    roster.subscribe("13035550100")
+
+    # a second container sees the same snapshot file
+    other = SubscriberRoster(table, snapshot_path=tmp_path / "roster.snapshot", shards=3)
+    table.calls.clear()
+    header = other.sync()
+
+    assert header["count"] == 6
+    assert set(other) == {f"1303555{i:04d}" for i in (0, 1, 3, 4, 5, 100)}
+    # one changes query + the counter read, no per-shard reload
+    assert table.calls.count("query") == 1
+
+
+def test_sync_without_changes_keeps_snapshot(roster, table):
+    roster.subscribe("13035550001")
+    first = roster.sync()
+    before = roster.snapshot_path.stat().st_mtime_ns
+
+    assert roster.sync() == first
+    assert roster.snapshot_path.stat().st_mtime_ns == before
+
+
+def test_resubscribe_after_unsubscribe(roster):
+    roster.subscribe("13035550001")
+    roster.sync()
+    roster.unsubscribe("13035550001")
+    roster.subscribe("13035550001")
+
+    assert roster.sync()["count"] == 1
+    assert list(roster.iter_active()) == ["13035550001"]
+
+
+def test_backfill_stamps_legacy_items(roster, table):
+    table.put_item(Item={"phone_number": "13035550001", "subscribed": True})
+    table.put_item(Item={"phone_number": "13035550002", "subscribed": False})
+
+    assert roster.backfill() == 1
+    assert list(roster.iter_active()) == ["13035550001"]
@@ -0,0 +1 @@
+"""In-memory stand-ins for AWS and Bedrock used by the tests and benchmarks."""
@@ -0,0 +1,56 @@
+#test_support/fake_embedder.py
+#
+"""
+Deterministic, offline embedding backend for the embedding pipeline
+tests and bench_embedding_pipeline.py; it can simulate Bedrock
+throttling. Offline builds use LocalHashEmbedder (backend/embedders.py).
+"""
+
+import hashlib
+import threading
+import time
+
+
+class FakeThrottle(Exception):
+    """Shaped like botocore's ClientError for a Bedrock ThrottlingException."""
+
+    def __init__(self):
+        super().__init__("ThrottlingException: Too many requests")
+        self.response = {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}}
+
+
+class FakeEmbedder:
+    """
+    Deterministic offline backend: each vector is derived from sha256 of
+    the text. throttle= makes the first that many requests fail with a
+    ThrottlingException.
+    """
+
+    model_id = "fake-hash"
+
+    def __init__(self, dim: int = 8, max_batch: int = 96, throttle: int = 0, latency: float = 0.0):
+        self.dim = dim
+        self.max_batch = max_batch
+        self.latency = latency
+        self._throttle = throttle
+        self._lock = threading.Lock()
+        self.requests: list[list[str]] = []
+
+    @staticmethod
+    def vector(text: str, dim: int = 8) -> list[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [(digest[i % len(digest)] - 127.5) / 127.5 for i in range(dim)]
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        with self._lock:
+            self.requests.append(list(texts))
+            throttled = self._throttle > 0
+            if throttled:
+                self._throttle -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            raise FakeThrottle()
+        if len(texts) > self.max_batch:
+            raise ValueError(f"{len(texts)} texts exceed max_batch {self.max_batch}")
+        return [self.vector(t, self.dim) for t in texts]
@@ -0,0 +1,319 @@
+#test_support/local_dynamodb.py
+#
+"""
+In-memory stand-ins for the boto3 DynamoDB Table and service resources.
+
+Covers the subset of the API the bot uses (get/put/update/delete_item,
+query on the table or a GSI, scan with a simple filter, batch get/write),
+so subscriber and broadcast code can be tested without AWS. Test-only:
+it is not part of the deployed backend package.
+
+Expressions are parsed for the forms used in this repo only:
+
+    UpdateExpression      SET a = :x, b = if_not_exists(b, :y)  REMOVE c  ADD n :one
+    KeyConditionExpression  pk = :v [AND sk (=|<|<=|>|>=) :w]
+    FilterExpression        a = :v
+    ConditionExpression     attribute_not_exists(a) [OR|AND attribute_exists(b) | b (=|<|...) :v]
+
+A GSI is sparse, the same as in DynamoDB: an item without the index's
+partition-key attribute does not appear in it.
+"""
+
+import copy
+import re
+import threading
+from decimal import Decimal
+from typing import Optional
+
+
+class ConditionalCheckFailed(Exception):
+    """Shaped like botocore's ClientError for a failed ConditionExpression."""
+
+    def __init__(self, operation: str):
+        super().__init__(f"The conditional request failed ({operation})")
+        self.response = {"Error": {"Code": "ConditionalCheckFailedException",
+                                   "Message": "The conditional request failed"}}
+
+
+_OPS = {
+    "=": lambda a, b: a == b, "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+}
+
+
+class LocalTable:
+
+    def __init__(self, name: str, key: str, indexes: Optional[dict[str, tuple[str, Optional[str]]]] = None):
+        """indexes: {index_name: (partition_key, sort_key or None)}"""
+        self.name = name
+        self.key = key
+        self.indexes = indexes or {}
+        self.items: dict = {}
+        self.calls: list[str] = []   # operation names, for tests counting round trips
+        self._lock = threading.Lock()
+
+    # -------------------- HELPERS --------------------
+
+    @staticmethod
+    def _names(path: str, names: Optional[dict]) -> str:
+        return (names or {}).get(path, path)
+
+    def _operand(self, token: str, item: dict, names, values):
+        token = token.strip()
+        m = re.fullmatch(r"if_not_exists\(\s*([#\w]+)\s*,\s*(:\w+)\s*\)", token)
+        if m:
+            attr = self._names(m.group(1), names)
+            return item[attr] if attr in item else values[m.group(2)]
+        if token.startswith(":"):
+            return values[token]
+        return item.get(self._names(token, names))
+
+    def _condition(self, expression: str, item: Optional[dict], names, values) -> bool:
+        """Evaluate a flat ConditionExpression (terms joined by all-OR or all-AND)."""
+        item = item or {}
+        joiner = " OR " if " OR " in expression else " AND "
+
+        def term(t: str) -> bool:
+            t = t.strip()
+            m = re.fullmatch(r"attribute_(not_exists|exists)\(\s*([#\w]+)\s*\)", t)
+            if m:
+                present = self._names(m.group(2), names) in item
+                return present if m.group(1) == "exists" else not present
+            m = re.fullmatch(r"([#\w]+)\s*(<>|<=|>=|=|<|>)\s*(:\w+)", t)
+            if not m:
+                raise ValueError(f"Unsupported ConditionExpression: {expression}")
+            current = item.get(self._names(m.group(1), names))
+            return current is not None and _OPS[m.group(2)](current, values[m.group(3)])
+
+        results = [term(t) for t in expression.split(joiner)]
+        return any(results) if joiner == " OR " else all(results)
+
+    # -------------------- ITEMS --------------------
+
+    def get_item(self, Key: dict, **kwargs) -> dict:
+        self.calls.append("get_item")
+        with self._lock:
+            item = self.items.get(Key[self.key])
+            return {"Item": copy.deepcopy(item)} if item is not None else {}
+
+    def put_item(
+        self,
+        Item: dict,
+        ConditionExpression: Optional[str] = None,
+        ExpressionAttributeValues: Optional[dict] = None,
+        ExpressionAttributeNames: Optional[dict] = None,
+        **kwargs,
+    ) -> dict:
+        self.calls.append("put_item")
+        with self._lock:
+            if ConditionExpression and not self._condition(
+                ConditionExpression, self.items.get(Item[self.key]),
+                ExpressionAttributeNames, ExpressionAttributeValues or {},
+            ):
+                raise ConditionalCheckFailed("PutItem")
+            self.items[Item[self.key]] = copy.deepcopy(Item)
+        return {}
+
+    def delete_item(
+        self,
+        Key: dict,
+        ConditionExpression: Optional[str] = None,
+        ExpressionAttributeValues: Optional[dict] = None,
+        ExpressionAttributeNames: Optional[dict] = None,
+        **kwargs,
+    ) -> dict:
+        self.calls.append("delete_item")
+        with self._lock:
+            if ConditionExpression and not self._condition(
+                ConditionExpression, self.items.get(Key[self.key]),
+                ExpressionAttributeNames, ExpressionAttributeValues or {},
+            ):
+                raise ConditionalCheckFailed("DeleteItem")
+            self.items.pop(Key[self.key], None)
+        return {}
+
+    def update_item(
+        self,
+        Key: dict,
+        UpdateExpression: str,
+        ExpressionAttributeValues: Optional[dict] = None,
+        ExpressionAttributeNames: Optional[dict] = None,
+        ReturnValues: str = "NONE",
+        **kwargs,
+    ) -> dict:
+        self.calls.append("update_item")
+        values = ExpressionAttributeValues or {}
+        names = ExpressionAttributeNames
+
+        with self._lock:
+            item = self.items.setdefault(Key[self.key], dict(Key))
+            updated = {}
+
+            for clause, body in re.findall(r"\b(SET|REMOVE|ADD)\b\s+(.*?)(?=\s+\b(?:SET|REMOVE|ADD)\b|$)",
+                                           UpdateExpression.strip()):
+                # split on commas that are not inside if_not_exists(...)
+                parts = [p.strip() for p in re.split(r",(?![^(]*\))", body) if p.strip()]
+                for part in parts:
+                    if clause == "SET":
+                        path, expr = part.split("=", 1)
+                        attr = self._names(path.strip(), names)
+                        item[attr] = copy.deepcopy(self._operand(expr, item, names, values))
+                        updated[attr] = item[attr]
+                    elif clause == "REMOVE":
+                        item.pop(self._names(part, names), None)
+                    else:
+                        path, value = part.split()
+                        attr = self._names(path, names)
+                        item[attr] = item.get(attr, Decimal(0)) + values[value]
+                        updated[attr] = item[attr]
+
+            if ReturnValues == "UPDATED_NEW":
+                return {"Attributes": copy.deepcopy(updated)}
+            if ReturnValues == "ALL_NEW":
+                return {"Attributes": copy.deepcopy(item)}
+            return {}
+
+    # -------------------- READS --------------------
+
+    def _page(self, items: list[dict], key_attrs: tuple, ExclusiveStartKey, Limit) -> dict:
+        start = 0
+        if ExclusiveStartKey:
+            marker = tuple(ExclusiveStartKey.get(a) for a in key_attrs)
+            for i, it in enumerate(items):
+                if tuple(it.get(a) for a in key_attrs) == marker:
+                    start = i + 1
+                    break
+
+        end = len(items) if Limit is None else start + Limit
+        page = items[start:end]
+        resp = {"Items": copy.deepcopy(page), "Count": len(page)}
+        if end < len(items) and page:
+            resp["LastEvaluatedKey"] = {a: page[-1][a] for a in key_attrs if a in page[-1]}
+        return resp
+
+    def query(
+        self,
+        KeyConditionExpression: str,
+        ExpressionAttributeValues: dict,
+        ExpressionAttributeNames: Optional[dict] = None,
+        IndexName: Optional[str] = None,
+        ExclusiveStartKey: Optional[dict] = None,
+        Limit: Optional[int] = None,
+        **kwargs,
+    ) -> dict:
+        self.calls.append("query")
+        names = ExpressionAttributeNames
+        m = re.fullmatch(
+            r"\s*([#\w]+)\s*=\s*(:\w+)\s*(?:AND\s+([#\w]+)\s*(=|<=|>=|<|>)\s*(:\w+)\s*)?",
+            KeyConditionExpression,
+        )
+        if not m:
+            raise ValueError(f"Unsupported KeyConditionExpression: {KeyConditionExpression}")
+
+        pk = self._names(m.group(1), names)
+        pk_value = ExpressionAttributeValues[m.group(2)]
+        sk = self._names(m.group(3), names) if m.group(3) else None
+        if IndexName:
+            index_pk, index_sk = self.indexes[IndexName]
+            sort_key = index_sk
+        else:
+            sort_key = None
+
+        with self._lock:
+            matched = [it for it in self.items.values() if it.get(pk) == pk_value]
+        if sk:
+            op, value = _OPS[m.group(4)], ExpressionAttributeValues[m.group(5)]
+            matched = [it for it in matched if sk in it and op(it[sk], value)]
+        if sort_key:
+            matched = [it for it in matched if sort_key in it]
+            matched.sort(key=lambda it: it[sort_key])
+
+        key_attrs = (self.key,) + ((index_pk,) if IndexName else ()) + ((sort_key,) if sort_key else ())
+        return self._page(matched, key_attrs, ExclusiveStartKey, Limit)
+
+    def scan(
+        self,
+        FilterExpression: Optional[str] = None,
+        ExpressionAttributeValues: Optional[dict] = None,
+        ExpressionAttributeNames: Optional[dict] = None,
+        ExclusiveStartKey: Optional[dict] = None,
+        Limit: Optional[int] = None,
+        **kwargs,
+    ) -> dict:
+        self.calls.append("scan")
+        with self._lock:
+            items = list(self.items.values())
+
+        if FilterExpression:
+            m = re.fullmatch(r"\s*([#\w]+)\s*=\s*(:\w+)\s*", FilterExpression)
+            if not m:
+                raise ValueError(f"Unsupported FilterExpression: {FilterExpression}")
+            attr = self._names(m.group(1), ExpressionAttributeNames)
+            value = ExpressionAttributeValues[m.group(2)]
+            items = [it for it in items if it.get(attr) == value]
+
+        return self._page(items, (self.key,), ExclusiveStartKey, Limit)
+
+
+class LocalDynamoDB:
+    """
+    Stand-in for the boto3 DynamoDB service resource: Table(name) plus
+    batch_get_item / batch_write_item. `unprocessed` makes the next N
+    batch calls hand back their last request entry as unprocessed, the
+    way DynamoDB does under throttling.
+    """
+
+    def __init__(self):
+        self.tables: dict[str, LocalTable] = {}
+        self.calls: list[str] = []
+        self.unprocessed = 0
+
+    def create_table(self, name: str, key: str, indexes: Optional[dict] = None) -> LocalTable:
+        self.tables[name] = LocalTable(name, key, indexes)
+        return self.tables[name]
+
+    def Table(self, name: str) -> LocalTable:
+        return self.tables[name]
+
+    def _throttle(self, entries: list) -> tuple[list, list]:
+        if self.unprocessed and len(entries) > 1:
+            self.unprocessed -= 1
+            return entries[:-1], entries[-1:]
+        return entries, []
+
+    def batch_get_item(self, RequestItems: dict) -> dict:
+        self.calls.append("batch_get_item")
+        responses, unprocessed = {}, {}
+        for name, request in RequestItems.items():
+            table = self.tables[name]
+            keys, left = self._throttle(request["Keys"])
+            if len(keys) > 100:
+                raise ValueError("Too many items requested for the BatchGetItem call")
+            found = []
+            for key in keys:
+                item = table.items.get(key[table.key])
+                if item is not None:
+                    found.append(copy.deepcopy(item))
+            responses[name] = found
+            if left:
+                unprocessed[name] = {**request, "Keys": left}
+        return {"Responses": responses, "UnprocessedKeys": unprocessed}
+
+    def batch_write_item(self, RequestItems: dict) -> dict:
+        self.calls.append("batch_write_item")
+        unprocessed = {}
+        for name, requests in RequestItems.items():
+            table = self.tables[name]
+            if len(requests) > 25:
+                raise ValueError("Too many items requested for the BatchWriteItem call")
+            todo, left = self._throttle(requests)
+            for req in todo:
+                if "PutRequest" in req:
+                    item = req["PutRequest"]["Item"]
+                    table.items[item[table.key]] = copy.deepcopy(item)
+                else:
+                    table.items.pop(req["DeleteRequest"]["Key"][table.key], None)
+            if left:
+                unprocessed[name] = left
+        return {"UnprocessedItems": unprocessed}
@@ -0,0 +1,75 @@
+#test_support/memory_queue.py
+#
+"""
+Process-local stand-in for backend.message_queue.SQSQueue, for tests.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from backend.message_queue import SQS_BATCH_MAX, SQS_DEDUPE_WINDOW_SECS, VISIBILITY_TIMEOUT_SECS, QueuedMessage
+
+
+class InMemoryQueue:
+    """
+    Process-local queue with SQS semantics that matter here: a received
+    message stays invisible until deleted or its visibility timeout runs
+    out, and a message id seen within the dedupe window is dropped.
+    """
+
+    def __init__(
+        self,
+        visibility_timeout: float = VISIBILITY_TIMEOUT_SECS,
+        dedupe_window: float = SQS_DEDUPE_WINDOW_SECS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.visibility_timeout = visibility_timeout
+        self.dedupe_window = dedupe_window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ready: deque = deque()              # (receipt, body)
+        self._in_flight: dict[str, tuple] = {}    # receipt → (visible_at, body)
+        self._dedupe: dict[str, float] = {}       # message id → enqueued at
+        self._next_receipt = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ready) + len(self._in_flight)
+
+    def send_batch(self, messages: list[dict]) -> int:
+        sent = 0
+        with self._lock:
+            now = self._clock()
+            for msg in messages:
+                seen = self._dedupe.get(msg["id"])
+                if seen is not None and now - seen < self.dedupe_window:
+                    continue
+                self._dedupe[msg["id"]] = now
+                self._next_receipt += 1
+                self._ready.append((f"r{self._next_receipt}", json.loads(json.dumps(msg))))
+                sent += 1
+        return sent
+
+    def receive(self, max_messages: int = SQS_BATCH_MAX, wait_secs: int = 0) -> list[QueuedMessage]:
+        with self._lock:
+            now = self._clock()
+            # expired visibility: back to the queue
+            for receipt, (visible_at, body) in list(self._in_flight.items()):
+                if visible_at <= now:
+                    del self._in_flight[receipt]
+                    self._ready.append((receipt, body))
+
+            out = []
+            while self._ready and len(out) < min(max_messages, SQS_BATCH_MAX):
+                receipt, body = self._ready.popleft()
+                self._in_flight[receipt] = (now + self.visibility_timeout, body)
+                out.append(QueuedMessage(receipt, body))
+            return out
+
+    def delete_batch(self, receipts: list[str]):
+        with self._lock:
+            for r in receipts:
+                self._in_flight.pop(r, None)